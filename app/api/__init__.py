@@ -0,0 +1,8 @@
+"""HTTP API routers."""
+from app.api.analytics import router as analytics_router
+from app.api.submissions import router as submissions_router
+
+__all__ = [
+    "analytics_router",
+    "submissions_router",
+]
@@ -0,0 +1,138 @@
+"""Creator analytics over the review history.
+
+Per-creator numbers, leaderboards and score percentiles are answered from
+the aggregates maintained as each review is recorded (creator_stats and
+creator_score_counts), so no query scans the video_reviews table; only a
+creator's review list reads it, through the (user_id, created_at) index.
+"""
+
+import math
+from datetime import datetime
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from app.api.auth import admin_client
+from app.models.review_history import CreatorStats, VideoReviewRecord
+from app.repositories.review_history_repository import ReviewHistoryRepository
+
+router = APIRouter(
+    prefix="/api/v1/analytics",
+    tags=["analytics"],
+    dependencies=[Depends(admin_client)],
+)
+
+# Percentiles reported when none are asked for
+DEFAULT_PERCENTILES = (25, 50, 75, 90)
+
+
+class CreatorSummary(BaseModel):
+    """One creator's aggregates."""
+
+    user_id: str
+    review_count: int
+    approved_count: int
+    approval_rate: float
+    mean_score: float
+    best_score: int
+    first_reviewed_at: datetime
+    last_reviewed_at: datetime
+
+
+class CreatorDetail(CreatorSummary):
+    """A creator's aggregates, score distribution and standing."""
+
+    # Overall-score percentiles of this creator's reviews, e.g. {"p50": 72}
+    score_percentiles: dict[str, int]
+    # Share of creators (with at least min_reviews) with a lower mean score
+    mean_score_percentile: float | None
+
+
+def score_percentiles(
+    counts: dict[int, int],
+    percentiles: list[int] | tuple[int, ...],
+) -> dict[str, int]:
+    """
+    Nearest-rank percentiles of a score histogram.
+
+    Args:
+        counts: Number of reviews per overall score
+        percentiles: Percentiles to compute (1-100)
+
+    Returns:
+        Score for each percentile, keyed "p<n>" (empty if there are no reviews)
+    """
+    total = sum(counts.values())
+    if not total:
+        return {}
+
+    scores = sorted(counts)
+    result = {}
+    for q in percentiles:
+        rank = max(1, math.ceil(q / 100 * total))
+        seen = 0
+        for score in scores:
+            seen += counts[score]
+            if seen >= rank:
+                result[f"p{q}"] = score
+                break
+    return result
+
+
+def _summary(stats: CreatorStats) -> dict:
+    return {**stats.model_dump(), "approval_rate": stats.approval_rate}
+
+
+@router.get("/creators/{user_id}", response_model=CreatorDetail)
+async def get_creator(
+    user_id: str,
+    min_reviews: int = Query(
+        default=1, ge=1, description="Only compare against creators with this many reviews"
+    ),
+) -> CreatorDetail:
+    """Get a creator's review count, mean, best, approval rate and percentiles."""
+    stats = await ReviewHistoryRepository.get_creator(user_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No reviews for this creator")
+
+    below, total = await ReviewHistoryRepository.mean_score_rank(stats.mean_score, min_reviews)
+    return CreatorDetail(
+        **_summary(stats),
+        score_percentiles=score_percentiles(
+            await ReviewHistoryRepository.score_counts(user_id), DEFAULT_PERCENTILES
+        ),
+        mean_score_percentile=round(below / total * 100, 1) if total else None,
+    )
+
+
+@router.get("/creators/{user_id}/reviews", response_model=list[VideoReviewRecord])
+async def get_creator_reviews(
+    user_id: str,
+    limit: int = Query(default=20, ge=1, le=200),
+    before: datetime | None = Query(default=None, description="Page back from this time"),
+) -> list[VideoReviewRecord]:
+    """Get a creator's reviews with every sub-score, newest first."""
+    return await ReviewHistoryRepository.recent_reviews(user_id, limit, before)
+
+
+@router.get("/leaderboard", response_model=list[CreatorSummary])
+async def get_leaderboard(
+    by: Literal["mean_score", "best_score", "approval_rate", "review_count"] = "mean_score",
+    limit: int = Query(default=10, ge=1, le=100),
+    min_reviews: int = Query(default=3, ge=1),
+) -> list[CreatorSummary]:
+    """Get the top creators."""
+    return [
+        CreatorSummary(**_summary(stats))
+        for stats in await ReviewHistoryRepository.leaderboard(by, limit, min_reviews)
+    ]
+
+
+@router.get("/percentiles")
+async def get_percentiles(
+    q: list[Annotated[int, Field(ge=1, le=100)]] = Query(default=list(DEFAULT_PERCENTILES)),
+    user_id: str | None = Query(default=None, description="One creator instead of everyone"),
+) -> dict[str, int]:
+    """Get overall-score percentiles across every review, or one creator's."""
+    return score_percentiles(await ReviewHistoryRepository.score_counts(user_id), q)
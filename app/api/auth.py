@@ -0,0 +1,64 @@
+"""API key authentication for the HTTP API."""
+
+import hashlib
+import hmac
+
+from fastapi import Header, HTTPException
+
+from app.config import settings
+
+
+def _fingerprint(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def _authenticate(
+    configured: str,
+    x_api_key: str | None,
+    authorization: str | None,
+    name: str,
+) -> str:
+    """Check the presented key against a comma-separated key list."""
+    keys = [key.strip() for key in configured.split(",") if key.strip()]
+    if not keys:
+        raise HTTPException(status_code=404, detail=f"The {name} API is not enabled")
+
+    presented = x_api_key
+    if presented is None and authorization and authorization.lower().startswith("bearer "):
+        presented = authorization[7:].strip()
+    if not presented or not any(hmac.compare_digest(presented, key) for key in keys):
+        raise HTTPException(
+            status_code=401,
+            detail="Missing or invalid API key",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return _fingerprint(presented)
+
+
+async def api_client(
+    x_api_key: str | None = Header(default=None),
+    authorization: str | None = Header(default=None),
+) -> str:
+    """
+    Authenticate a submission API request (API_KEYS).
+
+    Returns:
+        Fingerprint of the key, which owns the jobs it submits
+    """
+    return _authenticate(settings.api_keys, x_api_key, authorization, "submission")
+
+
+async def admin_client(
+    x_api_key: str | None = Header(default=None),
+    authorization: str | None = Header(default=None),
+) -> str:
+    """
+    Authenticate an analytics request (ANALYTICS_API_KEYS).
+
+    Submission keys are handed to agencies, so they never grant access to
+    creator analytics.
+
+    Returns:
+        Fingerprint of the key
+    """
+    return _authenticate(settings.analytics_api_keys, x_api_key, authorization, "analytics")
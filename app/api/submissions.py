@@ -0,0 +1,302 @@
+"""HTTP submission API: push videos for review without going through Slack.
+
+Videos are submitted as a multipart upload, a raw request body, or a URL to
+download. Each submission becomes an AnalysisJob run by the same pipeline,
+job queue and analysis slots as Slack uploads; clients poll (or long-poll)
+the job for its status and fetch the structured review when it completes.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import re
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import AnyHttpUrl, BaseModel, ValidationError
+
+from app.api.auth import api_client
+from app.config import settings
+from app.core.database import run_in_session_scope
+from app.core.job_queue import job_queue
+from app.core.metrics import track_stage
+from app.models.analysis_job import AnalysisJob, JobSource, JobStage
+from app.models.video_review import VideoReview, VideoScreening
+from app.repositories.analysis_job_repository import AnalysisJobRepository
+from app.services.analysis_pipeline import new_api_job, process_api_job, wait_for_job
+from app.services.slack_files import (
+    DOWNLOAD_CHUNK_SIZE,
+    TEMP_DIR,
+    DisallowedURLError,
+    FileTooLargeError,
+    check_public_url,
+    cleanup_file,
+    save_stream,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1", tags=["submissions"])
+
+# Characters kept in client-supplied file names
+_UNSAFE_FILENAME = re.compile(r"[^\w.\-]+")
+
+# Room for the part headers, boundaries and caption field around a form upload
+_FORM_OVERHEAD_BYTES = 64 * 1024
+
+# Starlette needs python-multipart to parse form uploads; raw bodies always work
+_multipart_available = (
+    importlib.util.find_spec("python_multipart") is not None
+    or importlib.util.find_spec("multipart") is not None
+)
+
+
+class SubmitUrl(BaseModel):
+    """JSON body for submitting a video by URL."""
+
+    url: AnyHttpUrl
+    caption: str | None = None
+    file_name: str | None = None
+
+
+class JobStatus(BaseModel):
+    """A submitted video's progress, and its review once complete."""
+
+    id: str
+    status: Literal["pending", "completed", "failed"]
+    stage: str
+    file_name: str
+    caption: str | None
+    created_at: datetime
+    updated_at: datetime
+    error: str | None = None
+    review_kind: str | None = None
+    review: VideoReview | VideoScreening | None = None
+
+
+def _safe_filename(name: str | None, default: str = "video.mp4") -> str:
+    name = _UNSAFE_FILENAME.sub("_", Path(name or "").name).strip("._")
+    return name[:100] or default
+
+
+def _queue_full() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many videos are waiting for review; retry later",
+        headers={"Retry-After": "30"},
+    )
+
+
+def _job_status(job: AnalysisJob) -> JobStatus:
+    if job.stage == JobStage.FAILED.value:
+        status = "failed"
+    elif job.stage in (JobStage.REVIEWED.value, JobStage.POSTED.value):
+        status = "completed"
+    else:
+        status = "pending"
+
+    review = None
+    if status == "completed" and job.review_json is not None:
+        model = VideoScreening if job.review_kind == "screening" else VideoReview
+        review = model.model_validate(job.review_json)
+
+    return JobStatus(
+        id=job.id,
+        status=status,
+        stage=job.stage,
+        file_name=job.file_name,
+        caption=job.caption,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        error=job.error,
+        review_kind=job.review_kind if review else None,
+        review=review,
+    )
+
+
+async def _get_job(job_id: str, owner: str) -> AnalysisJob:
+    """Get a job the caller submitted (other callers' jobs look like missing ones)."""
+    job = await AnalysisJobRepository.get(job_id)
+    if job is None or job.source != JobSource.API.value or job.user_id != owner:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+def _limit_body(request: Request, max_bytes: int) -> Request:
+    """
+    Wrap a request so its body is cut off once more than max_bytes arrive.
+
+    Chunked uploads carry no Content-Length, so this is what stops an
+    oversized form from being spooled to disk in full before it is checked.
+
+    Raises:
+        FileTooLargeError: From the body read, past max_bytes
+    """
+    received = 0
+
+    async def receive():
+        nonlocal received
+        message = await request.receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > max_bytes:
+                raise FileTooLargeError(
+                    f"Video is larger than the {settings.max_video_size_mb} MB limit"
+                )
+        return message
+
+    return Request(request.scope, receive)
+
+
+async def _save_upload(request: Request) -> tuple[Path, str, str | None]:
+    """
+    Stream the uploaded video to disk.
+
+    Returns:
+        Local path, file name and caption
+    """
+    content_type = request.headers.get("content-type", "")
+    prefix = uuid.uuid4().hex
+
+    if content_type.startswith("multipart/form-data"):
+        if not _multipart_available:
+            raise HTTPException(
+                status_code=415,
+                detail="Multipart uploads are not available; send the video as the request body",
+            )
+        # Starlette spools the file part to a temporary file as it arrives
+        max_bytes = settings.max_video_size_mb * 1024 * 1024 + _FORM_OVERHEAD_BYTES
+        form = await _limit_body(request, max_bytes).form(max_files=1, max_fields=10)
+        try:
+            upload = form.get("file")
+            if upload is None or isinstance(upload, str):
+                raise HTTPException(status_code=422, detail="Missing 'file' part")
+            file_name = _safe_filename(upload.filename)
+            caption = form.get("caption") or None
+
+            async def chunks():
+                while chunk := await upload.read(DOWNLOAD_CHUNK_SIZE):
+                    yield chunk
+
+            path = await save_stream(chunks(), TEMP_DIR / f"{prefix}_{file_name}")
+        finally:
+            await form.close()
+        return path, file_name, caption
+
+    # Raw body: the video itself, with the name and caption as query parameters
+    file_name = _safe_filename(request.query_params.get("file_name"))
+    path = await save_stream(request.stream(), TEMP_DIR / f"{prefix}_{file_name}")
+    return path, file_name, request.query_params.get("caption") or None
+
+
+@router.post("/jobs", status_code=202, response_model=JobStatus)
+async def submit_video(
+    request: Request,
+    response: Response,
+    owner: str = Depends(api_client),
+) -> JobStatus:
+    """
+    Submit a video for review.
+
+    Send either `multipart/form-data` with a `file` part and optional
+    `caption` field, the video itself as the body (`video/*` or
+    `application/octet-stream`, with optional `file_name` and `caption` query
+    parameters), or JSON `{"url": ..., "caption": ...}` to have it downloaded.
+    """
+    # Turn work away before reading a large body we couldn't queue anyway
+    if job_queue.full:
+        raise _queue_full()
+
+    max_bytes = settings.max_video_size_mb * 1024 * 1024
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Video is larger than the {settings.max_video_size_mb} MB limit",
+        )
+
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("application/json"):
+        try:
+            body = SubmitUrl.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_url=False)) from e
+        url = str(body.url)
+        try:
+            await check_public_url(url)
+        except DisallowedURLError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+        job = new_api_job(
+            owner,
+            file_name=_safe_filename(body.file_name or url.split("?")[0].rsplit("/", 1)[-1]),
+            caption=body.caption,
+            url=url,
+        )
+    elif content_type.startswith(("multipart/form-data", "video/", "application/octet-stream")):
+        try:
+            with track_stage("api", "receive_upload"):
+                local_path, file_name, caption = await _save_upload(request)
+        except FileTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e)) from e
+        job = new_api_job(owner, file_name=file_name, caption=caption, local_path=local_path)
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail="Send multipart/form-data, a video body, or JSON with a url",
+        )
+
+    with track_stage("api", "create_job"):
+        [job] = await AnalysisJobRepository.create_many([job])
+    try:
+        job_queue.submit(run_in_session_scope, process_api_job, job)
+    except asyncio.QueueFull:
+        if job.local_path:
+            cleanup_file(job.local_path)
+        await AnalysisJobRepository.advance(
+            job.id, JobStage.FAILED, local_path=None, error="Job queue full"
+        )
+        await AnalysisJobRepository.mark_finalized(job.channel, job.message_ts)
+        raise _queue_full() from None
+
+    logger.info(f"API job {job.id} submitted: {job.file_name}")
+    response.headers["Location"] = str(request.url_for("get_job", job_id=job.id))
+    return _job_status(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(
+    job_id: str,
+    wait: float = Query(
+        default=0,
+        ge=0,
+        description="Seconds to wait for the job to finish before answering (long-poll)",
+    ),
+    owner: str = Depends(api_client),
+) -> JobStatus:
+    """Get a job's status, and its review once it has completed."""
+    job = await _get_job(job_id, owner)
+
+    deadline = time.monotonic() + min(wait, settings.api_max_wait_seconds)
+    while not job.finalized and (remaining := deadline - time.monotonic()) > 0:
+        # Woken as soon as this process finishes the job; the periodic
+        # re-read covers jobs run (or resumed) by another replica
+        await wait_for_job(job.id, min(remaining, settings.api_poll_interval_seconds))
+        job = await _get_job(job_id, owner)
+
+    return _job_status(job)
+
+
+@router.get("/jobs/{job_id}/review", response_model=VideoReview | VideoScreening)
+async def get_review(job_id: str, owner: str = Depends(api_client)) -> VideoReview | VideoScreening:
+    """Get the structured review of a completed job."""
+    status = _job_status(await _get_job(job_id, owner))
+    if status.review is None:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job is {status.status}" + (f": {status.error}" if status.error else ""),
+        )
+    return status.review
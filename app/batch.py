@@ -0,0 +1,371 @@
+"""Batch analysis of videos outside Slack.
+
+Scores a directory of videos, or a CSV/JSONL manifest of paths (with optional
+captions), using the same review pipeline as Slack uploads. Results are
+appended to a JSONL or CSV file as each video finishes, so the output file
+doubles as the checkpoint: re-running the same command skips videos that
+already have a result. Identical files with the same caption are analyzed
+once, and the analysis cache is used as for Slack uploads.
+
+Usage:
+    ugc-batch videos/ --output scores.csv --concurrency 16
+    ugc-batch manifest.jsonl --output scores.jsonl --retry-errors
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.config import settings
+from app.core.database import init_db
+from app.core.rate_limiter import Priority
+from app.models.video_review import VideoReview, VideoScreening
+from app.services.analysis_cache import hash_file, normalize_caption
+from app.services.video_analysis import analyze_video
+from app.services.video_preprocessing import check_preprocessing, shutdown_preprocessing
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = {".mp4", ".mov", ".m4v", ".webm", ".mkv", ".avi", ".3gp", ".mpeg", ".mpg"}
+
+# Every sub-score, in the order they appear on the review
+SCORE_FIELDS = [name for name in VideoReview.model_fields if name.endswith("_score")]
+
+RESULT_FIELDS = [
+    "id",
+    "path",
+    "caption",
+    "sha256",
+    "status",
+    "error",
+    "kind",
+    "approved",
+    "virality_tier",
+    *SCORE_FIELDS,
+    "focus_rating",
+    "features_shown",
+    "key_strengths",
+    "areas_for_improvement",
+    "recommendations",
+    "analyzed_at",
+    # The full review as JSON, so a resumed run can reuse it for duplicates
+    "review",
+]
+
+
+@dataclass
+class BatchItem:
+    """One video to analyze."""
+
+    id: str
+    path: Path
+    caption: str | None = None
+
+
+def load_items(source: Path) -> list[BatchItem]:
+    """
+    Read the videos to analyze from a directory or a manifest.
+
+    A manifest is a CSV with a header or a JSONL file; each row needs a
+    `path` (relative paths are resolved against the manifest's directory)
+    and may have `caption` and `id`.
+
+    Args:
+        source: Directory of videos, or a .csv/.jsonl manifest
+
+    Returns:
+        The items, in a stable order
+    """
+    if source.is_dir():
+        return [
+            BatchItem(id=str(path.relative_to(source)), path=path)
+            for path in sorted(source.rglob("*"))
+            if path.is_file() and path.suffix.lower() in VIDEO_EXTENSIONS
+        ]
+
+    if source.suffix.lower() == ".csv":
+        with source.open(newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    elif source.suffix.lower() in (".jsonl", ".ndjson"):
+        with source.open(encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    else:
+        raise ValueError(f"Expected a directory, .csv or .jsonl manifest: {source}")
+
+    items = []
+    for number, row in enumerate(rows, start=1):
+        if not row.get("path"):
+            raise ValueError(f"Manifest row {number} has no path")
+        path = Path(row["path"])
+        if not path.is_absolute():
+            path = source.parent / path
+        items.append(
+            BatchItem(
+                id=str(row.get("id") or row["path"]),
+                path=path,
+                caption=row.get("caption") or None,
+            )
+        )
+    return items
+
+
+def review_row(item: BatchItem, sha256: str | None, review: VideoReview | VideoScreening) -> dict:
+    """Flatten a review into a result row."""
+    row = {
+        "id": item.id,
+        "path": str(item.path),
+        "caption": item.caption,
+        "sha256": sha256,
+        "status": "ok",
+        "error": None,
+        "kind": "screening" if isinstance(review, VideoScreening) else "review",
+        "approved": review.overall_score >= settings.score_threshold,
+        "analyzed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    data = review.model_dump(mode="json")
+    for field in RESULT_FIELDS:
+        if field not in row:
+            row[field] = data.get(field)
+    row["review"] = data
+    return row
+
+
+def error_row(item: BatchItem, sha256: str | None, error: str) -> dict:
+    """Result row for a video that could not be analyzed."""
+    row = {field: None for field in RESULT_FIELDS}
+    row.update(
+        id=item.id,
+        path=str(item.path),
+        caption=item.caption,
+        sha256=sha256,
+        status="error",
+        error=error,
+        analyzed_at=datetime.now(timezone.utc).isoformat(),
+    )
+    return row
+
+
+class ResultWriter:
+    """Appends result rows to a JSONL or CSV file, flushing after each row."""
+
+    def __init__(self, path: Path, fmt: str) -> None:
+        self.path = path
+        self.fmt = fmt
+        self._file = None
+        self._csv: csv.DictWriter | None = None
+
+    def completed(self) -> dict[str, dict]:
+        """Rows already in the file, by item id (the last row for an id wins)."""
+        if not self.path.exists():
+            return {}
+        with self.path.open(newline="", encoding="utf-8") as f:
+            if self.fmt == "csv":
+                rows = list(csv.DictReader(f))
+                for row in rows:
+                    row["review"] = json.loads(row["review"]) if row.get("review") else None
+            else:
+                rows = [json.loads(line) for line in f if line.strip()]
+        return {row["id"]: row for row in rows}
+
+    def open(self) -> None:
+        is_new = not self.path.exists() or self.path.stat().st_size == 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a", newline="", encoding="utf-8")
+        if self.fmt == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+            if is_new:
+                self._csv.writeheader()
+
+    def write(self, row: dict) -> None:
+        if self._csv is not None:
+            self._csv.writerow(
+                {
+                    key: json.dumps(value, ensure_ascii=False)
+                    if isinstance(value, dict)
+                    else "; ".join(value) if isinstance(value, list) else value
+                    for key, value in row.items()
+                }
+            )
+        else:
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+async def run_batch(
+    items: list[BatchItem],
+    writer: ResultWriter,
+    concurrency: int,
+    retry_errors: bool = False,
+) -> tuple[int, int]:
+    """
+    Analyze every item not already in the output, concurrency at a time.
+
+    Gemini requests run at BATCH priority, so the shared RPM/TPM budget is
+    used fully without getting ahead of interactive work.
+
+    Args:
+        items: Videos to analyze
+        writer: Where results go (and what was already done)
+        concurrency: Videos analyzed at once
+        retry_errors: Also re-run items whose previous result was an error
+
+    Returns:
+        Number of videos analyzed successfully and number that failed
+    """
+    done = writer.completed()
+    pending = [
+        item
+        for item in items
+        if item.id not in done or (retry_errors and done[item.id].get("status") != "ok")
+    ]
+    logger.info(
+        f"{len(items)} videos, {len(items) - len(pending)} already done, {len(pending)} to analyze"
+    )
+
+    # Reviews from earlier runs and this one, by content hash and caption
+    reviews: dict[tuple[str, str], asyncio.Future] = {}
+    for row in done.values():
+        if row.get("status") == "ok" and row.get("sha256") and isinstance(row.get("review"), dict):
+            model = VideoScreening if row.get("kind") == "screening" else VideoReview
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(model.model_validate(row["review"]))
+            reviews[(row["sha256"], normalize_caption(row.get("caption")))] = future
+
+    queue: asyncio.Queue[BatchItem] = asyncio.Queue()
+    for item in pending:
+        queue.put_nowait(item)
+    counts = {"ok": 0, "error": 0}
+    started = time.monotonic()
+
+    async def analyze(item: BatchItem) -> dict:
+        sha256 = None
+        try:
+            sha256 = await hash_file(item.path)
+            key = (sha256, normalize_caption(item.caption))
+            if key in reviews:
+                # Same bytes and caption as another video; share its review
+                review = await reviews[key]
+                if review is None:
+                    return error_row(item, sha256, "Analysis of an identical video failed")
+                return review_row(item, sha256, review)
+
+            future = reviews[key] = asyncio.get_running_loop().create_future()
+            try:
+                review = await analyze_video(
+                    item.path,
+                    caption=item.caption,
+                    priority=Priority.BATCH,
+                    keep_original=True,
+                    video_sha256=sha256,
+                )
+            except BaseException:
+                # Duplicates waiting on this one fail too; a later run
+                # (or --retry-errors) tries this content again
+                reviews.pop(key, None)
+                future.set_result(None)
+                raise
+            future.set_result(review)
+            return review_row(item, sha256, review)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to analyze {item.path}: {e}")
+            return error_row(item, sha256, str(e))
+
+    async def worker() -> None:
+        while True:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            row = await analyze(item)
+            writer.write(row)
+            counts[row["status"]] += 1
+            finished = counts["ok"] + counts["error"]
+            score = f"score {row['overall_score']}" if row["status"] == "ok" else "error"
+            logger.info(
+                f"[{finished}/{len(pending)}] {item.id}: {score} "
+                f"({finished / (time.monotonic() - started) * 60:.1f} videos/min)"
+            )
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(pending)))))
+    return counts["ok"], counts["error"]
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="ugc-batch",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("source", type=Path, help="Directory of videos, or a .csv/.jsonl manifest")
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        required=True,
+        help="Result file (.jsonl or .csv); existing results are skipped",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("jsonl", "csv"),
+        help="Output format (default: from the output file extension)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=int,
+        default=settings.analysis_concurrency,
+        help="Videos analyzed at once (default: ANALYSIS_CONCURRENCY)",
+    )
+    parser.add_argument(
+        "--retry-errors", action="store_true", help="Re-run videos whose last result was an error"
+    )
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> int:
+    items = load_items(args.source)
+    fmt = args.format or ("csv" if args.output.suffix.lower() == ".csv" else "jsonl")
+    writer = ResultWriter(args.output, fmt)
+
+    if settings.analysis_cache_persistent:
+        await init_db()
+    check_preprocessing()
+
+    writer.open()
+    try:
+        ok, failed = await run_batch(items, writer, args.concurrency, args.retry_errors)
+    finally:
+        writer.close()
+        shutdown_preprocessing()
+
+    logger.info(f"Done: {ok} analyzed, {failed} failed. Results in {args.output}")
+    return 1 if failed else 0
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point (`ugc-batch`)."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = _parse_args(argv)
+    try:
+        sys.exit(asyncio.run(_main(args)))
+    except KeyboardInterrupt:
+        logger.warning(f"Interrupted; re-run the same command to resume from {args.output}")
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,36 @@
 """Core infrastructure modules."""
 
-from app.core.database import init_db, get_session, engine
-from app.core.slack import slack_app, slack_handler
+from app.core.database import (
+    init_db,
+    get_session,
+    engine,
+    run_in_session_scope,
+    session_scope,
+    use_session,
+    warm_pool,
+)
+from app.core.gemini import GeminiLimiter, gemini_limiter, gemini_scheduler
+from app.core.http_client import init_http_client, close_http_client, get_http_client
+from app.core.job_queue import JobQueue, job_queue
+from app.core.rate_limiter import Priority, RequestScheduler, TokenBucket
 
-__all__ = ["init_db", "get_session", "engine", "slack_app", "slack_handler"]
+__all__ = [
+    "init_db",
+    "get_session",
+    "engine",
+    "run_in_session_scope",
+    "session_scope",
+    "use_session",
+    "warm_pool",
+    "GeminiLimiter",
+    "gemini_limiter",
+    "gemini_scheduler",
+    "init_http_client",
+    "close_http_client",
+    "get_http_client",
+    "JobQueue",
+    "job_queue",
+    "Priority",
+    "RequestScheduler",
+    "TokenBucket",
+]
@@ -1,18 +1,32 @@
 """Database engine and session management."""
 
+import asyncio
 import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from pathlib import Path
 
+from sqlalchemy import event, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 
 from app.config import settings
+from app.core.metrics import db_query_seconds
 
 logger = logging.getLogger(__name__)
 
 # Global engine
 engine: AsyncEngine | None = None
 
+# Session shared by every repository call inside session_scope(), with a lock
+# because concurrent tasks in one scope (e.g. multi-video reviews) share it
+_scoped_session: ContextVar[tuple[AsyncSession, asyncio.Lock] | None] = ContextVar(
+    "scoped_session", default=None
+)
+
 
 def get_database_url() -> str:
     """Get the database URL from settings or construct SQLite URL for local dev."""
@@ -54,14 +68,138 @@ async def init_db() -> None:
         database_url,
         echo=False,
         connect_args=connect_args,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
     )
 
+    if is_sqlite:
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    event.listen(engine.sync_engine, "before_cursor_execute", _start_query_timer)
+    event.listen(engine.sync_engine, "after_cursor_execute", _observe_query_time)
+
     db_type = "SQLite" if is_sqlite else "PostgreSQL"
     logger.info(f"Database initialized ({db_type})")
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply performance pragmas to every new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers run alongside the writer instead of "database is locked"
+    cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.close()
+
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _observe_query_time(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started"].pop()
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+    db_query_seconds.observe(time.perf_counter() - started, operation=operation)
+
+
+async def warm_pool() -> None:
+    """Open pool connections up front so the first event doesn't pay for setup."""
+    if engine is None:
+        raise RuntimeError("Database not initialized. Call init_db() first.")
+
+    count = min(settings.db_pool_warm_connections, settings.db_pool_size)
+    if count <= 0:
+        return
+
+    async def _connect() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.gather(*(_connect() for _ in range(count)))
+        logger.info(f"Warmed database pool with {count} connection(s)")
+    except Exception as e:
+        logger.warning(f"Database pool warm-up failed: {e}")
+
+
 async def get_session() -> AsyncSession:
     """Get a new database session."""
     if engine is None:
         raise RuntimeError("Database not initialized. Call init_db() first.")
-    return AsyncSession(engine)
+    # Repositories hand rows back to callers after committing, so keep them loaded
+    return AsyncSession(engine, expire_on_commit=False)
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """
+    Share one session across all repository calls in the block.
+
+    Used as a unit of work per Slack event so a handler path doesn't open a
+    new session for every query. Each use_session() block ends its
+    transaction on the way out, so the session only holds a connection during
+    a repository call and long Gemini calls inside the scope don't pin one.
+    """
+    session = await get_session()
+    token = _scoped_session.set((session, asyncio.Lock()))
+    try:
+        yield session
+    finally:
+        _scoped_session.reset(token)
+        await session.close()
+
+
+async def run_in_session_scope(func, *args, **kwargs) -> None:
+    """Run a coroutine function inside its own session_scope() (e.g. as a queued job)."""
+    async with session_scope():
+        await func(*args, **kwargs)
+
+
+@asynccontextmanager
+async def use_session() -> AsyncIterator[AsyncSession]:
+    """
+    Use the current session_scope() session, or a new session outside one.
+
+    A transaction left open by the block (e.g. by a read) is committed when it
+    exits, which returns the scoped session's connection to the pool; commit
+    rather than rollback so the rows just read stay loaded.
+    """
+    scoped = _scoped_session.get()
+    if scoped is None:
+        async with await get_session() as session:
+            yield session
+        return
+
+    session, lock = scoped
+    async with lock:
+        try:
+            yield session
+        except Exception:
+            # Leave the shared session usable for the rest of the scope
+            await session.rollback()
+            raise
+        if session.in_transaction():
+            await session.commit()
+
+
+def is_postgresql() -> bool:
+    """Whether the engine is connected to PostgreSQL (as opposed to SQLite)."""
+    return engine is not None and engine.dialect.name == "postgresql"
+
+
+def upsert(model):
+    """
+    Get a dialect-specific INSERT for a model that supports ON CONFLICT.
+
+    Args:
+        model: SQLModel table class
+
+    Returns:
+        A PostgreSQL or SQLite insert construct with on_conflict_do_update/nothing
+    """
+    if is_postgresql():
+        return postgresql.insert(model)
+    return sqlite.insert(model)
@@ -0,0 +1,176 @@
+"""Shared Gemini client, request concurrency limits and quota scheduling."""
+
+import asyncio
+import logging
+import random
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from google import genai
+from google.genai import errors, types
+
+from app.config import settings
+from app.core.metrics import (
+    gemini_request_seconds,
+    gemini_requests,
+    gemini_tokens,
+    gemini_waiting,
+)
+from app.core.rate_limiter import Priority, RequestScheduler
+from app.core.tracing import set_span_attributes, span, traced
+
+logger = logging.getLogger(__name__)
+
+# Status codes that mean "try again later" rather than "this request is wrong"
+RETRYABLE_STATUS_CODES = {429, 500, 503}
+
+# Shared Gemini client; services use its native async surface (`client.aio`)
+client = genai.Client(
+    api_key=settings.gemini_api_key,
+    http_options=(
+        types.HttpOptions(base_url=settings.gemini_base_url) if settings.gemini_base_url else None
+    ),
+)
+
+
+class GeminiLimiter:
+    """
+    Caps concurrent Gemini calls per kind of request.
+
+    Uploads move large files and are bounded separately from generation so a
+    burst of uploads can't starve review/comment generation, and vice versa.
+    Lightweight file metadata calls (status checks, deletes) get their own
+    limit so they never queue behind long uploads.
+    """
+
+    def __init__(
+        self,
+        upload_concurrency: int,
+        generate_concurrency: int,
+        metadata_concurrency: int,
+    ) -> None:
+        self._upload = asyncio.Semaphore(upload_concurrency)
+        self._generate = asyncio.Semaphore(generate_concurrency)
+        self._metadata = asyncio.Semaphore(metadata_concurrency)
+
+    @asynccontextmanager
+    async def upload(self) -> AsyncIterator[None]:
+        """Hold an upload slot for the duration of the block."""
+        async with self._upload:
+            yield
+
+    @asynccontextmanager
+    async def generate(self) -> AsyncIterator[None]:
+        """Hold a generate_content slot for the duration of the block."""
+        async with self._generate:
+            yield
+
+    @asynccontextmanager
+    async def metadata(self) -> AsyncIterator[None]:
+        """Hold a slot for a file status or delete call."""
+        async with self._metadata:
+            yield
+
+
+# Global limiter shared by every Gemini caller in the process
+gemini_limiter = GeminiLimiter(
+    upload_concurrency=settings.gemini_upload_concurrency,
+    generate_concurrency=settings.gemini_generate_concurrency,
+    metadata_concurrency=settings.gemini_metadata_concurrency,
+)
+
+# Global RPM/TPM budget for generate_content calls
+gemini_scheduler = RequestScheduler(
+    requests_per_minute=settings.gemini_rpm_limit,
+    tokens_per_minute=settings.gemini_tpm_limit,
+)
+gemini_waiting.set_function(lambda: gemini_scheduler.waiting)
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Rough token count for text (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+@traced("gemini.generate_content", attributes=("model", "estimated_tokens"))
+async def generate_content(
+    *,
+    priority: Priority,
+    estimated_tokens: int,
+    model: str,
+    contents: Any,
+    config: types.GenerateContentConfig | None = None,
+) -> types.GenerateContentResponse:
+    """
+    Call generate_content within the RPM/TPM budget and concurrency limit.
+
+    Requests wait for quota in priority order. Quota and transient server
+    errors are retried with exponential backoff instead of being surfaced to
+    the creator; a quota error also pauses the whole scheduler.
+
+    Args:
+        priority: Scheduling class for the request
+        estimated_tokens: Expected input + output tokens, charged up front
+        model: Gemini model name
+        contents: Request contents
+        config: Optional generation config
+
+    Returns:
+        The Gemini response
+    """
+    attempt = 0
+    set_span_attributes(priority=priority.name)
+    while True:
+        with span("gemini.quota_wait"):
+            await gemini_scheduler.acquire(priority, estimated_tokens)
+        try:
+            async with gemini_limiter.generate():
+                with gemini_request_seconds.time(model=model):
+                    response = await client.aio.models.generate_content(
+                        model=model,
+                        contents=contents,
+                        config=config,
+                    )
+        except errors.APIError as e:
+            gemini_requests.inc(model=model, status=str(e.code))
+            if e.code not in RETRYABLE_STATUS_CODES or attempt >= settings.gemini_max_retries:
+                raise
+            attempt += 1
+            delay = min(settings.gemini_retry_base_delay * 2 ** (attempt - 1), 60.0)
+            delay *= random.uniform(0.8, 1.2)
+            logger.warning(
+                f"Gemini returned {e.code}; retrying in {delay:.1f}s "
+                f"(attempt {attempt}/{settings.gemini_max_retries})"
+            )
+            if e.code == 429:
+                # Quota exhausted - hold everyone back, not just this request
+                gemini_scheduler.pause(delay)
+            await asyncio.sleep(delay)
+            continue
+
+        gemini_requests.inc(model=model, status="200")
+        usage = response.usage_metadata
+        set_span_attributes(
+            retries=attempt,
+            total_tokens=usage.total_token_count if usage else None,
+        )
+        gemini_scheduler.record_usage(
+            estimated_tokens, usage.total_token_count if usage else None
+        )
+        _record_token_usage(model, usage)
+        return response
+
+
+def _record_token_usage(model: str, usage: types.GenerateContentResponseUsageMetadata | None) -> None:
+    """Count the tokens a response reports, by kind."""
+    if usage is None:
+        return
+    for kind, count in (
+        ("prompt", usage.prompt_token_count),
+        ("cached", usage.cached_content_token_count),
+        ("output", usage.candidates_token_count),
+        ("thoughts", usage.thoughts_token_count),
+    ):
+        if count:
+            gemini_tokens.inc(count, model=model, kind=kind)
@@ -0,0 +1,58 @@
+"""Shared async HTTP client with a pooled, keep-alive connection set."""
+
+import importlib.util
+import logging
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Global client, created in the app lifespan
+http_client: httpx.AsyncClient | None = None
+
+
+async def init_http_client() -> None:
+    """Create the application-wide HTTP client."""
+    global http_client
+
+    http2 = settings.http_http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+        http2 = False
+
+    http_client = httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.http_connect_timeout,
+            read=settings.http_read_timeout,
+            write=settings.http_write_timeout,
+            pool=settings.http_pool_timeout,
+        ),
+    )
+    logger.info(
+        f"HTTP client initialized (max_connections={settings.http_max_connections}, "
+        f"http2={http2})"
+    )
+
+
+async def close_http_client() -> None:
+    """Close the HTTP client and its pooled connections."""
+    global http_client
+
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client."""
+    if http_client is None:
+        raise RuntimeError("HTTP client not initialized. Call init_http_client() first.")
+    return http_client
@@ -0,0 +1,121 @@
+"""In-process background job queue with a bounded pool of async workers."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.config import settings
+from app.core.metrics import job_queue_depth, jobs_in_flight
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """Bounded asyncio queue drained by a fixed number of worker tasks.
+
+    Slack listeners enqueue work here and return immediately, so the
+    `/slack/events` request is acknowledged well inside Slack's 3-second window
+    while the slow download/analysis pipeline runs in the background.
+    """
+
+    def __init__(self, name: str, workers: int, max_size: int = 0) -> None:
+        self.name = name
+        self.worker_count = workers
+        self._queue: asyncio.Queue[tuple[Callable[..., Awaitable[Any]], tuple, dict]] = (
+            asyncio.Queue(maxsize=max_size)
+        )
+        self._workers: list[asyncio.Task] = []
+        self._in_flight = 0
+        job_queue_depth.set_function(lambda: self.depth, queue=name)
+        jobs_in_flight.set_function(lambda: self.in_flight, queue=name)
+
+    @property
+    def depth(self) -> int:
+        """Number of jobs waiting to be picked up by a worker."""
+        return self._queue.qsize()
+
+    @property
+    def full(self) -> bool:
+        """Whether submit() would currently be rejected."""
+        return self._queue.full()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of jobs currently being processed."""
+        return self._in_flight
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker pool has been started."""
+        return bool(self._workers)
+
+    def submit(self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> None:
+        """
+        Enqueue a coroutine function to be run by a worker.
+
+        Args:
+            func: Coroutine function to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Raises:
+            asyncio.QueueFull: If the queue is at capacity
+        """
+        self._queue.put_nowait((func, args, kwargs))
+        logger.debug(f"Queued {func.__name__} on {self.name} (depth={self.depth})")
+
+    async def start(self) -> None:
+        """Start the worker tasks."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"{self.name}-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        logger.info(f"Started {self.worker_count} {self.name} workers")
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop the workers, giving queued jobs up to `timeout` seconds to finish.
+
+        Args:
+            timeout: Seconds to wait for the queue to drain before cancelling
+        """
+        if not self._workers:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"{self.name} did not drain within {timeout}s "
+                f"({self.depth} queued, {self.in_flight} in flight); cancelling"
+            )
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info(f"Stopped {self.name} workers")
+
+    async def _worker(self, index: int) -> None:
+        """Pull jobs off the queue forever, isolating failures per job."""
+        while True:
+            func, args, kwargs = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await func(*args, **kwargs)
+            except Exception as e:
+                logger.exception(f"{self.name} worker {index} job {func.__name__} failed: {e}")
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+
+# Global queue for video analysis and thread-reply work
+job_queue = JobQueue(
+    name="analysis",
+    workers=settings.analysis_workers,
+    max_size=settings.analysis_queue_size,
+)
@@ -0,0 +1,104 @@
+"""Lease helpers for coordinating work across replicas.
+
+Rows that only one process may work on at a time (analysis jobs, pending
+approvals) carry a lease: the owning replica's id and an expiry time. The
+owner keeps extending the expiry while it works; if it dies, the lease lapses
+and another replica may claim the row.
+"""
+
+import asyncio
+import logging
+import socket
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Unique per process, so a restarted container never inherits its old leases
+replica_id = settings.replica_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+
+
+def lease_expiry() -> datetime:
+    """Expiry time for a lease taken or renewed now (naive UTC, like created_at)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(
+        seconds=settings.lease_seconds
+    )
+
+
+class LeaseLost(Exception):
+    """Raised when another replica has taken over a lease the work depended on."""
+
+
+async def ensure_lease(renew: Callable[[], Awaitable[object]], name: str) -> None:
+    """
+    Renew a lease right before an irreversible step (e.g. posting to Slack).
+
+    Args:
+        renew: Coroutine function that extends the lease; returning False
+            means the lease was lost
+        name: What the lease covers, for logging
+
+    Raises:
+        LeaseLost: If another replica owns the lease now
+    """
+    if await renew() is False:
+        raise LeaseLost(f"Lease on {name} was lost to another replica")
+
+
+@asynccontextmanager
+async def heartbeat(renew: Callable[[], Awaitable[object]], name: str) -> AsyncIterator[None]:
+    """
+    Keep renewing a lease while the block runs.
+
+    If a renewal finds the lease owned by another replica, the task running
+    the block is cancelled so it stops working on the row.
+
+    Args:
+        renew: Coroutine function that extends the lease; returning False
+            means the lease was lost
+        name: What the lease covers, for logging
+
+    Raises:
+        LeaseLost: If the lease was lost while the block ran
+    """
+    owner = asyncio.current_task()
+    lost = False
+
+    async def _beat() -> None:
+        nonlocal lost
+        while True:
+            await asyncio.sleep(settings.lease_heartbeat_seconds)
+            try:
+                if await renew() is False:
+                    logger.warning(f"Lease on {name} was lost to another replica; stopping")
+                    lost = True
+                    owner.cancel()
+                    return
+            except Exception as e:
+                logger.warning(f"Failed to renew lease on {name}: {e}")
+
+    task = asyncio.create_task(_beat(), name=f"lease-heartbeat-{name}")
+    try:
+        yield
+    except asyncio.CancelledError:
+        if not lost:
+            raise
+        owner.uncancel()
+        raise LeaseLost(f"Lease on {name} was lost to another replica") from None
+    else:
+        if lost:
+            # The block finished before the cancellation reached it; absorb it
+            try:
+                await asyncio.sleep(0)
+            except asyncio.CancelledError:
+                owner.uncancel()
+    finally:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,317 @@
+"""Prometheus-style metrics, rendered in the text exposition format.
+
+A small in-process implementation of counters, gauges and histograms, so
+`/metrics` can be scraped without adding a client library. All updates
+happen on the event loop, so no locking is needed.
+"""
+
+import asyncio
+import math
+import os
+import resource
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from app.config import settings
+from app.core.tracing import Span, span
+
+# Seconds; covers fast DB calls through multi-minute Gemini processing
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        registry.register(self)
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self.samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the count for a label set."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be read from a callback at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self._functions: dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float], **labels: str) -> None:
+        """Read the value from `function` whenever metrics are rendered."""
+        self._functions[self._key(labels)] = function
+
+    def samples(self) -> Iterator[str]:
+        values = dict(self._values)
+        for key, function in self._functions.items():
+            values[key] = float(function())
+        for key, value in values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation."""
+        key = self._key(labels)
+        counts = self._counts.setdefault(key, [0] * len(self.buckets))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the block, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> Iterator[str]:
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(self._sums[key])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format (version 0.0.4)."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+# Global registry served at /metrics
+registry = MetricsRegistry()
+
+# Pipeline stages: pipeline is "video" or "thread_reply"
+stage_seconds = Histogram(
+    "ugc_stage_duration_seconds",
+    "Time spent in each pipeline stage.",
+    ("pipeline", "stage"),
+)
+pipeline_errors = Counter(
+    "ugc_pipeline_errors_total",
+    "Pipeline failures by stage.",
+    ("pipeline", "stage"),
+)
+video_reviews = Counter(
+    "ugc_video_reviews_total",
+    "Finished video reviews by outcome (approved, rejected, error).",
+    ("outcome",),
+)
+approvals_posted = Counter(
+    "ugc_approvals_posted_total",
+    "Approved content posts sent to the approved content channel.",
+)
+cache_lookups = Counter(
+    "ugc_cache_lookups_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ("cache", "result"),
+)
+
+
+# In-flight work
+job_queue_depth = Gauge("ugc_job_queue_depth", "Jobs waiting for a worker.", ("queue",))
+jobs_in_flight = Gauge("ugc_jobs_in_flight", "Jobs currently being processed.", ("queue",))
+gemini_waiting = Gauge("ugc_gemini_waiting_requests", "Gemini requests waiting for RPM/TPM budget.")
+gemini_files_processing = Gauge(
+    "ugc_gemini_files_processing", "Uploaded files waiting to leave PROCESSING."
+)
+
+# Gemini usage
+gemini_request_seconds = Histogram(
+    "ugc_gemini_request_duration_seconds",
+    "Latency of generate_content calls (excluding quota waits).",
+    ("model",),
+)
+gemini_requests = Counter(
+    "ugc_gemini_requests_total",
+    "generate_content calls by model and status code (200 on success).",
+    ("model", "status"),
+)
+gemini_tokens = Counter(
+    "ugc_gemini_tokens_total",
+    "Tokens reported in usage_metadata, by model and kind (prompt, cached, output, thoughts).",
+    ("model", "kind"),
+)
+
+# Process health
+event_loop_lag = Histogram(
+    "ugc_event_loop_lag_seconds",
+    "How late the event loop runs a task scheduled for now (blocking work shows up here).",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+resident_memory = Gauge("ugc_process_resident_memory_bytes", "Resident memory of this process.")
+
+# Database
+db_query_seconds = Histogram(
+    "ugc_db_query_duration_seconds",
+    "Database statement latency by statement type.",
+    ("operation",),
+)
+
+
+@contextmanager
+def track_stage(pipeline: str, stage: str, **attributes) -> Iterator[Span | None]:
+    """Time a pipeline stage, trace it as a span, and count it as an error if it raises."""
+    started = time.perf_counter()
+    try:
+        with span(f"{pipeline}.{stage}", **attributes) as current:
+            yield current
+    except Exception:
+        pipeline_errors.inc(pipeline=pipeline, stage=stage)
+        raise
+    finally:
+        stage_seconds.observe(time.perf_counter() - started, pipeline=pipeline, stage=stage)
+
+
+def _resident_memory_bytes() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Peak rather than current usage, but available everywhere (KB on Linux)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+resident_memory.set_function(_resident_memory_bytes)
+
+# Background task that samples event loop lag
+_lag_monitor: asyncio.Task | None = None
+
+
+async def _monitor_loop_lag(interval: float) -> None:
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        event_loop_lag.observe(max(time.perf_counter() - started - interval, 0.0))
+
+
+def start_loop_lag_monitor() -> None:
+    """Start sampling event loop lag every `event_loop_lag_interval_seconds`."""
+    global _lag_monitor
+    if settings.event_loop_lag_interval_seconds <= 0:
+        return
+    if _lag_monitor is None or _lag_monitor.done():
+        _lag_monitor = asyncio.create_task(
+            _monitor_loop_lag(settings.event_loop_lag_interval_seconds), name="loop-lag-monitor"
+        )
+
+
+async def stop_loop_lag_monitor() -> None:
+    """Stop the event loop lag sampler."""
+    global _lag_monitor
+    if _lag_monitor is not None:
+        _lag_monitor.cancel()
+        try:
+            await _lag_monitor
+        except asyncio.CancelledError:
+            pass
+        _lag_monitor = None
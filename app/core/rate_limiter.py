@@ -0,0 +1,162 @@
+"""Token-bucket rate limiting with a priority-ordered wait queue."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Scheduling classes; lower values are served first."""
+
+    INTERACTIVE = 0  # A creator is waiting in a thread (comment generation)
+    REVIEW = 1  # Full video reviews
+    BATCH = 2  # Offline/bulk work
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously up to a per-minute capacity.
+
+    A capacity of 0 disables the bucket (unlimited).
+    """
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        # Oversized requests only need a full bucket, otherwise they'd never run
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self._rate
+
+    def consume(self, amount: float) -> None:
+        """Take tokens; may go negative when correcting for actual usage."""
+        if self.unlimited:
+            return
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """Return tokens that were over-estimated."""
+        if self.unlimited:
+            return
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    tokens: int = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class RequestScheduler:
+    """
+    Grants requests against requests-per-minute and tokens-per-minute budgets.
+
+    Waiters are served strictly by priority, then arrival order, so higher
+    priority work never sits behind a backlog of bulk requests. Work waits
+    for capacity instead of being sent and failing with a quota error.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int) -> None:
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._waiters: list[_Waiter] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._paused_until = 0.0
+
+    @property
+    def waiting(self) -> int:
+        """Number of requests waiting for capacity."""
+        return sum(1 for w in self._waiters if not w.future.done())
+
+    async def acquire(self, priority: Priority, tokens: int) -> None:
+        """
+        Wait until the request fits in both budgets, then consume it.
+
+        Args:
+            priority: Scheduling class
+            tokens: Estimated token cost of the request
+        """
+        waiter = _Waiter(
+            priority=int(priority),
+            sequence=next(self._sequence),
+            tokens=tokens,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(self._waiters, waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        finally:
+            # A cancelled head waiter must not block the ones behind it
+            if waiter.future.cancelled():
+                self._dispatch()
+
+    def record_usage(self, estimated: int, actual: int | None) -> None:
+        """Correct the token budget once the real usage of a request is known."""
+        if actual is None:
+            return
+        if actual > estimated:
+            self.tokens.consume(actual - estimated)
+        elif actual < estimated:
+            self.tokens.refund(estimated - actual)
+            self._dispatch()
+
+    def pause(self, seconds: float) -> None:
+        """Stop granting requests for a while (e.g. after a quota error)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning(f"Request scheduler paused for {seconds:.1f}s")
+
+    def _dispatch(self) -> None:
+        """Grant as many head-of-queue waiters as the budgets allow."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._waiters:
+            head = self._waiters[0]
+            if head.future.done():
+                heapq.heappop(self._waiters)
+                continue
+
+            wait = max(
+                self._paused_until - time.monotonic(),
+                self.requests.wait_time(1),
+                self.tokens.wait_time(head.tokens),
+            )
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+
+            heapq.heappop(self._waiters)
+            self.requests.consume(1)
+            self.tokens.consume(head.tokens)
+            head.future.set_result(None)
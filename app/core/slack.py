@@ -2,14 +2,28 @@
 
 from slack_bolt.adapter.fastapi.async_handler import AsyncSlackRequestHandler
 from slack_bolt.async_app import AsyncApp
+from slack_sdk.web.async_client import AsyncWebClient
 
 from app.config import settings
 
-# Initialize the Slack Bolt app
-slack_app = AsyncApp(
-    token=settings.slack_bot_token,
-    signing_secret=settings.slack_signing_secret,
+settings.require(
+    "slack_bot_token", "slack_signing_secret", "video_review_channel", "approved_content_channel"
 )
 
+# Initialize the Slack Bolt app
+if settings.slack_api_base_url:
+    slack_app = AsyncApp(
+        client=AsyncWebClient(
+            token=settings.slack_bot_token,
+            base_url=settings.slack_api_base_url.rstrip("/") + "/",
+        ),
+        signing_secret=settings.slack_signing_secret,
+    )
+else:
+    slack_app = AsyncApp(
+        token=settings.slack_bot_token,
+        signing_secret=settings.slack_signing_secret,
+    )
+
 # Create the handler for FastAPI integration
 slack_handler = AsyncSlackRequestHandler(slack_app)
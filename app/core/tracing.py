@@ -0,0 +1,284 @@
+"""Lightweight tracing spans for finding slow individual requests.
+
+Spans nest through a context variable, so stages awaited inside a span (and
+tasks started from it, e.g. with asyncio.gather) become its children. Each
+finished span is handed to the configured exporters:
+
+- a JSONL file writer, one span per line with OTLP field names, that can be
+  loaded into any trace viewer or grepped without running a collector; the
+  file is written from a background thread, never on the event loop
+- a console exporter that logs a sample of traces, plus every span slower
+  than the slow-span threshold
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+AttributeValue = str | int | float | bool
+
+
+@dataclass
+class Span:
+    """One timed operation within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    sampled: bool
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    error: str | None = None
+
+    @property
+    def duration_seconds(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: AttributeValue | None) -> None:
+        """Tag the span; None values are skipped."""
+        if value is not None:
+            self.attributes[key] = value
+
+    def to_otlp(self) -> dict[str, Any]:
+        """The span as an OTLP/JSON span object."""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+
+
+def _otlp_value(value: AttributeValue) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class JsonlSpanExporter:
+    """Appends finished spans to a file, one OTLP/JSON span per line."""
+
+    def __init__(self, path: str, flush_every: int) -> None:
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self._buffer: list[str] = []
+        # Batches of lines for the writer thread; None tells it to stop
+        self._batches: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+        self._writer: threading.Thread | None = None
+
+    def export(self, span: Span) -> None:
+        self._buffer.append(json.dumps(span.to_otlp(), separators=(",", ":")))
+        # Write whole traces at once rather than a small write per span
+        if span.parent_id is None or len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand the buffered spans to the writer thread."""
+        if not self._buffer:
+            return
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._write_batches, name="span-writer", daemon=True
+            )
+            self._writer.start()
+        self._batches.put("\n".join(self._buffer) + "\n")
+        self._buffer.clear()
+
+    def close(self) -> None:
+        """Write out buffered spans and wait for the writer thread to finish."""
+        self.flush()
+        if self._writer is not None:
+            self._batches.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _write_batches(self) -> None:
+        stopping = False
+        while not stopping:
+            batches = [self._batches.get()]
+            # Append everything queued meanwhile with a single open
+            while not self._batches.empty():
+                batches.append(self._batches.get())
+            if None in batches:
+                stopping = True
+                batches = [batch for batch in batches if batch is not None]
+            if not batches:
+                continue
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write("".join(batches))
+            except OSError as e:
+                logger.warning(f"Could not write spans to {self.path}: {e}")
+
+
+class ConsoleSpanExporter:
+    """Logs spans of sampled traces, and any span slower than a threshold."""
+
+    def __init__(self, slow_seconds: float) -> None:
+        self.slow_seconds = slow_seconds
+
+    def export(self, span: Span) -> None:
+        slow = self.slow_seconds > 0 and span.duration_seconds >= self.slow_seconds
+        if not (span.sampled or slow):
+            return
+        attributes = " ".join(f"{k}={v}" for k, v in span.attributes.items())
+        logger.log(
+            logging.WARNING if slow or span.error else logging.INFO,
+            f"span {span.name} {span.duration_seconds * 1000:.1f}ms "
+            f"trace={span.trace_id[:16]}{' SLOW' if slow else ''}"
+            f"{f' error={span.error!r}' if span.error else ''} {attributes}".rstrip(),
+        )
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+# The span that new spans are parented to
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+_exporters: list[JsonlSpanExporter | ConsoleSpanExporter] = []
+
+
+def init_tracing() -> None:
+    """Set up the exporters from settings."""
+    shutdown_tracing()
+    if not settings.tracing_enabled:
+        return
+    if settings.tracing_jsonl_path:
+        _exporters.append(
+            JsonlSpanExporter(settings.tracing_jsonl_path, settings.tracing_jsonl_flush_every)
+        )
+    if settings.tracing_console_sample_rate > 0 or settings.tracing_slow_span_seconds > 0:
+        _exporters.append(ConsoleSpanExporter(settings.tracing_slow_span_seconds))
+    logger.info(f"Tracing initialized with {len(_exporters)} exporter(s)")
+
+
+def shutdown_tracing() -> None:
+    """Write out buffered spans and stop the exporters."""
+    for exporter in _exporters:
+        exporter.close()
+    _exporters.clear()
+
+
+def current_span() -> Span | None:
+    """The innermost active span, if any."""
+    return _current_span.get()
+
+
+def set_span_attributes(**attributes: AttributeValue | None) -> None:
+    """Tag the current span, if there is one."""
+    current = _current_span.get()
+    if current is not None:
+        for key, value in attributes.items():
+            current.set_attribute(key, value)
+
+
+@contextmanager
+def span(name: str, **attributes: AttributeValue | None) -> Iterator[Span | None]:
+    """
+    Time a block as a span, child of the current span if there is one.
+
+    Args:
+        name: Span name (e.g. "video.download")
+        **attributes: Tags for the span; None values are skipped
+
+    Yields:
+        The span, so more attributes can be added once known (None when
+        tracing is off)
+    """
+    if not _exporters:
+        yield None
+        return
+
+    parent = _current_span.get()
+    current = Span(
+        name=name,
+        trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+        span_id=os.urandom(8).hex(),
+        parent_id=parent.span_id if parent else None,
+        # Sample whole traces so the console shows complete requests
+        sampled=(
+            parent.sampled if parent else random.random() < settings.tracing_console_sample_rate
+        ),
+    )
+    for key, value in attributes.items():
+        current.set_attribute(key, value)
+
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end_ns = time.time_ns()
+        for exporter in _exporters:
+            try:
+                exporter.export(current)
+            except Exception as e:
+                logger.warning(f"Span exporter failed: {e}")
+
+
+def traced(
+    name: str, attributes: Sequence[str] = ()
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """
+    Decorate a coroutine function so each call is a span.
+
+    Args:
+        name: Span name
+        attributes: Argument names whose values are recorded on the span
+    """
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            if not _exporters:
+                return await func(*args, **kwargs)
+            bound = signature.bind_partial(*args, **kwargs).arguments
+            tags = {key: bound.get(key) for key in attributes}
+            with span(name, **tags):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,18 +1,26 @@
 """Unified handler for all message events."""
 
+import asyncio
 import logging
 import re
+from collections.abc import Awaitable, Callable
 
+from app.core.database import run_in_session_scope
+from app.core.job_queue import job_queue
+from app.core.leases import LeaseLost, ensure_lease, heartbeat, replica_id
+from app.core.metrics import approvals_posted, track_stage
+from app.core.tracing import set_span_attributes, traced
 from app.core.slack import slack_app
 from app.config import settings
 from app.services import (
-    analyze_video,
-    download_file,
-    cleanup_file,
     generate_engagement_comments,
+    event_deduplicator,
+    event_dedup_keys,
+    new_jobs_for_message,
+    process_message_jobs,
 )
-from app.repositories import ApprovalRepository
-from app.utils import markdown_to_slack
+from app.models import PendingApproval
+from app.repositories import AnalysisJobRepository, ApprovalRepository, pending_thread_index
 
 logger = logging.getLogger(__name__)
 
@@ -54,14 +62,8 @@ def _extract_links(text: str) -> dict[str, str | None]:
     }
 
 
-def _create_video_summary(review_text: str) -> str:
-    """Create a brief summary from the review for comment generation."""
-    # Just use the first part of the review as context
-    return review_text[:1500] if review_text else ""
-
-
 @slack_app.event("message")
-async def handle_message(event: dict, say, client) -> None:
+async def handle_message(event: dict, body: dict, say, client) -> None:
     """Handle all incoming messages - video uploads and thread replies."""
     # Ignore bot messages
     if event.get("bot_id") or event.get("subtype") == "bot_message":
@@ -73,14 +75,50 @@ async def handle_message(event: dict, say, client) -> None:
         return
 
     thread_ts = event.get("thread_ts")
+    if not thread_ts and not any(_is_video_file(f) for f in event.get("files", [])):
+        return
 
-    # Route to appropriate handler
+    # Most thread replies are chatter in threads with nothing pending
+    if thread_ts and not pending_thread_index.might_be_pending(thread_ts):
+        return
+
+    # Drop Slack retries and re-deliveries before any download or Gemini work
+    dedup_keys = event_dedup_keys(event, body.get("event_id"))
+    if await event_deduplicator.is_duplicate(dedup_keys):
+        return
+
+    # Route to appropriate handler. The work itself runs on the background job
+    # queue so this listener returns (and Slack gets its ack) immediately.
     if thread_ts:
-        await _handle_thread_reply(event, say, client, thread_ts)
+        await _enqueue(event, say, dedup_keys, _handle_thread_reply, event, say, client, thread_ts)
     else:
-        await _handle_video_upload(event, say, client)
+        await _enqueue(event, say, dedup_keys, _handle_video_upload, event, say, client)
 
 
+async def _enqueue(event: dict, say, dedup_keys: list[str], func, *args) -> None:
+    """Submit a handler to the job queue, telling the creator if we're at capacity."""
+    try:
+        job_queue.submit(run_in_session_scope, func, *args)
+    except asyncio.QueueFull:
+        logger.warning(
+            f"Job queue full ({job_queue.depth} queued); dropping {func.__name__} "
+            f"for message {event.get('ts')}"
+        )
+        # Nothing was done with the event, so a retry or re-post must not be
+        # dropped as a duplicate of it
+        await event_deduplicator.release(dedup_keys)
+        # Only video uploads get a visible reply; thread chatter is dropped silently
+        if func is _handle_video_upload:
+            await say(
+                text=(
+                    "We're reviewing a lot of videos right now. "
+                    "Please re-post yours in a few minutes."
+                ),
+                thread_ts=event.get("ts"),
+            )
+
+
+@traced("video_upload")
 async def _handle_video_upload(event: dict, say, client) -> None:
     """Handle video uploads in the main channel."""
     # Check for file attachments
@@ -90,101 +128,56 @@ async def _handle_video_upload(event: dict, say, client) -> None:
     if not video_files:
         return
 
-    # Process the first video file
-    video_file = video_files[0]
+    if len(video_files) > settings.max_videos_per_message:
+        logger.warning(
+            f"Message has {len(video_files)} videos; only reviewing the first "
+            f"{settings.max_videos_per_message}"
+        )
+        video_files = video_files[: settings.max_videos_per_message]
+
     user_id = event.get("user")
     message_ts = event.get("ts")
-    channel = event.get("channel")
+    set_span_attributes(message_ts=message_ts, user_id=user_id, videos=len(video_files))
 
     # Extract caption from message text
     caption = _extract_caption(event)
 
+    # Record a durable job per video; jobs that already exist are being (or
+    # were) handled elsewhere, e.g. a re-delivery after a restart
+    with track_stage("video", "create_jobs"):
+        jobs = await AnalysisJobRepository.create_many(
+            new_jobs_for_message(event, video_files, caption)
+        )
+    if not jobs:
+        logger.info(f"Analysis jobs for message {message_ts} already exist; skipping")
+        return
+
     logger.info(
-        f"Processing video from user {user_id}: {video_file.get('name')}"
+        f"Processing {len(jobs)} video(s) from user {user_id}: "
+        f"{', '.join(job.file_name for job in jobs)}"
         f"{' (with caption)' if caption else ''}"
     )
 
     # Send initial processing message
-    processing_msg = "Analyzing your video"
+    processing_msg = f"Analyzing your {len(jobs)} videos" if len(jobs) > 1 else "Analyzing your video"
     if caption:
         processing_msg += " and caption"
     processing_msg += "... This may take a moment."
 
-    await say(text=processing_msg, thread_ts=message_ts)
+    with track_stage("video", "acknowledge"):
+        await say(text=processing_msg, thread_ts=message_ts)
 
-    try:
-        # Download the video
-        local_path = await download_file(
-            url_private_download=video_file["url_private_download"],
-            file_id=video_file["id"],
-            filename=video_file["name"],
-        )
-
-        # Analyze with Gemini - returns structured VideoReview object
-        review = await analyze_video(local_path, caption)
-
-        # Format and post the review in the thread
-        formatted_review = review.to_slack_message()
-        await say(
-            text=f"*Video Analysis Complete*\n\n{formatted_review}",
-            thread_ts=message_ts,
-        )
-
-        # Check if approved based on score threshold
-        is_approved = review.overall_score >= settings.score_threshold
-
-        if is_approved:
-            # Clean up the video immediately after analysis
-            cleanup_file(local_path)
-
-            # Store for later link collection
-            await ApprovalRepository.save(
-                thread_ts=message_ts,
-                user_id=user_id,
-                channel=channel,
-                score=review.overall_score,
-                review_text=formatted_review,
-                virality_tier=review.virality_tier,
-                caption=caption,
-            )
-
-            await say(
-                text=(
-                    f"Congratulations! Your video scored *{review.overall_score}/100* "
-                    f"(Virality Tier: *{review.virality_tier}*) and has been approved for promotion.\n\n"
-                    "Please reply to this thread with your Instagram and/or TikTok post links "
-                    "so we can generate engagement comments for your content."
-                ),
-                thread_ts=message_ts,
-            )
-
-            logger.info(
-                f"Video approved with score {review.overall_score}. Awaiting links from user {user_id}"
-            )
-        else:
-            # Not approved - clean up the video
-            cleanup_file(local_path)
-            logger.info(
-                f"Video not approved. Score: {review.overall_score}, Threshold: {settings.score_threshold}"
-            )
-
-    except Exception as e:
-        logger.exception(f"Error processing video: {e}")
-        # Clean up temp video on error
-        if "local_path" in locals():
-            cleanup_file(local_path)
-        await say(
-            text=f"Sorry, there was an error analyzing your video: {str(e)}",
-            thread_ts=message_ts,
-        )
+    await process_message_jobs(jobs, say)
 
 
+@traced("thread_reply", attributes=("thread_ts",))
 async def _handle_thread_reply(event: dict, say, client, thread_ts: str) -> None:
     """Handle thread replies looking for social media links."""
     logger.info(f"Thread reply received. thread_ts={thread_ts}, user={event.get('user')}")
 
     # Check if this thread has a pending approval
-    pending = await ApprovalRepository.get_by_thread(thread_ts)
+    with track_stage("thread_reply", "lookup"):
+        pending = await ApprovalRepository.get_by_thread(thread_ts)
     if not pending:
         logger.info(f"No pending approval for thread {thread_ts}")
         return
@@ -208,34 +201,77 @@ async def _handle_thread_reply(event: dict, say, client, thread_ts: str) -> None
 
     logger.info(f"Found social links in thread {thread_ts}: {links}")
 
-    # Get review summary for comment generation
-    video_summary = _create_video_summary(pending.review_text)
+    # Only one reply, on any replica, may post this approval
+    with track_stage("thread_reply", "claim"):
+        claimed = await ApprovalRepository.claim(thread_ts, replica_id)
+    if not claimed:
+        logger.info(f"Approval for thread {thread_ts} is already being posted - ignoring")
+        return
+
+    async def renew() -> bool:
+        return await ApprovalRepository.renew_lease(thread_ts, replica_id)
+
+    posted = False
+    try:
+        async with heartbeat(renew, f"approval {thread_ts}"):
+            posted = await _post_approved_content(claimed, links, say, client, thread_ts, renew)
+    except LeaseLost as e:
+        # Another replica claimed the approval after ours lapsed and posts it
+        logger.warning(f"{e}; not posting it")
+    finally:
+        # Let the creator retry by replying with the links again
+        if not posted:
+            await ApprovalRepository.release(thread_ts, replica_id)
+
+
+async def _post_approved_content(
+    pending: PendingApproval,
+    links: dict[str, str | None],
+    say,
+    client,
+    thread_ts: str,
+    renew: Callable[[], Awaitable[bool]],
+) -> bool:
+    """
+    Generate comments and post the approved content. Returns True once posted.
+
+    Raises:
+        LeaseLost: If renew finds the approval claimed by another replica
+            before anything was posted to the approved channel
+    """
+    # Precomputed review summary for comment generation
+    video_summary = pending.review_summary
     caption = pending.caption
-    comments_sections = []
+    posts = {platform: url for platform, url in links.items() if url}
+
+    await say(
+        text=(
+            "Generating engagement comments for "
+            f"{' and '.join(p.capitalize() for p in posts)}..."
+        ),
+        thread_ts=thread_ts,
+    )
+
+    try:
+        with track_stage("thread_reply", "generate_comments"):
+            comments = await generate_engagement_comments(
+                posts=posts,
+                video_summary=video_summary,
+                caption=caption,
+            )
+        error = "No comments were generated"
+    except Exception as e:
+        logger.exception(f"Error generating comments: {e}")
+        comments = {}
+        error = f"Error generating comments: {str(e)}"
 
-    for platform, url in links.items():
-        if url:
-            try:
-                await say(
-                    text=f"Generating engagement comments for {platform.capitalize()}...",
-                    thread_ts=thread_ts,
-                )
-
-                comments = await generate_engagement_comments(
-                    platform=platform,
-                    post_url=url,
-                    video_summary=video_summary,
-                    caption=caption,
-                )
-                formatted_comments = markdown_to_slack(comments)
-                comments_sections.append(
-                    f"*{platform.upper()} Comments*\n{url}\n\n{formatted_comments}"
-                )
-            except Exception as e:
-                logger.exception(f"Error generating {platform} comments: {e}")
-                comments_sections.append(
-                    f"*{platform.upper()}*\nError generating comments: {str(e)}"
-                )
+    comments_sections = []
+    for platform, url in posts.items():
+        if platform in comments:
+            # Use the link the creator sent, not whatever the model echoed back
+            comments_sections.append(comments[platform].to_slack_message(url))
+        else:
+            comments_sections.append(f"*{platform.upper()}*\n{error}")
 
     # Post to approved content channel
     score = pending.score
@@ -257,12 +293,37 @@ async def _handle_thread_reply(event: dict, say, client, thread_ts: str) -> None
         + "\n\n".join(comments_sections)
     )
 
+    # Comment generation can outlast the lease; never post an approval twice
+    await ensure_lease(renew, f"approval {thread_ts}")
+
     try:
-        await client.chat_postMessage(
-            channel=settings.approved_content_channel,
-            text=approved_message,
+        with track_stage("thread_reply", "post"):
+            await client.chat_postMessage(
+                channel=settings.approved_content_channel,
+                text=approved_message,
+            )
+    except Exception as e:
+        logger.exception(f"Error posting to approved channel: {e}")
+        await say(
+            text=f"Error posting to approved channel: {str(e)}",
+            thread_ts=thread_ts,
         )
+        return False
+
+    approvals_posted.inc()
+    logger.info(
+        f"Posted approved content for user {user_id} to channel "
+        f"{settings.approved_content_channel}"
+    )
 
+    # The post can't be undone: nothing after it may release the approval,
+    # or the creator's next reply would post it again
+    try:
+        await ApprovalRepository.delete(thread_ts)
+    except Exception as e:
+        logger.exception(f"Could not remove posted approval for thread {thread_ts}: {e}")
+
+    try:
         # Confirm to the creator
         await say(
             text=(
@@ -271,18 +332,6 @@ async def _handle_thread_reply(event: dict, say, client, thread_ts: str) -> None
             ),
             thread_ts=thread_ts,
         )
-
-        # Remove from pending approvals
-        await ApprovalRepository.delete(thread_ts)
-
-        logger.info(
-            f"Posted approved content for user {user_id} to channel "
-            f"{settings.approved_content_channel}"
-        )
-
     except Exception as e:
-        logger.exception(f"Error posting to approved channel: {e}")
-        await say(
-            text=f"Error posting to approved channel: {str(e)}",
-            thread_ts=thread_ts,
-        )
+        logger.warning(f"Could not confirm the approved post in thread {thread_ts}: {e}")
+    return True
@@ -3,9 +3,23 @@
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 
-from app.core import slack_handler, init_db
+from app.api import analytics_router, submissions_router
+from app.config import settings
+from app.core import (
+    init_db,
+    warm_pool,
+    init_http_client,
+    close_http_client,
+    job_queue,
+)
+from app.core.metrics import registry, start_loop_lag_monitor, stop_loop_lag_monitor
+from app.core.slack import slack_app, slack_handler
+from app.core.tracing import init_tracing, shutdown_tracing
+from app.repositories import pending_thread_index
+from app.services import start_job_recovery, stop_job_recovery
+from app.services.video_preprocessing import check_preprocessing, shutdown_preprocessing
 
 # Import handler to register event listener
 from app.handlers import message_handler  # noqa: F401
@@ -19,11 +33,29 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events."""
     # Startup
+    init_tracing()
+    start_loop_lag_monitor()
     await init_db()
+    await warm_pool()
     logger.info("Database initialized")
+    if settings.pending_index_enabled:
+        await pending_thread_index.start()
+    await init_http_client()
+    check_preprocessing()
+    await job_queue.start()
+    # Pick up videos that were mid-analysis when a process (this or another
+    # replica) stopped, now and whenever a lease lapses
+    start_job_recovery(slack_app.client)
     yield
     # Shutdown
     logger.info("Shutting down")
+    await stop_job_recovery()
+    await job_queue.stop(timeout=settings.job_queue_shutdown_timeout)
+    await pending_thread_index.stop()
+    await close_http_client()
+    shutdown_preprocessing()
+    shutdown_tracing()
+    await stop_loop_lag_monitor()
 
 
 api = FastAPI(
@@ -32,6 +64,8 @@ api = FastAPI(
     version="0.1.0",
     lifespan=lifespan,
 )
+api.include_router(submissions_router)
+api.include_router(analytics_router)
 
 
 @api.get("/health")
@@ -40,8 +74,24 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@api.get("/metrics")
+async def metrics():
+    """Prometheus metrics endpoint."""
+    return Response(
+        content=registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 @api.post("/slack/events")
 async def slack_events(request: Request):
     """Handle Slack events."""
-    logger.info(f"Received Slack request from {request.client}")
+    retry_num = request.headers.get("x-slack-retry-num")
+    if retry_num:
+        logger.info(
+            f"Received Slack retry #{retry_num} "
+            f"({request.headers.get('x-slack-retry-reason')}) from {request.client}"
+        )
+    else:
+        logger.info(f"Received Slack request from {request.client}")
     return await slack_handler.handle(request)
@@ -1,6 +1,30 @@
 """Data models."""
 
+from app.models.analysis_cache_entry import AnalysisCacheEntry
+from app.models.analysis_job import AnalysisJob, JobSource, JobStage
+from app.models.engagement_comments import (
+    EngagementComment,
+    EngagementCommentSet,
+    PlatformComments,
+)
 from app.models.pending_approval import PendingApproval
-from app.models.video_review import VideoReview
+from app.models.processed_event import ProcessedEvent
+from app.models.review_history import CreatorScoreCount, CreatorStats, VideoReviewRecord
+from app.models.video_review import VideoReview, VideoScreening
 
-__all__ = ["PendingApproval", "VideoReview"]
+__all__ = [
+    "AnalysisCacheEntry",
+    "AnalysisJob",
+    "CreatorScoreCount",
+    "CreatorStats",
+    "EngagementComment",
+    "EngagementCommentSet",
+    "JobSource",
+    "JobStage",
+    "PendingApproval",
+    "PlatformComments",
+    "ProcessedEvent",
+    "VideoReview",
+    "VideoReviewRecord",
+    "VideoScreening",
+]
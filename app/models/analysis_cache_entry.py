@@ -0,0 +1,21 @@
+"""AnalysisCacheEntry model for content-addressed video review results."""
+
+from datetime import datetime, timezone
+
+from sqlmodel import Field, SQLModel
+
+
+class AnalysisCacheEntry(SQLModel, table=True):
+    """Validated VideoReview JSON keyed by video content hash and prompt inputs."""
+
+    __tablename__ = "analysis_cache"
+
+    cache_key: str = Field(primary_key=True)
+    video_sha256: str = Field(index=True)
+    model: str
+    prompt_version: str
+    review_json: str
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+        index=True,
+    )
@@ -0,0 +1,76 @@
+"""AnalysisJob model tracking each video through the review pipeline."""
+
+from datetime import datetime, timezone
+from enum import Enum
+
+from sqlalchemy import JSON, Column
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+
+class JobStage(str, Enum):
+    """Last completed pipeline stage of an analysis job."""
+
+    QUEUED = "queued"  # Recorded, nothing done yet
+    DOWNLOADED = "downloaded"  # Video is on local disk (local_path)
+    UPLOADED = "uploaded"  # Video is in Gemini (gemini_file_name)
+    REVIEWED = "reviewed"  # Review is stored (review_json)
+    POSTED = "posted"  # Review was posted to the Slack thread
+    FAILED = "failed"  # Gave up; the creator was told
+
+
+class JobSource(str, Enum):
+    """Where a video was submitted."""
+
+    SLACK = "slack"  # Posted to the review channel
+    API = "api"  # Submitted to the HTTP submission API
+
+
+class AnalysisJob(SQLModel, table=True):
+    """One video being reviewed: a Slack attachment or an API submission."""
+
+    __tablename__ = "analysis_jobs"
+
+    # "{channel}:{message_ts}:{file_id}", so re-deliveries map to the same job.
+    # API jobs use a random id, with channel "api" and message_ts set to the id.
+    id: str = Field(primary_key=True)
+    source: str = Field(default=JobSource.SLACK.value, index=True)
+    channel: str
+    message_ts: str = Field(index=True)
+    user_id: str  # For API jobs, the fingerprint of the submitting API key
+    file_id: str
+    file_name: str
+    # For API jobs, the submitted URL ("" for direct uploads)
+    url_private_download: str
+    caption: str | None = None
+
+    stage: str = Field(default=JobStage.QUEUED.value, index=True)
+    local_path: str | None = None
+    video_sha256: str | None = None
+    gemini_file_name: str | None = None
+    duration_seconds: float | None = None
+    review_kind: str | None = None  # "review" or "screening"
+    review_json: dict | None = Field(
+        default=None,
+        sa_column=Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True),
+    )
+    error: str | None = None
+    # Set once the message-level ranking/approval step has run
+    finalized: bool = Field(default=False, index=True)
+
+    # Replica currently working on the job, and when its claim lapses
+    lease_owner: str | None = None
+    lease_expires_at: datetime | None = Field(default=None, index=True)
+
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+        index=True,
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
+    )
+
+    @property
+    def is_terminal(self) -> bool:
+        """Whether the job has nothing left to do."""
+        return self.stage in (JobStage.POSTED.value, JobStage.FAILED.value)
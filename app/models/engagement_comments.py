@@ -0,0 +1,68 @@
+"""Pydantic models for structured engagement comment responses."""
+
+from pydantic import BaseModel, Field
+
+
+class EngagementComment(BaseModel):
+    """A single suggested comment with reply options."""
+
+    persona: str = Field(
+        description="Persona slot, e.g. 'The Overwhelmed Student' or 'The Curious Skeptic'"
+    )
+    tone_tags: list[str] = Field(
+        min_length=1, max_length=3,
+        description="1-3 short tone tags, e.g. relatable, funny, curious"
+    )
+    comment: str = Field(
+        description="The comment text, following the platform's length rules"
+    )
+    reply_options: list[str] = Field(
+        min_length=1, max_length=2,
+        description="2 short replies the creator can use when people respond"
+    )
+
+
+class PlatformComments(BaseModel):
+    """Suggested comments for one platform."""
+
+    platform: str = Field(
+        description="Platform these comments are for: instagram or tiktok"
+    )
+    comments: list[EngagementComment] = Field(
+        min_length=1, max_length=5,
+        description="5 comments, one per persona slot"
+    )
+    best_posting_times: str = Field(
+        description="Brief note on optimal posting timing for student content"
+    )
+
+    def to_slack_message(self, post_url: str) -> str:
+        """Format the comments for one platform as a Slack message section."""
+        sections = [f"*{self.platform.upper()} Comments*\n{post_url}"]
+
+        for i, c in enumerate(self.comments, start=1):
+            replies = "\n".join(f"• {r}" for r in c.reply_options)
+            sections.append(
+                f"*Comment {i} - {c.persona}* _({', '.join(c.tone_tags)})_\n"
+                f"> {c.comment}\n"
+                f"*Reply Options:*\n{replies}"
+            )
+
+        sections.append(f"*Best Posting Times:* {self.best_posting_times}")
+        return "\n\n".join(sections)
+
+
+class EngagementCommentSet(BaseModel):
+    """Structured response with comments for every requested platform."""
+
+    platforms: list[PlatformComments] = Field(
+        min_length=1,
+        description="Comments grouped by platform, one entry per requested platform"
+    )
+
+    def for_platform(self, platform: str) -> PlatformComments | None:
+        """Get the comments for a platform, if the model returned any."""
+        for entry in self.platforms:
+            if entry.platform.strip().lower() == platform.lower():
+                return entry
+        return None
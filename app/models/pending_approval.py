@@ -2,6 +2,8 @@
 
 from datetime import datetime, timezone
 
+from sqlalchemy import JSON, Column
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
 
@@ -14,7 +16,16 @@ class PendingApproval(SQLModel, table=True):
     user_id: str
     channel: str
     score: int | None = None
-    review_text: str
+    # Validated VideoReview (JSONB on Postgres so sub-scores can be queried);
+    # None for approvals saved before reviews were stored as JSON
+    review_json: dict | None = Field(
+        default=None,
+        sa_column=Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True),
+    )
+    review_summary: str  # Compact review summary used for comment generation
     virality_tier: str | None = None
     caption: str | None = None
+    # Replica currently posting this approval, and when its claim lapses
+    lease_owner: str | None = None
+    lease_expires_at: datetime | None = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
@@ -0,0 +1,17 @@
+"""ProcessedEvent model for de-duplicating Slack event deliveries."""
+
+from datetime import datetime, timezone
+
+from sqlmodel import Field, SQLModel
+
+
+class ProcessedEvent(SQLModel, table=True):
+    """Marker row recording that a Slack event or file has already been handled."""
+
+    __tablename__ = "processed_events"
+
+    key: str = Field(primary_key=True)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+        index=True,
+    )
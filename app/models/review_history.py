@@ -0,0 +1,79 @@
+"""Review history and the per-creator aggregates maintained alongside it."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class VideoReviewRecord(SQLModel, table=True):
+    """One finished Slack review, kept after its thread and approval are gone."""
+
+    __tablename__ = "video_reviews"
+    # Serves lookups by creator, and their reviews newest first without a sort
+    __table_args__ = (Index("ix_video_reviews_user_id_created_at", "user_id", "created_at"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    # The AnalysisJob it came from, so a resumed job is only recorded once
+    job_id: str = Field(unique=True)
+    source: str  # JobSource value
+    user_id: str  # Slack user
+    channel: str
+    message_ts: str
+    file_name: str
+    caption: str | None = None
+    kind: str  # "review" or "screening" (which has no sub-scores)
+    approved: bool
+
+    overall_score: int = Field(index=True)
+    hook_score: int | None = None
+    pacing_score: int | None = None
+    narrative_score: int | None = None
+    feature_demo_score: int | None = None
+    technical_score: int | None = None
+    trend_score: int | None = None
+    shareability_score: int | None = None
+    caption_score: int | None = None
+    virality_tier: str
+    focus_rating: str | None = None
+
+    created_at: datetime = Field(default_factory=_utcnow, index=True)
+
+
+class CreatorStats(SQLModel, table=True):
+    """Running totals of one creator's reviews, updated as each is recorded."""
+
+    __tablename__ = "creator_stats"
+
+    user_id: str = Field(primary_key=True)
+    review_count: int = 0
+    approved_count: int = 0
+    score_sum: int = 0
+    # score_sum / review_count, stored so leaderboards can use an index
+    mean_score: float = Field(default=0.0, index=True)
+    best_score: int = Field(default=0, index=True)
+    first_reviewed_at: datetime = Field(default_factory=_utcnow)
+    last_reviewed_at: datetime = Field(default_factory=_utcnow)
+
+    @property
+    def approval_rate(self) -> float:
+        """Fraction of reviews at or above the score threshold."""
+        return self.approved_count / self.review_count if self.review_count else 0.0
+
+
+class CreatorScoreCount(SQLModel, table=True):
+    """How many of a creator's reviews had each overall score (0-100).
+
+    At most 101 rows per creator, so score percentiles for one creator or for
+    everyone are read from here rather than from video_reviews.
+    """
+
+    __tablename__ = "creator_score_counts"
+
+    user_id: str = Field(primary_key=True)
+    overall_score: int = Field(primary_key=True)
+    count: int = 0
@@ -204,3 +204,67 @@ class VideoReview(BaseModel):
         sections.append(f"*Best Performing Angles for This Content*\n{hooks}")
 
         return "\n\n".join(sections)
+
+    def to_comment_summary(self, max_chars: int = 1200) -> str:
+        """Summarize the review as compact context for comment generation."""
+        features = ", ".join(self.features_shown) if self.features_shown else "None identified"
+        lines = [
+            f"Target persona: {self.target_persona}",
+            f"Score: {self.overall_score}/100, virality tier {self.virality_tier}",
+            f"Features shown: {features} ({self.focus_rating})",
+            f"Strengths: {'; '.join(self.key_strengths)}",
+            f"Hook: {self.hook_analysis}",
+            f"Story: {self.narrative_analysis}",
+        ]
+        summary = "\n".join(lines)
+        return summary if len(summary) <= max_chars else summary[: max_chars - 3] + "..."
+
+
+class VideoScreening(BaseModel):
+    """Compact structured response from the cheap first-pass screening model."""
+
+    overall_score: int = Field(
+        ge=0, le=100,
+        description="Rough overall score out of 100, on the same scale as the full review"
+    )
+    confidence: float = Field(
+        ge=0.0, le=1.0,
+        description="Confidence in the score, from 0.0 (guess) to 1.0 (certain)"
+    )
+    virality_tier: str = Field(
+        description="Predicted virality tier: LOW, MEDIUM, HIGH, or VIRAL"
+    )
+    summary: str = Field(
+        description="One or two sentences on what the video is and how it lands"
+    )
+    top_issues: list[str] = Field(
+        min_length=1, max_length=3,
+        description="The biggest problems holding the video back (1-3 items)"
+    )
+    quick_tips: list[str] = Field(
+        min_length=1, max_length=3,
+        description="Short, actionable fixes for the next attempt (1-3 items)"
+    )
+
+    def to_comment_summary(self, max_chars: int = 1200) -> str:
+        """Summarize the screening as compact context for comment generation."""
+        summary = (
+            f"{self.summary}\n"
+            f"Score: {self.overall_score}/100, virality tier {self.virality_tier}"
+        )
+        return summary if len(summary) <= max_chars else summary[: max_chars - 3] + "..."
+
+    def to_slack_message(self) -> str:
+        """Format the screening result as a short Slack review."""
+        issues = "\n".join(f"• {i}" for i in self.top_issues)
+        tips = "\n".join(f"• {t}" for t in self.quick_tips)
+        return "\n\n".join([
+            "_Quick review: this video screened well below the approval bar, "
+            "so it got a short review instead of the full breakdown._",
+            f"*SUMMARY*\n{self.summary}",
+            f"*Biggest Issues*\n{issues}",
+            f"*Quick Tips*\n{tips}",
+            "─" * 30,
+            f"*OVERALL SCORE: {self.overall_score}/100*\n\n"
+            f"*Predicted Virality Tier: {self.virality_tier}*",
+        ])
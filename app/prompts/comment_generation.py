@@ -1,35 +1,29 @@
 """Engagement comment generation prompt templates for Clarity app."""
 
+from functools import lru_cache
 
-def get_comment_generation_prompt(
-    video_summary: str,
-    platform: str,
-    post_url: str,
-    caption: str | None = None,
-) -> str:
-    """
-    Generate a prompt for creating engagement comments.
+# Bump whenever the guidelines below change so cached contexts are not reused
+COMMENT_PROMPT_VERSION = "2"
 
-    Args:
-        video_summary: Summary of the video content
-        platform: Target platform (instagram or tiktok)
-        post_url: URL to the post
-        caption: Optional caption from the post
+PLATFORMS = ("instagram", "tiktok")
 
-    Returns:
-        The formatted prompt for Gemini
+
+@lru_cache(maxsize=1)
+def get_comment_guidelines() -> str:
     """
-    platform_guidelines = _get_platform_guidelines(platform)
+    Get the static part of the comment generation prompt.
 
-    caption_section = ""
-    if caption:
-        caption_section = f"""
-## Post Caption
-```
-{caption}
-```
+    Covers the brand, personas, every platform's guidelines and the comment
+    rules. It is identical for every request, so it can be registered once as
+    a Gemini cached context.
 
-"""
+    Returns:
+        The static prompt prefix
+    """
+    platform_sections = "\n".join(
+        f"### {platform.upper()}\n{_get_platform_guidelines(platform)}"
+        for platform in PLATFORMS
+    )
 
     return f"""You are a social media engagement specialist for **Clarity**, an AI-powered study app. Generate authentic comments that feel like they're from real students/professionals who discovered the app.
 
@@ -63,18 +57,8 @@ AI-powered study companion that helps with:
    - Speaks like: "my ADHD brain could never with traditional studying", "I zone out 5 min into any lecture"
    - Pain: Can't focus, traditional methods don't work
 
-## Video Summary
-{video_summary}
-{caption_section}
-## Post URL
-{post_url}
-
-## Platform
-{platform.upper()}
-
 ## Platform-Specific Guidelines
-{platform_guidelines}
-
+{platform_sections}
 ## Comment Rules
 
 **LENGTH IS CRITICAL:**
@@ -94,41 +78,61 @@ AI-powered study companion that helps with:
 - Over-explain
 
 ## Task
-Generate 5 short comments. For EACH comment, also provide 2 quick reply options the creator can use when people respond.
-
-### Comment 1 - The Overwhelmed Student
-**Comment:** [1-2 sentences max - an undergrad who relates to the struggle]
-**Reply Options:**
-- [Short reply if someone agrees/relates]
-- [Short reply if someone asks a question]
-
-### Comment 2 - The Curious Skeptic
-**Comment:** [1 sentence - genuine question about how it works]
-**Reply Options:**
-- [Reply explaining briefly]
-- [Reply redirecting to try it]
-
-### Comment 3 - The Testimony
-**Comment:** [1-2 sentences - brief personal win, be specific]
-**Reply Options:**
-- [Reply if someone asks for more details]
-- [Reply if someone is skeptical]
-
-### Comment 4 - The "Where Was This" Reactor
-**Comment:** [1 sentence - regret they didn't have this sooner]
-**Reply Options:**
-- [Reply agreeing/relating]
-- [Reply encouraging them]
-
-### Comment 5 - The Niche Persona
-**Comment:** [1-2 sentences - from grad student, working professional, pre-med, or ADHD learner perspective]
-**Reply Options:**
-- [Reply if someone from same niche responds]
-- [Reply if someone asks about their situation]
-
----
-
-**Best Posting Times:** [Brief note on optimal timing for student content]
+For EACH platform listed below, generate 5 short comments that follow that platform's guidelines. For every comment give the persona slot, 1-3 short tone tags (e.g. "relatable", "funny", "curious"), the comment itself, and 2 quick reply options the creator can use when people respond.
+
+1. **The Overwhelmed Student** - 1-2 sentences max, an undergrad who relates to the struggle
+   - Replies: one if someone agrees/relates, one if someone asks a question
+2. **The Curious Skeptic** - 1 sentence, genuine question about how it works
+   - Replies: one explaining briefly, one redirecting to try it
+3. **The Testimony** - 1-2 sentences, brief personal win, be specific
+   - Replies: one if someone asks for more details, one if someone is skeptical
+4. **The "Where Was This" Reactor** - 1 sentence, regret they didn't have this sooner
+   - Replies: one agreeing/relating, one encouraging them
+5. **The Niche Persona** - 1-2 sentences, from a grad student, working professional, pre-med, or ADHD learner perspective
+   - Replies: one if someone from the same niche responds, one if someone asks about their situation
+
+Also give each platform a brief note on the best posting times for student content.
+"""
+
+
+def get_comment_request(
+    video_summary: str,
+    posts: dict[str, str],
+    caption: str | None = None,
+) -> str:
+    """
+    Get the per-post part of the comment generation prompt.
+
+    Args:
+        video_summary: Summary of the video content
+        posts: Post URL for each target platform (instagram and/or tiktok)
+        caption: Optional caption from the post
+
+    Returns:
+        The per-request prompt section that follows the guidelines
+    """
+    caption_section = ""
+    if caption:
+        caption_section = f"""
+## Post Caption
+```
+{caption}
+```
+
+"""
+
+    platform_lines = "\n".join(
+        f"- {platform.upper()}: {post_url}" for platform, post_url in posts.items()
+    )
+
+    return f"""
+## Video Summary
+{video_summary}
+{caption_section}
+## Platforms and Post URLs
+{platform_lines}
+
+Generate comments for exactly these platforms, following each platform's guidelines above.
 """
 
 
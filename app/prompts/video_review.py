@@ -1,5 +1,11 @@
 """UGC video review prompt template for Clarity app."""
 
+from functools import lru_cache
+
+# Bump whenever these prompts or the VideoReview schema change so cached
+# analyses are not reused
+VIDEO_REVIEW_PROMPT_VERSION = "1"
+
 VIDEO_REVIEW_PROMPT_BASE = """You are a UGC Creative Strategist reviewing videos for **Clarity** - an AI-powered study app that transforms static study materials into interactive learning experiences.
 
 ## About Clarity
@@ -244,20 +250,37 @@ Content should feel focused on solving ONE core problem. Showing 2-3 related fea
 """
 
 
-def get_video_review_prompt(caption: str | None = None) -> str:
+@lru_cache(maxsize=2)
+def get_video_review_prefix(has_caption: bool) -> str:
+    """
+    Get the caption-free part of the video review prompt.
+
+    This is identical for every video of a variant, so it can be registered
+    once as a Gemini cached context.
+
+    Args:
+        has_caption: Whether the video was posted with a caption
+
+    Returns:
+        The static prompt prefix for the variant
+    """
+    return VIDEO_REVIEW_PROMPT_BASE if has_caption else VIDEO_REVIEW_PROMPT_NO_CAPTION
+
+
+def get_caption_block(caption: str | None) -> str:
     """
-    Get the video review prompt, optionally including caption for analysis.
+    Get the per-video caption section that follows the static prefix.
 
     Args:
         caption: The planned caption for the post, or None if not provided
 
     Returns:
-        The formatted prompt for Gemini
+        The caption section, or an empty string when there is no caption
     """
     if not caption or not caption.strip():
-        return VIDEO_REVIEW_PROMPT_NO_CAPTION
+        return ""
 
-    return f"""{VIDEO_REVIEW_PROMPT_BASE}
+    return f"""
 
 ---
 
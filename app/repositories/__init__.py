@@ -1,5 +1,19 @@
 """Data access repositories."""
 
+from app.repositories.analysis_cache_repository import AnalysisCacheRepository
+from app.repositories.analysis_job_repository import AnalysisJobRepository, analysis_job_id
 from app.repositories.approval_repository import ApprovalRepository
+from app.repositories.pending_thread_index import PendingThreadIndex, pending_thread_index
+from app.repositories.processed_event_repository import ProcessedEventRepository
+from app.repositories.review_history_repository import ReviewHistoryRepository
 
-__all__ = ["ApprovalRepository"]
+__all__ = [
+    "AnalysisCacheRepository",
+    "AnalysisJobRepository",
+    "ApprovalRepository",
+    "PendingThreadIndex",
+    "ProcessedEventRepository",
+    "ReviewHistoryRepository",
+    "analysis_job_id",
+    "pending_thread_index",
+]
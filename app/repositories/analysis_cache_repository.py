@@ -0,0 +1,83 @@
+"""Repository for persistent AnalysisCacheEntry rows."""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+from sqlmodel import select
+
+from app.core.database import upsert, use_session
+from app.models.analysis_cache_entry import AnalysisCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class AnalysisCacheRepository:
+    """Data access layer for cached analysis results."""
+
+    @staticmethod
+    async def get(cache_key: str, ttl_seconds: int) -> AnalysisCacheEntry | None:
+        """Get a cache entry if it exists and is younger than the TTL."""
+        async with use_session() as session:
+            entry = await session.get(AnalysisCacheEntry, cache_key)
+            if entry and entry.created_at >= _utcnow() - timedelta(seconds=ttl_seconds):
+                return entry
+            return None
+
+    @staticmethod
+    async def put(
+        cache_key: str,
+        video_sha256: str,
+        model: str,
+        prompt_version: str,
+        review_json: str,
+    ) -> None:
+        """Insert or replace a cache entry."""
+        values = {
+            "cache_key": cache_key,
+            "video_sha256": video_sha256,
+            "model": model,
+            "prompt_version": prompt_version,
+            "review_json": review_json,
+            "created_at": _utcnow(),
+        }
+        insert = upsert(AnalysisCacheEntry).values(**values)
+        statement = insert.on_conflict_do_update(
+            index_elements=[AnalysisCacheEntry.cache_key],
+            set_={key: insert.excluded[key] for key in values if key != "cache_key"},
+        )
+        async with use_session() as session:
+            await session.exec(statement)
+            await session.commit()
+
+    @staticmethod
+    async def evict(ttl_seconds: int, max_entries: int) -> int:
+        """
+        Delete expired entries and everything beyond the newest `max_entries`.
+
+        Returns:
+            Number of entries removed
+        """
+        cutoff = _utcnow() - timedelta(seconds=ttl_seconds)
+        async with use_session() as session:
+            expired = await session.exec(
+                delete(AnalysisCacheEntry).where(AnalysisCacheEntry.created_at < cutoff)
+            )
+            newest = (
+                select(AnalysisCacheEntry.cache_key)
+                .order_by(AnalysisCacheEntry.created_at.desc())
+                .limit(max_entries)
+            )
+            overflow = await session.exec(
+                delete(AnalysisCacheEntry).where(AnalysisCacheEntry.cache_key.not_in(newest))
+            )
+            await session.commit()
+
+            removed = expired.rowcount + overflow.rowcount
+            if removed:
+                logger.info(f"Evicted {removed} analysis cache entries")
+            return removed
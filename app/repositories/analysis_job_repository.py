@@ -0,0 +1,194 @@
+"""Repository for durable AnalysisJob rows."""
+
+import logging
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, or_, update
+from sqlmodel import select
+
+from app.core.database import upsert, use_session
+from app.core.leases import lease_expiry
+from app.models.analysis_job import AnalysisJob, JobStage
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def analysis_job_id(channel: str, message_ts: str, file_id: str) -> str:
+    """Deterministic job id for a video attachment."""
+    return f"{channel}:{message_ts}:{file_id}"
+
+
+class AnalysisJobRepository:
+    """Data access layer for analysis jobs."""
+
+    @staticmethod
+    async def create_many(jobs: Iterable[AnalysisJob]) -> list[AnalysisJob]:
+        """
+        Insert jobs, skipping any that already exist.
+
+        Returns:
+            Only the jobs that were newly created, in the order given
+        """
+        rows = [job.model_dump() for job in jobs]
+        if not rows:
+            return []
+        order = {row["id"]: i for i, row in enumerate(rows)}
+
+        statement = (
+            upsert(AnalysisJob)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[AnalysisJob.id])
+            .returning(AnalysisJob)
+        )
+        async with use_session() as session:
+            result = await session.exec(statement)
+            created = list(result.scalars().all())
+            await session.commit()
+            return sorted(created, key=lambda job: order[job.id])
+
+    @staticmethod
+    async def advance(job_id: str, stage: JobStage, **fields: Any) -> AnalysisJob:
+        """Record that a job completed a stage, along with what it produced."""
+        statement = (
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job_id)
+            .values(stage=stage.value, updated_at=_utcnow(), **fields)
+            .returning(AnalysisJob)
+        )
+        async with use_session() as session:
+            result = await session.exec(
+                statement, execution_options={"populate_existing": True}
+            )
+            job = result.scalars().one()
+            await session.commit()
+            logger.info(f"Job {job_id} -> {stage.value}")
+            return job
+
+    @staticmethod
+    async def get(job_id: str) -> AnalysisJob | None:
+        """Get a job by id."""
+        async with use_session() as session:
+            return await session.get(AnalysisJob, job_id, populate_existing=True)
+
+    @staticmethod
+    async def get_for_message(channel: str, message_ts: str) -> list[AnalysisJob]:
+        """Get every job for one Slack message, in attachment order."""
+        async with use_session() as session:
+            result = await session.exec(
+                select(AnalysisJob)
+                .where(AnalysisJob.channel == channel, AnalysisJob.message_ts == message_ts)
+                .order_by(AnalysisJob.created_at, AnalysisJob.id)
+            )
+            return list(result.all())
+
+    @staticmethod
+    async def claim_next_message(owner: str) -> list[AnalysisJob]:
+        """
+        Claim the unfinished jobs of the oldest message whose lease has lapsed.
+
+        On Postgres the candidate row is picked with FOR UPDATE SKIP LOCKED so
+        concurrent claimers pass over each other; the claiming UPDATE repeats
+        the lease check, which is what makes it safe on SQLite.
+
+        Args:
+            owner: Replica id taking the lease
+
+        Returns:
+            The claimed jobs of one message, or an empty list if none are claimable
+        """
+        now = _utcnow()
+        lapsed = or_(AnalysisJob.lease_expires_at.is_(None), AnalysisJob.lease_expires_at < now)
+
+        async with use_session() as session:
+            candidate = (
+                await session.exec(
+                    select(AnalysisJob.channel, AnalysisJob.message_ts)
+                    .where(AnalysisJob.finalized == False, lapsed)  # noqa: E712
+                    .order_by(AnalysisJob.created_at)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+            ).first()
+            if candidate is None:
+                await session.commit()
+                return []
+
+            channel, message_ts = candidate
+            result = await session.exec(
+                update(AnalysisJob)
+                .where(
+                    AnalysisJob.channel == channel,
+                    AnalysisJob.message_ts == message_ts,
+                    AnalysisJob.finalized == False,  # noqa: E712
+                    lapsed,
+                )
+                .values(lease_owner=owner, lease_expires_at=lease_expiry())
+                .returning(AnalysisJob),
+                execution_options={"populate_existing": True},
+            )
+            claimed = list(result.scalars().all())
+            await session.commit()
+
+        if claimed:
+            logger.info(f"Claimed {len(claimed)} job(s) of message {message_ts}")
+        return claimed
+
+    @staticmethod
+    async def renew_lease(channel: str, message_ts: str, owner: str) -> bool:
+        """
+        Extend the lease on a message's jobs.
+
+        Returns:
+            False if the lease was lost to another replica
+        """
+        async with use_session() as session:
+            result = await session.exec(
+                update(AnalysisJob)
+                .where(
+                    AnalysisJob.channel == channel,
+                    AnalysisJob.message_ts == message_ts,
+                    AnalysisJob.finalized == False,  # noqa: E712
+                    AnalysisJob.lease_owner == owner,
+                )
+                .values(lease_expires_at=lease_expiry())
+            )
+            await session.commit()
+            return result.rowcount > 0
+
+    @staticmethod
+    async def mark_finalized(channel: str, message_ts: str) -> None:
+        """Mark all jobs of a message as fully handled and release their lease."""
+        async with use_session() as session:
+            await session.exec(
+                update(AnalysisJob)
+                .where(AnalysisJob.channel == channel, AnalysisJob.message_ts == message_ts)
+                .values(
+                    finalized=True,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    updated_at=_utcnow(),
+                )
+            )
+            await session.commit()
+
+    @staticmethod
+    async def purge_finalized(retention_seconds: int) -> int:
+        """Delete finalized jobs older than the retention period. Returns the number removed."""
+        cutoff = _utcnow() - timedelta(seconds=retention_seconds)
+        async with use_session() as session:
+            result = await session.exec(
+                delete(AnalysisJob).where(
+                    AnalysisJob.finalized == True,  # noqa: E712
+                    AnalysisJob.updated_at < cutoff,
+                )
+            )
+            await session.commit()
+            if result.rowcount:
+                logger.info(f"Purged {result.rowcount} finished analysis jobs")
+            return result.rowcount
@@ -1,80 +1,168 @@
 """Repository for PendingApproval CRUD operations."""
 
 import logging
+from datetime import datetime, timezone
 
+from sqlalchemy import delete, func, or_, update
 from sqlmodel import select
 
-from app.core.database import get_session
+from app.config import settings
+from app.core.database import is_postgresql, upsert, use_session
+from app.core.leases import lease_expiry
+from app.core.tracing import traced
 from app.models.pending_approval import PendingApproval
+from app.models.video_review import VideoReview, VideoScreening
+from app.repositories.pending_thread_index import NOTIFY_CHANNEL, pending_thread_index
 
 logger = logging.getLogger(__name__)
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def _notify(session, action: str, thread_ts: str) -> None:
+    """Tell other replicas' pending thread indexes (delivered on commit)."""
+    if settings.pending_index_enabled and is_postgresql():
+        await session.exec(select(func.pg_notify(NOTIFY_CHANNEL, f"{action}:{thread_ts}")))
+
+
 class ApprovalRepository:
     """Data access layer for pending approvals."""
 
     @staticmethod
+    @traced("approvals.save", attributes=("thread_ts",))
     async def save(
         thread_ts: str,
         user_id: str,
         channel: str,
-        score: int | None,
-        review_text: str,
-        virality_tier: str | None,
+        review: VideoReview | VideoScreening,
         caption: str | None,
     ) -> PendingApproval:
-        """Save or update a pending approval."""
-        async with await get_session() as session:
-            existing = await session.get(PendingApproval, thread_ts)
-
-            if existing:
-                existing.user_id = user_id
-                existing.channel = channel
-                existing.score = score
-                existing.review_text = review_text
-                existing.virality_tier = virality_tier
-                existing.caption = caption
-                session.add(existing)
-                approval = existing
-            else:
-                approval = PendingApproval(
-                    thread_ts=thread_ts,
-                    user_id=user_id,
-                    channel=channel,
-                    score=score,
-                    review_text=review_text,
-                    virality_tier=virality_tier,
-                    caption=caption,
-                )
-                session.add(approval)
+        """Save or update a pending approval for a structured review (one statement)."""
+        values = {
+            "thread_ts": thread_ts,
+            "user_id": user_id,
+            "channel": channel,
+            "score": review.overall_score,
+            "review_json": review.model_dump(mode="json"),
+            "review_summary": review.to_comment_summary(),
+            "virality_tier": review.virality_tier,
+            "caption": caption,
+            "created_at": _utcnow(),
+        }
+        insert = upsert(PendingApproval).values(**values)
+        statement = insert.on_conflict_do_update(
+            index_elements=[PendingApproval.thread_ts],
+            # Re-saving keeps the original created_at
+            set_={
+                key: insert.excluded[key]
+                for key in values
+                if key not in ("thread_ts", "created_at")
+            },
+        ).returning(PendingApproval)
 
+        async with use_session() as session:
+            result = await session.exec(
+                statement, execution_options={"populate_existing": True}
+            )
+            approval = result.scalars().one()
+            await _notify(session, "add", thread_ts)
             await session.commit()
-            await session.refresh(approval)
+            pending_thread_index.add(thread_ts)
             logger.info(f"Saved pending approval for thread {thread_ts}")
             return approval
 
     @staticmethod
+    @traced("approvals.get_by_thread", attributes=("thread_ts",))
     async def get_by_thread(thread_ts: str) -> PendingApproval | None:
         """Get a pending approval by thread timestamp."""
-        async with await get_session() as session:
+        async with use_session() as session:
             return await session.get(PendingApproval, thread_ts)
 
     @staticmethod
+    @traced("approvals.claim", attributes=("thread_ts",))
+    async def claim(thread_ts: str, owner: str) -> PendingApproval | None:
+        """
+        Take the lease on a pending approval so only one replica posts it.
+
+        Returns:
+            The approval if this caller now holds the lease, else None
+        """
+        now = _utcnow()
+        lapsed = or_(
+            PendingApproval.lease_expires_at.is_(None), PendingApproval.lease_expires_at < now
+        )
+        # SKIP LOCKED: a concurrent claimer gets nothing instead of waiting
+        claimable = (
+            select(PendingApproval.thread_ts)
+            .where(PendingApproval.thread_ts == thread_ts, lapsed)
+            .with_for_update(skip_locked=True)
+        )
+        statement = (
+            update(PendingApproval)
+            .where(PendingApproval.thread_ts.in_(claimable), lapsed)
+            .values(lease_owner=owner, lease_expires_at=lease_expiry())
+            .returning(PendingApproval)
+        )
+
+        async with use_session() as session:
+            result = await session.exec(
+                statement, execution_options={"populate_existing": True}
+            )
+            approval = result.scalars().first()
+            await session.commit()
+            return approval
+
+    @staticmethod
+    @traced("approvals.renew_lease", attributes=("thread_ts",))
+    async def renew_lease(thread_ts: str, owner: str) -> bool:
+        """Extend a held lease. Returns False if it was lost."""
+        async with use_session() as session:
+            result = await session.exec(
+                update(PendingApproval)
+                .where(PendingApproval.thread_ts == thread_ts, PendingApproval.lease_owner == owner)
+                .values(lease_expires_at=lease_expiry())
+            )
+            await session.commit()
+            return result.rowcount > 0
+
+    @staticmethod
+    @traced("approvals.release", attributes=("thread_ts",))
+    async def release(thread_ts: str, owner: str) -> None:
+        """Give up a held lease so the approval can be retried."""
+        async with use_session() as session:
+            await session.exec(
+                update(PendingApproval)
+                .where(PendingApproval.thread_ts == thread_ts, PendingApproval.lease_owner == owner)
+                .values(lease_owner=None, lease_expires_at=None)
+            )
+            await session.commit()
+
+    @staticmethod
+    @traced("approvals.delete", attributes=("thread_ts",))
     async def delete(thread_ts: str) -> bool:
         """Delete a pending approval. Returns True if deleted."""
-        async with await get_session() as session:
-            approval = await session.get(PendingApproval, thread_ts)
+        async with use_session() as session:
+            result = await session.exec(
+                delete(PendingApproval)
+                .where(PendingApproval.thread_ts == thread_ts)
+                .returning(PendingApproval.thread_ts)
+            )
+            deleted = result.first() is not None
+            if deleted:
+                await _notify(session, "remove", thread_ts)
+            await session.commit()
+            pending_thread_index.discard(thread_ts)
 
-            if approval:
-                await session.delete(approval)
-                await session.commit()
+            if deleted:
                 logger.info(f"Deleted pending approval for thread {thread_ts}")
-                return True
-            return False
+            return deleted
 
     @staticmethod
+    @traced("approvals.get_all")
     async def get_all() -> list[PendingApproval]:
         """Get all pending approvals."""
-        async with await get_session() as session:
+        async with use_session() as session:
             result = await session.exec(select(PendingApproval))
             return list(result.all())
@@ -0,0 +1,156 @@
+"""In-process index of threads that have a pending approval.
+
+Most thread replies in the review channel are ordinary chatter. Checking them
+against this index first means only replies in threads that are actually
+awaiting links ever reach the database. The index is loaded from
+pending_approvals at startup and kept current by ApprovalRepository on save
+and delete. Other replicas are told about changes through Postgres
+LISTEN/NOTIFY, and a periodic full reload covers missed notifications and
+SQLite deployments.
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel import select
+
+from app.config import settings
+from app.core import database
+from app.models.pending_approval import PendingApproval
+
+logger = logging.getLogger(__name__)
+
+# Postgres NOTIFY channel; payloads are "add:<thread_ts>" or "remove:<thread_ts>"
+NOTIFY_CHANNEL = "pending_approvals"
+
+
+class PendingThreadIndex:
+    """Set of pending thread_ts values, shared by every handler in the process."""
+
+    def __init__(self, refresh_seconds: int) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._threads: set[str] = set()
+        self._loaded = False
+        # Changes made while a reload is reading the table, replayed on top of it
+        self._changes: list[tuple[bool, str]] | None = None
+        self._task: asyncio.Task | None = None
+        self._listener: AsyncConnection | None = None
+        self._driver_connection = None
+
+    def __len__(self) -> int:
+        return len(self._threads)
+
+    def might_be_pending(self, thread_ts: str) -> bool:
+        """
+        Check whether a thread may have a pending approval.
+
+        Returns True until the index has been loaded, so callers fall back to
+        the database rather than dropping replies.
+        """
+        return not self._loaded or thread_ts in self._threads
+
+    def add(self, thread_ts: str) -> None:
+        """Record a newly saved pending approval."""
+        self._threads.add(thread_ts)
+        if self._changes is not None:
+            self._changes.append((True, thread_ts))
+
+    def discard(self, thread_ts: str) -> None:
+        """Forget a pending approval that was deleted."""
+        self._threads.discard(thread_ts)
+        if self._changes is not None:
+            self._changes.append((False, thread_ts))
+
+    async def load(self) -> None:
+        """Replace the index with the current contents of pending_approvals."""
+        self._changes = []
+        try:
+            async with await database.get_session() as session:
+                result = await session.exec(select(PendingApproval.thread_ts))
+                threads = set(result.all())
+            for added, thread_ts in self._changes:
+                if added:
+                    threads.add(thread_ts)
+                else:
+                    threads.discard(thread_ts)
+        finally:
+            self._changes = None
+
+        self._threads = threads
+        self._loaded = True
+        logger.info(f"Loaded {len(threads)} pending threads into the index")
+
+    async def start(self) -> None:
+        """Load the index and start listening for changes from other replicas."""
+        try:
+            await self.load()
+        except Exception as e:
+            # Stay unloaded: every reply falls through to the database
+            logger.exception(f"Failed to load pending thread index: {e}")
+
+        await self._listen()
+        self._task = asyncio.create_task(self._refresh_loop(), name="pending-thread-index")
+
+    async def stop(self) -> None:
+        """Stop the refresh loop and the NOTIFY listener."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._unlisten()
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await self.load()
+                if self._listener_closed():
+                    await self._unlisten()
+                    await self._listen()
+            except Exception as e:
+                logger.warning(f"Pending thread index refresh failed: {e}")
+
+    async def _listen(self) -> None:
+        """Subscribe to change notifications (Postgres only)."""
+        if not database.is_postgresql():
+            return
+        try:
+            self._listener = await database.engine.connect()
+            raw = await self._listener.get_raw_connection()
+            self._driver_connection = raw.driver_connection
+            await self._driver_connection.add_listener(NOTIFY_CHANNEL, self._on_notify)
+            logger.info(f"Listening for pending approval changes on '{NOTIFY_CHANNEL}'")
+        except Exception as e:
+            logger.warning(f"Could not listen for pending approval changes: {e}")
+            await self._unlisten()
+
+    async def _unlisten(self) -> None:
+        self._driver_connection = None
+        if self._listener is not None:
+            try:
+                await self._listener.close()
+            except Exception as e:
+                logger.warning(f"Error closing pending approval listener: {e}")
+            self._listener = None
+
+    def _listener_closed(self) -> bool:
+        if not database.is_postgresql():
+            return False
+        return self._driver_connection is None or self._driver_connection.is_closed()
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        action, _, thread_ts = payload.partition(":")
+        if action == "add":
+            self.add(thread_ts)
+        elif action == "remove":
+            self.discard(thread_ts)
+
+
+# Global index shared by every handler in the process
+pending_thread_index = PendingThreadIndex(
+    refresh_seconds=settings.pending_index_refresh_seconds,
+)
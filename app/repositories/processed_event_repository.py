@@ -0,0 +1,70 @@
+"""Repository for ProcessedEvent de-duplication markers."""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+
+from app.core.database import upsert, use_session
+from app.models.processed_event import ProcessedEvent
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class ProcessedEventRepository:
+    """Data access layer for processed event markers."""
+
+    @staticmethod
+    async def claim(key: str, ttl_seconds: int) -> bool:
+        """
+        Atomically record a key as processed.
+
+        Args:
+            key: De-duplication key
+            ttl_seconds: Age after which an existing marker no longer counts
+
+        Returns:
+            True if this caller claimed the key, False if it was already claimed
+        """
+        now = _utcnow()
+        cutoff = now - timedelta(seconds=ttl_seconds)
+        # Insert the marker, or take over an existing one only if it has expired
+        statement = (
+            upsert(ProcessedEvent)
+            .values(key=key, created_at=now)
+            .on_conflict_do_update(
+                index_elements=[ProcessedEvent.key],
+                set_={"created_at": now},
+                where=ProcessedEvent.created_at < cutoff,
+            )
+            .returning(ProcessedEvent.key)
+        )
+        async with use_session() as session:
+            result = await session.exec(statement)
+            claimed = result.first() is not None
+            await session.commit()
+            return claimed
+
+    @staticmethod
+    async def release(keys: list[str]) -> None:
+        """Delete markers so their keys can be claimed again."""
+        async with use_session() as session:
+            await session.exec(delete(ProcessedEvent).where(ProcessedEvent.key.in_(keys)))
+            await session.commit()
+
+    @staticmethod
+    async def purge_expired(ttl_seconds: int) -> int:
+        """Delete markers older than the TTL. Returns the number removed."""
+        cutoff = _utcnow() - timedelta(seconds=ttl_seconds)
+        async with use_session() as session:
+            result = await session.exec(
+                delete(ProcessedEvent).where(ProcessedEvent.created_at < cutoff)
+            )
+            await session.commit()
+            if result.rowcount:
+                logger.info(f"Purged {result.rowcount} expired processed events")
+            return result.rowcount
@@ -0,0 +1,219 @@
+"""Repository for review history and per-creator aggregates."""
+
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import Float, case, cast, func
+from sqlmodel import select
+
+from app.config import settings
+from app.core.database import upsert, use_session
+from app.core.tracing import traced
+from app.models.analysis_job import AnalysisJob
+from app.models.review_history import CreatorScoreCount, CreatorStats, VideoReviewRecord
+from app.models.video_review import VideoReview, VideoScreening
+
+logger = logging.getLogger(__name__)
+
+# Sub-scores copied from a full review onto its history row
+_SUB_SCORES = (
+    "hook_score",
+    "pacing_score",
+    "narrative_score",
+    "feature_demo_score",
+    "technical_score",
+    "trend_score",
+    "shareability_score",
+    "caption_score",
+)
+
+# Leaderboard orderings, best first
+LEADERBOARD_ORDER = {
+    "mean_score": CreatorStats.mean_score,
+    "best_score": CreatorStats.best_score,
+    "approval_rate": cast(CreatorStats.approved_count, Float) / CreatorStats.review_count,
+    "review_count": CreatorStats.review_count,
+}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class ReviewHistoryRepository:
+    """Data access layer for review history and creator stats."""
+
+    @staticmethod
+    @traced("review_history.record")
+    async def record(job: AnalysisJob, review: VideoReview | VideoScreening) -> bool:
+        """
+        Store a finished review and fold it into the creator's aggregates.
+
+        The history row and the aggregate updates commit together, and a job
+        that was already recorded (e.g. a resumed message) changes nothing.
+
+        Args:
+            job: The job that produced the review
+            review: The review
+
+        Returns:
+            Whether the review was newly recorded
+        """
+        user_id = job.user_id
+        now = _utcnow()
+        score = review.overall_score
+        approved = score >= settings.score_threshold
+        is_review = isinstance(review, VideoReview)
+
+        record = (
+            upsert(VideoReviewRecord)
+            .values(
+                job_id=job.id,
+                source=job.source,
+                user_id=user_id,
+                channel=job.channel,
+                message_ts=job.message_ts,
+                file_name=job.file_name,
+                caption=job.caption,
+                kind="review" if is_review else "screening",
+                approved=approved,
+                overall_score=score,
+                virality_tier=review.virality_tier,
+                focus_rating=review.focus_rating if is_review else None,
+                created_at=now,
+                **{name: getattr(review, name) if is_review else None for name in _SUB_SCORES},
+            )
+            .on_conflict_do_nothing(index_elements=[VideoReviewRecord.job_id])
+            .returning(VideoReviewRecord.id)
+        )
+
+        stats = upsert(CreatorStats).values(
+            user_id=user_id,
+            review_count=1,
+            approved_count=int(approved),
+            score_sum=score,
+            mean_score=float(score),
+            best_score=score,
+            first_reviewed_at=now,
+            last_reviewed_at=now,
+        )
+        # SET expressions see the existing row, so these are running totals
+        stats = stats.on_conflict_do_update(
+            index_elements=[CreatorStats.user_id],
+            set_={
+                "review_count": CreatorStats.review_count + 1,
+                "approved_count": CreatorStats.approved_count + stats.excluded.approved_count,
+                "score_sum": CreatorStats.score_sum + stats.excluded.score_sum,
+                "mean_score": cast(CreatorStats.score_sum + stats.excluded.score_sum, Float)
+                / (CreatorStats.review_count + 1),
+                "best_score": case(
+                    (stats.excluded.best_score > CreatorStats.best_score, stats.excluded.best_score),
+                    else_=CreatorStats.best_score,
+                ),
+                "last_reviewed_at": stats.excluded.last_reviewed_at,
+            },
+        )
+
+        bucket = upsert(CreatorScoreCount).values(user_id=user_id, overall_score=score, count=1)
+        bucket = bucket.on_conflict_do_update(
+            index_elements=[CreatorScoreCount.user_id, CreatorScoreCount.overall_score],
+            set_={"count": CreatorScoreCount.count + 1},
+        )
+
+        async with use_session() as session:
+            if (await session.exec(record)).first() is None:
+                await session.commit()
+                return False
+            await session.exec(stats)
+            await session.exec(bucket)
+            await session.commit()
+        return True
+
+    @staticmethod
+    async def get_creator(user_id: str) -> CreatorStats | None:
+        """Get one creator's aggregates."""
+        async with use_session() as session:
+            return await session.get(CreatorStats, user_id, populate_existing=True)
+
+    @staticmethod
+    async def recent_reviews(
+        user_id: str,
+        limit: int,
+        before: datetime | None = None,
+    ) -> list[VideoReviewRecord]:
+        """
+        Get a creator's reviews, newest first.
+
+        Args:
+            user_id: The creator
+            limit: Maximum number of reviews
+            before: Only reviews older than this (for paging)
+        """
+        statement = select(VideoReviewRecord).where(VideoReviewRecord.user_id == user_id)
+        if before is not None:
+            statement = statement.where(VideoReviewRecord.created_at < before)
+        async with use_session() as session:
+            result = await session.exec(
+                statement.order_by(VideoReviewRecord.created_at.desc()).limit(limit)
+            )
+            return list(result.all())
+
+    @staticmethod
+    async def leaderboard(by: str, limit: int, min_reviews: int = 1) -> list[CreatorStats]:
+        """
+        Get the top creators by one of LEADERBOARD_ORDER.
+
+        Args:
+            by: Ordering name
+            limit: Number of creators
+            min_reviews: Leave out creators with fewer reviews
+        """
+        async with use_session() as session:
+            result = await session.exec(
+                select(CreatorStats)
+                .where(CreatorStats.review_count >= min_reviews)
+                .order_by(LEADERBOARD_ORDER[by].desc(), CreatorStats.review_count.desc())
+                .limit(limit)
+            )
+            return list(result.all())
+
+    @staticmethod
+    async def mean_score_rank(mean_score: float, min_reviews: int = 1) -> tuple[int, int]:
+        """
+        Place a mean score among creators.
+
+        Returns:
+            Number of creators with a lower mean score, and the number of creators
+        """
+        eligible = CreatorStats.review_count >= min_reviews
+        async with use_session() as session:
+            below = (
+                await session.exec(
+                    select(func.count()).where(eligible, CreatorStats.mean_score < mean_score)
+                )
+            ).one()
+            total = (await session.exec(select(func.count()).where(eligible))).one()
+            return below, total
+
+    @staticmethod
+    async def score_counts(user_id: str | None = None) -> dict[int, int]:
+        """
+        Get how many reviews had each overall score.
+
+        Args:
+            user_id: One creator, or everyone if None
+
+        Returns:
+            Count per overall score (scores with no reviews are left out)
+        """
+        if user_id is not None:
+            statement = select(CreatorScoreCount.overall_score, CreatorScoreCount.count).where(
+                CreatorScoreCount.user_id == user_id
+            )
+        else:
+            statement = select(
+                CreatorScoreCount.overall_score, func.sum(CreatorScoreCount.count)
+            ).group_by(CreatorScoreCount.overall_score)
+        async with use_session() as session:
+            result = await session.exec(statement)
+            return {score: int(count) for score, count in result.all()}
@@ -1,15 +1,42 @@
 """Business logic services."""
 
 from app.services.video_analysis import analyze_video
+from app.services.analysis_pipeline import (
+    new_api_job,
+    new_jobs_for_message,
+    process_api_job,
+    process_message_jobs,
+    recover_analysis_jobs,
+    start_job_recovery,
+    stop_job_recovery,
+    wait_for_job,
+)
 from app.services.comment_generation import generate_engagement_comments
+from app.services.event_dedup import event_deduplicator, event_dedup_keys
 from app.services.slack_files import (
+    FileTooLargeError,
     download_file,
+    download_url,
+    save_stream,
     cleanup_file,
 )
 
 __all__ = [
     "analyze_video",
+    "new_api_job",
+    "new_jobs_for_message",
+    "process_api_job",
+    "process_message_jobs",
+    "recover_analysis_jobs",
+    "start_job_recovery",
+    "stop_job_recovery",
+    "wait_for_job",
     "generate_engagement_comments",
+    "event_deduplicator",
+    "event_dedup_keys",
+    "FileTooLargeError",
     "download_file",
+    "download_url",
+    "save_stream",
     "cleanup_file",
 ]
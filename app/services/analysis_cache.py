@@ -0,0 +1,141 @@
+"""Content-addressed cache of video analysis results.
+
+Creators often re-post the exact same file. Results are keyed on the SHA-256
+of the video bytes plus everything else that shapes the review (model, prompt
+version and caption), so a re-post is answered without contacting Gemini.
+"""
+
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+
+from app.config import settings
+from app.core.metrics import cache_lookups
+from app.models.video_review import VideoReview
+from app.repositories.analysis_cache_repository import AnalysisCacheRepository
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Run persistent eviction once every this many writes
+EVICT_EVERY_N_PUTS = 100
+
+
+def _hash_file_sync(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def hash_file(path: Path) -> str:
+    """
+    Compute the SHA-256 of a file, streaming it in chunks off the event loop.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    return await asyncio.to_thread(_hash_file_sync, path)
+
+
+def normalize_caption(caption: str | None) -> str:
+    """Collapse whitespace so trivially different captions share a cache entry."""
+    return " ".join(caption.split()) if caption else ""
+
+
+def analysis_cache_key(
+    video_sha256: str,
+    model: str,
+    prompt_version: str,
+    caption: str | None,
+) -> str:
+    """
+    Build the cache key for an analysis.
+
+    Args:
+        video_sha256: Hash of the video bytes
+        model: Gemini model name
+        prompt_version: Version of the review prompt
+        caption: Optional caption sent with the video
+
+    Returns:
+        Hex-encoded SHA-256 over all inputs
+    """
+    material = "\0".join([video_sha256, model, prompt_version, normalize_caption(caption)])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """In-memory LRU/TTL cache with an optional persistent table behind it."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int, persistent: bool = False) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persistent = persistent
+        self._memory: TTLCache[str, str] = TTLCache(max_entries, ttl_seconds)
+        self._puts = 0
+
+    async def get(self, cache_key: str) -> VideoReview | None:
+        """Return the cached review for a key, or None on a miss."""
+        review_json = self._memory.get(cache_key)
+
+        if review_json is None and self.persistent:
+            try:
+                entry = await AnalysisCacheRepository.get(cache_key, self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Analysis cache lookup failed: {e}")
+                entry = None
+            if entry:
+                review_json = entry.review_json
+                self._memory.set(cache_key, review_json)
+
+        if review_json is None:
+            cache_lookups.inc(cache="analysis", result="miss")
+            return None
+        cache_lookups.inc(cache="analysis", result="hit")
+        return VideoReview.model_validate_json(review_json)
+
+    async def put(
+        self,
+        cache_key: str,
+        review: VideoReview,
+        video_sha256: str,
+        model: str,
+        prompt_version: str,
+    ) -> None:
+        """Store a validated review under a key."""
+        review_json = review.model_dump_json()
+        self._memory.set(cache_key, review_json)
+
+        if not self.persistent:
+            return
+
+        try:
+            await AnalysisCacheRepository.put(
+                cache_key=cache_key,
+                video_sha256=video_sha256,
+                model=model,
+                prompt_version=prompt_version,
+                review_json=review_json,
+            )
+            self._puts += 1
+            if self._puts % EVICT_EVERY_N_PUTS == 0:
+                await AnalysisCacheRepository.evict(self.ttl_seconds, self.max_entries)
+        except Exception as e:
+            # A cache write failure must never fail the analysis itself
+            logger.warning(f"Analysis cache write failed: {e}")
+
+
+# Global analysis cache
+analysis_cache = AnalysisCache(
+    max_entries=settings.analysis_cache_max_entries,
+    ttl_seconds=settings.analysis_cache_ttl_seconds,
+    persistent=settings.analysis_cache_persistent,
+)
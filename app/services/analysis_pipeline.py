@@ -0,0 +1,606 @@
+"""Durable, resumable review pipeline for uploaded videos.
+
+Each video (a Slack attachment or an API submission) is an AnalysisJob row that records the last completed
+stage (downloaded, uploaded, reviewed, posted) and what that stage produced
+(local path, Gemini file name, review JSON). A job always continues from its
+recorded stage, so after a restart unfinished jobs pick up where they left
+off instead of being lost, and Gemini files are never leaked.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from app.config import settings
+from app.core.database import run_in_session_scope
+from app.core.job_queue import job_queue
+from app.core.leases import LeaseLost, ensure_lease, heartbeat, lease_expiry, replica_id
+from app.core.metrics import track_stage, video_reviews
+from app.core.rate_limiter import Priority
+from app.core.tracing import set_span_attributes, traced
+from app.models.analysis_job import AnalysisJob, JobSource, JobStage
+from app.models.video_review import VideoReview, VideoScreening
+from app.repositories.analysis_job_repository import AnalysisJobRepository, analysis_job_id
+from app.repositories.approval_repository import ApprovalRepository
+from app.repositories.review_history_repository import ReviewHistoryRepository
+from app.services.slack_files import cleanup_file, download_file, download_url
+from app.services.video_analysis import (
+    delete_uploaded_video,
+    get_cached_review,
+    get_uploaded_video,
+    review_uploaded_video,
+    upload_video,
+)
+
+logger = logging.getLogger(__name__)
+
+# Posts a message into a Slack thread (Bolt's `say`, or thread_poster())
+Poster = Callable[..., Awaitable[object]]
+
+# Caps concurrent downloads + analyses across every job, since a single
+# message with several videos fans out into several analyses
+_analysis_slots = asyncio.Semaphore(settings.analysis_concurrency)
+
+# Background task that re-claims lapsed jobs
+_recovery_task: asyncio.Task | None = None
+
+# Long-polls waiting on API jobs, resolved when this process finishes one
+_job_waiters: dict[str, set[asyncio.Future]] = {}
+
+
+def thread_poster(client, channel: str) -> Poster:
+    """Build a `say`-compatible poster for when no Slack request is in scope."""
+
+    async def say(text: str, thread_ts: str) -> None:
+        await client.chat_postMessage(channel=channel, text=text, thread_ts=thread_ts)
+
+    return say
+
+
+def new_jobs_for_message(event: dict, video_files: list[dict], caption: str | None) -> list[AnalysisJob]:
+    """Build (unsaved) jobs for every video attachment of a message."""
+    channel = event.get("channel")
+    message_ts = event.get("ts")
+    return [
+        AnalysisJob(
+            id=analysis_job_id(channel, message_ts, f["id"]),
+            channel=channel,
+            message_ts=message_ts,
+            user_id=event.get("user"),
+            file_id=f["id"],
+            file_name=f.get("name", "video"),
+            url_private_download=f["url_private_download"],
+            caption=caption,
+            # The replica that receives the event owns its jobs
+            lease_owner=replica_id,
+            lease_expires_at=lease_expiry(),
+        )
+        for f in video_files
+    ]
+
+
+def new_api_job(
+    owner: str,
+    file_name: str,
+    caption: str | None,
+    url: str | None = None,
+    local_path: Path | None = None,
+) -> AnalysisJob:
+    """
+    Build an (unsaved) job for a video submitted to the HTTP API.
+
+    Args:
+        owner: Fingerprint of the submitting API key
+        file_name: Name of the video file
+        caption: Optional caption to review alongside the video
+        url: URL to download the video from
+        local_path: Already-saved upload (the job starts as downloaded)
+
+    Returns:
+        The job
+    """
+    job_id = uuid.uuid4().hex
+    return AnalysisJob(
+        id=job_id,
+        source=JobSource.API.value,
+        channel=JobSource.API.value,
+        message_ts=job_id,
+        user_id=owner,
+        file_id=job_id,
+        file_name=file_name,
+        url_private_download=url or "",
+        caption=caption,
+        stage=(JobStage.DOWNLOADED if local_path else JobStage.QUEUED).value,
+        local_path=str(local_path) if local_path else None,
+        lease_owner=replica_id,
+        lease_expires_at=lease_expiry(),
+    )
+
+
+def _job_review(job: AnalysisJob) -> VideoReview | VideoScreening | None:
+    """Rebuild the review stored on a job."""
+    if job.review_json is None:
+        return None
+    if job.review_kind == "screening":
+        return VideoScreening.model_validate(job.review_json)
+    return VideoReview.model_validate(job.review_json)
+
+
+def _reviewed_fields(review: VideoReview | VideoScreening) -> dict:
+    return {
+        "review_kind": "screening" if isinstance(review, VideoScreening) else "review",
+        "review_json": review.model_dump(mode="json"),
+    }
+
+
+@traced("video.job")
+async def run_analysis_job(
+    job: AnalysisJob,
+    say: Poster,
+    labelled: bool = False,
+    priority: Priority = Priority.REVIEW,
+    renew: Callable[[], Awaitable[bool]] | None = None,
+) -> VideoReview | VideoScreening | None:
+    """
+    Run a job from its last completed stage through to the posted review.
+
+    Args:
+        job: The job to run
+        say: Poster for the message thread
+        labelled: Prefix messages with the file name (multi-video messages)
+        priority: Scheduling class for the Gemini requests
+        renew: Renews the message's lease; checked before uploading and posting
+
+    Returns:
+        The review, or None if the job failed (the creator is told)
+
+    Raises:
+        LeaseLost: If another replica took the message over
+    """
+    label = f" — {job.file_name}" if labelled else ""
+    set_span_attributes(job_id=job.id, file_name=job.file_name, resumed_from=job.stage)
+
+    try:
+        if not job.is_terminal:
+            with track_stage("video", "slot_wait"):
+                await _analysis_slots.acquire()
+            try:
+                job = await _run_until_reviewed(job, priority, renew)
+            finally:
+                _analysis_slots.release()
+
+        if job.stage == JobStage.REVIEWED.value:
+            review = _job_review(job)
+            if renew is not None:
+                await ensure_lease(renew, f"message {job.message_ts}")
+            with track_stage("video", "post_review"):
+                await say(
+                    text=f"*Video Analysis Complete{label}*\n\n{review.to_slack_message()}",
+                    thread_ts=job.message_ts,
+                )
+            job = await AnalysisJobRepository.advance(job.id, JobStage.POSTED)
+
+        return _job_review(job) if job.stage == JobStage.POSTED.value else None
+
+    except LeaseLost:
+        raise
+    except Exception as e:
+        logger.exception(f"Error processing video {job.file_name} (job {job.id}): {e}")
+        video_reviews.inc(outcome="error")
+        await _fail(job, str(e))
+        await say(
+            text=f"Sorry, there was an error analyzing your video{label}: {str(e)}",
+            thread_ts=job.message_ts,
+        )
+        return None
+
+
+async def _run_until_reviewed(
+    job: AnalysisJob,
+    priority: Priority,
+    renew: Callable[[], Awaitable[bool]] | None = None,
+) -> AnalysisJob:
+    """
+    Advance a job through download, upload and review.
+
+    Raises:
+        LeaseLost: If renew finds the job's lease taken over before the upload
+    """
+    uploaded = None
+
+    # The local file doesn't survive a restart on ephemeral disks
+    if job.stage == JobStage.DOWNLOADED.value and not (
+        job.local_path and Path(job.local_path).exists()
+    ):
+        job.stage = JobStage.QUEUED.value
+
+    if job.stage == JobStage.QUEUED.value:
+        with track_stage("video", "download"):
+            if job.source == JobSource.SLACK.value:
+                local_path = await download_file(
+                    url_private_download=job.url_private_download,
+                    file_id=job.file_id,
+                    filename=job.file_name,
+                )
+            elif job.url_private_download:
+                local_path = await download_url(
+                    job.url_private_download, file_id=job.file_id, filename=job.file_name
+                )
+            else:
+                raise RuntimeError("The uploaded video was lost before it was analyzed")
+        job = await AnalysisJobRepository.advance(
+            job.id, JobStage.DOWNLOADED, local_path=str(local_path)
+        )
+
+    if job.stage == JobStage.DOWNLOADED.value:
+        local_path = Path(job.local_path)
+        # Re-posts of the same file with the same caption are answered from cache
+        with track_stage("video", "cache_lookup"):
+            video_sha256, cached = await get_cached_review(local_path, job.caption)
+        if cached:
+            cleanup_file(local_path)
+            job = await AnalysisJobRepository.advance(
+                job.id,
+                JobStage.REVIEWED,
+                local_path=None,
+                video_sha256=video_sha256,
+                **_reviewed_fields(cached),
+            )
+        else:
+            # Past here the job owns a Gemini file; don't create one for a
+            # job another replica is now running
+            if renew is not None:
+                await ensure_lease(renew, f"job {job.id}")
+            uploaded = await upload_video(local_path, keep_original=False)
+            cleanup_file(local_path)
+            job = await AnalysisJobRepository.advance(
+                job.id,
+                JobStage.UPLOADED,
+                local_path=None,
+                video_sha256=video_sha256,
+                gemini_file_name=uploaded.file.name,
+                duration_seconds=uploaded.duration_seconds,
+            )
+
+    if job.stage == JobStage.UPLOADED.value:
+        if uploaded is None:
+            uploaded = await get_uploaded_video(job.gemini_file_name, job.duration_seconds)
+        try:
+            review = await review_uploaded_video(
+                uploaded, job.caption, priority, video_sha256=job.video_sha256
+            )
+        finally:
+            with track_stage("video", "delete_upload"):
+                await delete_uploaded_video(job.gemini_file_name)
+        job = await AnalysisJobRepository.advance(
+            job.id,
+            JobStage.REVIEWED,
+            gemini_file_name=None,
+            **_reviewed_fields(review),
+        )
+
+    return job
+
+
+async def _fail(job: AnalysisJob, error: str) -> None:
+    """Mark a job failed and release its local and Gemini files."""
+    # The caller's copy can predate stages recorded before the error (e.g. the
+    # local_path of a download whose upload then failed), so use the stored row
+    try:
+        job = await AnalysisJobRepository.get(job.id) or job
+    except Exception as e:
+        logger.warning(f"Could not reload job {job.id} before failing it: {e}")
+    if job.local_path:
+        cleanup_file(job.local_path)
+    if job.gemini_file_name:
+        await delete_uploaded_video(job.gemini_file_name)
+    try:
+        await AnalysisJobRepository.advance(
+            job.id, JobStage.FAILED, local_path=None, gemini_file_name=None, error=error[:1000]
+        )
+    except Exception as e:
+        logger.warning(f"Could not record failure of job {job.id}: {e}")
+
+
+@traced("video.process_message")
+async def process_message_jobs(jobs: list[AnalysisJob], say: Poster) -> None:
+    """
+    Run every job of one message concurrently, then rank and approve.
+
+    Args:
+        jobs: All jobs of the message (finished ones are just read back)
+        say: Poster for the message thread
+    """
+    channel, message_ts = jobs[0].channel, jobs[0].message_ts
+    multiple = len(jobs) > 1
+    set_span_attributes(channel=channel, message_ts=message_ts, videos=len(jobs))
+
+    async def renew() -> bool:
+        return await AnalysisJobRepository.renew_lease(channel, message_ts, replica_id)
+
+    # The jobs may have waited in the queue long enough for another replica
+    # to claim them; never work on a message we no longer hold
+    if not await renew():
+        logger.warning(f"Lease on message {message_ts} was lost before it started; skipping")
+        return
+
+    try:
+        async with heartbeat(renew, f"message {message_ts}"):
+            # Every video is reviewed concurrently, each posting its own result
+            reviews = await asyncio.gather(
+                *(run_analysis_job(job, say, labelled=multiple, renew=renew) for job in jobs)
+            )
+            results = [(job, r) for job, r in zip(jobs, reviews) if r is not None]
+            for job, review in results:
+                approved = review.overall_score >= settings.score_threshold
+                video_reviews.inc(outcome="approved" if approved else "rejected")
+                await _record_history(job, review)
+
+            with track_stage("video", "finalize"):
+                await ensure_lease(renew, f"message {message_ts}")
+                if multiple and results:
+                    await say(text=_format_ranking(results), thread_ts=message_ts)
+
+                await _approve_best(results, say)
+                await AnalysisJobRepository.mark_finalized(channel, message_ts)
+    except LeaseLost as e:
+        # The replica that took the message over finishes it from the recorded stages
+        logger.warning(f"{e}; stopped working on it")
+
+
+@traced("video.api_job")
+async def process_api_job(job: AnalysisJob, priority: Priority = Priority.REVIEW) -> None:
+    """
+    Run an API submission through to its stored review.
+
+    Uses the same analysis slots as Slack uploads. Nothing is posted; the
+    review stays on the job for the submitter to fetch.
+
+    Args:
+        job: The job (new, or resumed from its last completed stage)
+        priority: Scheduling class for the Gemini requests
+    """
+    set_span_attributes(job_id=job.id, file_name=job.file_name, resumed_from=job.stage)
+
+    async def renew() -> bool:
+        return await AnalysisJobRepository.renew_lease(job.channel, job.message_ts, replica_id)
+
+    try:
+        if not await renew():
+            logger.warning(f"Lease on API job {job.id} was lost before it started; skipping")
+            return
+
+        async with heartbeat(renew, f"API job {job.id}"):
+            if not job.is_terminal and job.stage != JobStage.REVIEWED.value:
+                try:
+                    with track_stage("video", "slot_wait"):
+                        await _analysis_slots.acquire()
+                    try:
+                        job = await _run_until_reviewed(job, priority, renew)
+                    finally:
+                        _analysis_slots.release()
+                except LeaseLost:
+                    raise
+                except Exception as e:
+                    logger.exception(f"Error processing API job {job.id}: {e}")
+                    video_reviews.inc(outcome="error")
+                    await _fail(job, str(e))
+                else:
+                    # Not added to the review history: that tracks Slack creators,
+                    # and an API key is an agency, not a creator
+                    approved = _job_review(job).overall_score >= settings.score_threshold
+                    video_reviews.inc(outcome="approved" if approved else "rejected")
+            await AnalysisJobRepository.mark_finalized(job.channel, job.message_ts)
+    except LeaseLost as e:
+        logger.warning(f"{e}; stopped working on it")
+    finally:
+        for waiter in _job_waiters.pop(job.id, ()):
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+async def _record_history(job: AnalysisJob, review: VideoReview | VideoScreening) -> None:
+    """Add a finished Slack review to the history; never fails the job."""
+    try:
+        await ReviewHistoryRepository.record(job, review)
+    except Exception as e:
+        logger.warning(f"Could not record review history for job {job.id}: {e}")
+
+
+async def wait_for_job(job_id: str, timeout: float) -> None:
+    """
+    Wait up to timeout seconds for an API job run by this process to finish.
+
+    Returns early when it does; callers re-read the job either way, since
+    another replica may be the one running it.
+    """
+    waiter = asyncio.get_running_loop().create_future()
+    waiters = _job_waiters.setdefault(job_id, set())
+    waiters.add(waiter)
+    try:
+        await asyncio.wait_for(waiter, timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        waiters.discard(waiter)
+        if not waiters and _job_waiters.get(job_id) is waiters:
+            del _job_waiters[job_id]
+
+
+def _format_ranking(results: list[tuple[AnalysisJob, VideoReview | VideoScreening]]) -> str:
+    """Summarize a multi-video submission, best score first."""
+    ranked = sorted(results, key=lambda item: item[1].overall_score, reverse=True)
+    lines = []
+    for rank, (job, review) in enumerate(ranked, start=1):
+        mark = " ✅" if review.overall_score >= settings.score_threshold else ""
+        lines.append(
+            f"{rank}. *{job.file_name}* — {review.overall_score}/100 "
+            f"({review.virality_tier}){mark}"
+        )
+    return "*Ranking*\n" + "\n".join(lines)
+
+
+async def _approve_best(
+    results: list[tuple[AnalysisJob, VideoReview | VideoScreening]],
+    say: Poster,
+) -> None:
+    """Save a pending approval for the best approved video and ask for links."""
+    # Check if approved based on score threshold
+    approved = [(j, r) for j, r in results if r.overall_score >= settings.score_threshold]
+    if not approved:
+        for job, review in results:
+            logger.info(
+                f"Video {job.file_name} not approved. Score: {review.overall_score}, "
+                f"Threshold: {settings.score_threshold}"
+            )
+        return
+
+    # One pending approval per thread, so links are collected for the best video
+    job, review = max(approved, key=lambda item: item[1].overall_score)
+
+    try:
+        # Store for later link collection
+        await ApprovalRepository.save(
+            thread_ts=job.message_ts,
+            user_id=job.user_id,
+            channel=job.channel,
+            review=review,
+            caption=job.caption,
+        )
+
+        which = f" *{job.file_name}*" if len(results) > 1 else ""
+        await say(
+            text=(
+                f"Congratulations! Your video{which} scored *{review.overall_score}/100* "
+                f"(Virality Tier: *{review.virality_tier}*) and has been approved for promotion.\n\n"
+                "Please reply to this thread with your Instagram and/or TikTok post links "
+                "so we can generate engagement comments for your content."
+            ),
+            thread_ts=job.message_ts,
+        )
+
+        logger.info(
+            f"Video approved with score {review.overall_score}. Awaiting links from user {job.user_id}"
+        )
+    except Exception as e:
+        logger.exception(f"Error saving approval: {e}")
+        await say(
+            text=f"Sorry, there was an error approving your video: {str(e)}",
+            thread_ts=job.message_ts,
+        )
+
+
+async def recover_analysis_jobs(client) -> int:
+    """
+    Claim and resume jobs whose owner stopped working on them.
+
+    Covers jobs left by a previous run of this process as well as by other
+    replicas that crashed: any message whose lease has lapsed is claimed.
+    Messages younger than `analysis_job_resume_max_age_seconds` are queued on
+    the job queue to continue from their last completed stage. Older ones are
+    abandoned: their local and Gemini files are deleted and they are marked
+    failed without posting. Old finished jobs are purged.
+
+    Args:
+        client: Slack client used to post into threads
+
+    Returns:
+        Number of messages resumed
+    """
+    await AnalysisJobRepository.purge_finalized(settings.analysis_job_retention_seconds)
+
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+        seconds=settings.analysis_job_resume_max_age_seconds
+    )
+    resumed = 0
+    while claimed := await AnalysisJobRepository.claim_next_message(replica_id):
+        channel, message_ts = claimed[0].channel, claimed[0].message_ts
+        if claimed[0].source == JobSource.API.value:
+            try:
+                resumed += await _resume_api_job(claimed[0], cutoff)
+            except asyncio.QueueFull:
+                logger.warning(f"Job queue full; API job {message_ts} will be resumed later")
+                break
+            continue
+
+        # Finished jobs of the message are needed for ranking and approval
+        jobs = await AnalysisJobRepository.get_for_message(channel, message_ts)
+
+        if min(job.created_at for job in jobs) < cutoff:
+            logger.warning(f"Abandoning stale analysis jobs for message {message_ts}")
+            for job in jobs:
+                if not job.is_terminal:
+                    await _fail(job, "Abandoned after restart")
+            await AnalysisJobRepository.mark_finalized(channel, message_ts)
+            continue
+
+        logger.info(
+            f"Resuming analysis of message {message_ts} "
+            f"({', '.join(f'{j.file_name}: {j.stage}' for j in jobs)})"
+        )
+        try:
+            job_queue.submit(
+                run_in_session_scope, process_message_jobs, jobs, thread_poster(client, channel)
+            )
+        except asyncio.QueueFull:
+            # Our lease lapses and the message is picked up again later
+            logger.warning(f"Job queue full; message {message_ts} will be resumed later")
+            break
+        resumed += 1
+
+    return resumed
+
+
+async def _resume_api_job(job: AnalysisJob, cutoff: datetime) -> bool:
+    """
+    Queue a claimed API job to continue, or abandon it if it is stale.
+
+    Returns:
+        Whether the job was queued
+
+    Raises:
+        asyncio.QueueFull: If the job queue is at capacity
+    """
+    if job.created_at < cutoff:
+        logger.warning(f"Abandoning stale API job {job.id}")
+        if not job.is_terminal:
+            await _fail(job, "Abandoned after restart")
+        await AnalysisJobRepository.mark_finalized(job.channel, job.message_ts)
+        return False
+
+    logger.info(f"Resuming API job {job.id} ({job.stage})")
+    job_queue.submit(run_in_session_scope, process_api_job, job)
+    return True
+
+
+async def _recovery_loop(client) -> None:
+    while True:
+        try:
+            resumed = await recover_analysis_jobs(client)
+            if resumed:
+                logger.info(f"Resuming {resumed} unfinished analyses")
+        except Exception as e:
+            logger.exception(f"Analysis job recovery failed: {e}")
+        await asyncio.sleep(settings.job_recovery_interval_seconds)
+
+
+def start_job_recovery(client) -> None:
+    """Start looking for lapsed analysis jobs now and every recovery interval."""
+    global _recovery_task
+    if _recovery_task is None or _recovery_task.done():
+        _recovery_task = asyncio.create_task(_recovery_loop(client), name="analysis-job-recovery")
+
+
+async def stop_job_recovery() -> None:
+    """Stop the recovery loop."""
+    global _recovery_task
+    if _recovery_task is not None:
+        _recovery_task.cancel()
+        try:
+            await _recovery_task
+        except asyncio.CancelledError:
+            pass
+        _recovery_task = None
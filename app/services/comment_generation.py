@@ -3,47 +3,111 @@
 import asyncio
 import logging
 
-from google import genai
+from google.genai import types
 
 from app.config import settings
-from app.prompts.comment_generation import get_comment_generation_prompt
+from app.core.gemini import estimate_text_tokens
+from app.core.rate_limiter import Priority
+from app.core.tracing import set_span_attributes, traced
+from app.models import EngagementCommentSet, PlatformComments
+from app.prompts.comment_generation import (
+    COMMENT_PROMPT_VERSION,
+    get_comment_guidelines,
+    get_comment_request,
+)
+from app.services.prompt_cache import generate_with_cached_prompt
 
 logger = logging.getLogger(__name__)
 
-# Initialize Gemini client
-client = genai.Client(api_key=settings.gemini_api_key)
+
+async def _generate_comment_set(
+    posts: dict[str, str],
+    video_summary: str,
+    caption: str | None,
+) -> EngagementCommentSet:
+    """Make one structured Gemini call covering every platform in posts."""
+    guidelines = get_comment_guidelines()
+    request = get_comment_request(
+        video_summary=video_summary,
+        posts=posts,
+        caption=caption,
+    )
+
+    # A creator is waiting in the thread, so this runs ahead of video reviews
+    response = await generate_with_cached_prompt(
+        variant="comment-guidelines",
+        version=COMMENT_PROMPT_VERSION,
+        static_text=guidelines,
+        dynamic_text=request,
+        media_parts=[],
+        priority=Priority.INTERACTIVE,
+        estimated_tokens=(
+            estimate_text_tokens(guidelines + request)
+            + settings.gemini_comment_output_tokens * len(posts)
+        ),
+        model=settings.gemini_model,
+        config=types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=EngagementCommentSet,
+        ),
+    )
+
+    return EngagementCommentSet.model_validate_json(response.text)
 
 
+@traced("generate_engagement_comments")
 async def generate_engagement_comments(
-    platform: str,
-    post_url: str,
+    posts: dict[str, str],
     video_summary: str | None = None,
     caption: str | None = None,
-) -> str:
+) -> dict[str, PlatformComments]:
     """
     Generate engagement comments for approved content using text context.
 
+    In "combined" mode all platforms are covered by a single Gemini call; in
+    "per_platform" mode each platform gets its own call and the calls run
+    concurrently, so one failing platform doesn't lose the others.
+
     Args:
-        platform: Target platform (instagram or tiktok)
-        post_url: URL to the post
+        posts: Post URL for each target platform (instagram and/or tiktok)
         video_summary: Summary of the video review
         caption: Optional caption from the post
 
     Returns:
-        Generated engagement comments
+        Comments for each platform that was generated successfully
     """
-    prompt = get_comment_generation_prompt(
-        video_summary=video_summary or "",
-        platform=platform,
-        post_url=post_url,
-        caption=caption,
-    )
-
-    logger.info("Generating comments from summary")
-    response = await asyncio.to_thread(
-        client.models.generate_content,
+    video_summary = video_summary or ""
+    set_span_attributes(
+        platforms=",".join(posts),
+        mode=settings.comment_generation_mode,
         model=settings.gemini_model,
-        contents=prompt,
     )
 
-    return response.text
+    if settings.comment_generation_mode == "per_platform":
+        logger.info(f"Generating comments for {', '.join(posts)} in parallel")
+        results = await asyncio.gather(
+            *(
+                _generate_comment_set({platform: url}, video_summary, caption)
+                for platform, url in posts.items()
+            ),
+            return_exceptions=True,
+        )
+        comment_sets = []
+        for platform, result in zip(posts, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error generating {platform} comments: {result}")
+            else:
+                comment_sets.append(result)
+    else:
+        logger.info(f"Generating comments for {', '.join(posts)} in one call")
+        comment_sets = [await _generate_comment_set(posts, video_summary, caption)]
+
+    comments = {}
+    for platform in posts:
+        for comment_set in comment_sets:
+            platform_comments = comment_set.for_platform(platform)
+            if platform_comments:
+                comments[platform] = platform_comments
+                break
+
+    return comments
@@ -0,0 +1,136 @@
+"""De-duplication of Slack event deliveries.
+
+Slack re-delivers an event (with `X-Slack-Retry-Num`) whenever it thinks the
+first delivery was not acknowledged in time. Every event is checked here
+before any download or Gemini work is queued, keyed on the event_id and on the
+(channel, ts, file id) of each attachment so re-deliveries under a new
+event_id are caught too.
+"""
+
+import logging
+import time
+
+from app.config import settings
+from app.repositories.processed_event_repository import ProcessedEventRepository
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryDedupStore:
+    """Process-local, bounded TTL store. Sufficient for a single replica."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int) -> None:
+        self._seen: TTLCache[str, bool] = TTLCache(max_entries, ttl_seconds)
+
+    async def claim(self, key: str) -> bool:
+        return self._seen.add(key, True)
+
+    async def release(self, keys: list[str]) -> None:
+        for key in keys:
+            self._seen.pop(key)
+
+
+class DatabaseDedupStore:
+    """Store backed by the processed_events table, shared across replicas."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        # Local front cache so obvious retries never reach the database
+        self._local = MemoryDedupStore(max_entries, ttl_seconds)
+        self._last_purge = time.monotonic()
+
+    async def claim(self, key: str) -> bool:
+        if not await self._local.claim(key):
+            return False
+
+        if time.monotonic() - self._last_purge > self.ttl_seconds:
+            self._last_purge = time.monotonic()
+            await ProcessedEventRepository.purge_expired(self.ttl_seconds)
+
+        return await ProcessedEventRepository.claim(key, self.ttl_seconds)
+
+    async def release(self, keys: list[str]) -> None:
+        await self._local.release(keys)
+        await ProcessedEventRepository.release(keys)
+
+
+def event_dedup_keys(event: dict, event_id: str | None = None) -> list[str]:
+    """
+    Build the de-duplication keys for a message event.
+
+    Args:
+        event: The Slack message event
+        event_id: The envelope event_id, if available
+
+    Returns:
+        Keys identifying this delivery and the content it carries
+    """
+    channel = event.get("channel")
+    ts = event.get("ts")
+
+    keys = []
+    if event_id:
+        keys.append(f"event:{event_id}")
+
+    file_ids = [f.get("id") for f in event.get("files", []) if f.get("id")]
+    if file_ids:
+        keys.extend(f"file:{channel}:{ts}:{file_id}" for file_id in file_ids)
+    elif ts:
+        keys.append(f"message:{channel}:{ts}")
+
+    return keys
+
+
+class EventDeduplicator:
+    """Drops Slack events whose keys have already been claimed."""
+
+    def __init__(self, store: MemoryDedupStore | DatabaseDedupStore) -> None:
+        self.store = store
+
+    async def is_duplicate(self, keys: list[str]) -> bool:
+        """
+        Claim every key; the event is a duplicate if any key was already claimed.
+
+        Args:
+            keys: Keys from `event_dedup_keys`
+
+        Returns:
+            True if the event has been seen before and should be dropped
+        """
+        duplicate = False
+        for key in keys:
+            if not await self.store.claim(key):
+                duplicate = True
+
+        if duplicate:
+            logger.info(f"Dropping duplicate Slack event: {keys}")
+        return duplicate
+
+    async def release(self, keys: list[str]) -> None:
+        """
+        Un-claim keys of an event that was dropped without being handled.
+
+        A re-delivery (or re-post) of the event is then processed instead of
+        being taken for a duplicate.
+
+        Args:
+            keys: Keys claimed by `is_duplicate`
+        """
+        try:
+            await self.store.release(keys)
+        except Exception as e:
+            logger.warning(f"Could not release de-duplication keys {keys}: {e}")
+
+
+def _create_store() -> MemoryDedupStore | DatabaseDedupStore:
+    backend = settings.event_dedup_backend.lower()
+    if backend == "database":
+        return DatabaseDedupStore(settings.event_dedup_max_entries, settings.event_dedup_ttl_seconds)
+    if backend != "memory":
+        logger.warning(f"Unknown EVENT_DEDUP_BACKEND '{backend}', using memory")
+    return MemoryDedupStore(settings.event_dedup_max_entries, settings.event_dedup_ttl_seconds)
+
+
+# Global deduplicator
+event_deduplicator = EventDeduplicator(_create_store())
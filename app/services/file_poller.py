@@ -0,0 +1,200 @@
+"""Shared, adaptive poller for Gemini file processing state.
+
+Uploaded videos sit in PROCESSING for anything from a second to a few
+minutes. Rather than every analysis sleeping a flat interval in its own loop,
+all in-flight files are registered with one poller task. Each file gets a
+first check scaled to its size (or duration, when known), then exponential
+backoff with jitter, and a hard deadline. On every tick the poller checks all
+files that are due together.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+
+from google.genai import types
+
+from app.config import settings
+from app.core.gemini import client, gemini_limiter
+from app.core.metrics import gemini_files_processing
+
+logger = logging.getLogger(__name__)
+
+
+class FileProcessingTimeout(RuntimeError):
+    """Raised when a Gemini file is still PROCESSING after the poll timeout."""
+
+
+@dataclass
+class _PendingFile:
+    name: str
+    future: asyncio.Future
+    interval: float
+    next_check: float
+    deadline: float
+    checks: int = field(default=0)
+
+
+class FileStatePoller:
+    """Waits for many Gemini files to leave the PROCESSING state at once."""
+
+    def __init__(
+        self,
+        initial_delay: float,
+        seconds_per_mb: float,
+        seconds_per_minute: float,
+        max_interval: float,
+        backoff: float,
+        timeout: float,
+    ) -> None:
+        self.initial_delay = initial_delay
+        self.seconds_per_mb = seconds_per_mb
+        self.seconds_per_minute = seconds_per_minute
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self._pending: dict[str, _PendingFile] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def in_flight(self) -> int:
+        """Number of files currently being waited on."""
+        return len(self._pending)
+
+    def first_check_delay(self, size_bytes: int | None, duration_seconds: float | None) -> float:
+        """
+        Estimate when a file is first worth checking.
+
+        Args:
+            size_bytes: Size of the uploaded file, if known
+            duration_seconds: Video duration, if known (preferred over size)
+
+        Returns:
+            Seconds to wait before the first status check
+        """
+        if duration_seconds:
+            estimate = duration_seconds / 60 * self.seconds_per_minute
+        elif size_bytes:
+            estimate = size_bytes / 1024 / 1024 * self.seconds_per_mb
+        else:
+            estimate = 0.0
+        return min(self.initial_delay + estimate, self.max_interval)
+
+    async def wait_until_processed(
+        self,
+        video_file: types.File,
+        duration_seconds: float | None = None,
+    ) -> types.File:
+        """
+        Wait for an uploaded file to leave the PROCESSING state.
+
+        Args:
+            video_file: File returned by the upload
+            duration_seconds: Video duration, if known
+
+        Returns:
+            The file with its final state (ACTIVE or FAILED)
+
+        Raises:
+            FileProcessingTimeout: If processing exceeds the poll timeout
+        """
+        if video_file.state != "PROCESSING":
+            return video_file
+
+        now = time.monotonic()
+        delay = self.first_check_delay(video_file.size_bytes, duration_seconds)
+        pending = _PendingFile(
+            name=video_file.name,
+            future=asyncio.get_running_loop().create_future(),
+            interval=delay,
+            next_check=now + delay,
+            deadline=now + self.timeout,
+        )
+        self._pending[video_file.name] = pending
+        self._ensure_running()
+        self._wakeup.set()
+
+        try:
+            return await pending.future
+        finally:
+            self._pending.pop(video_file.name, None)
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="gemini-file-poller")
+
+    async def _run(self) -> None:
+        """Poll due files until nothing is pending."""
+        try:
+            await self._poll_until_idle()
+        except Exception as e:
+            # Never leave waiters hanging if the loop itself breaks
+            logger.exception(f"File poller crashed: {e}")
+            for pending in self._pending.values():
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+
+    async def _poll_until_idle(self) -> None:
+        while self._pending:
+            now = time.monotonic()
+            due = [p for p in self._pending.values() if p.next_check <= now and not p.future.done()]
+
+            if due:
+                await asyncio.gather(*(self._check(p) for p in due))
+                continue
+
+            next_check = min(p.next_check for p in self._pending.values())
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(next_check - now, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _check(self, pending: _PendingFile) -> None:
+        """Check one file and either resolve it or schedule its next check."""
+        pending.checks += 1
+        try:
+            async with gemini_limiter.metadata():
+                video_file = await client.aio.files.get(name=pending.name)
+        except Exception as e:
+            # Transient status errors are retried on the normal schedule
+            logger.warning(f"Status check failed for {pending.name}: {e}")
+            video_file = None
+
+        if pending.future.done():
+            return
+
+        if video_file is not None and video_file.state != "PROCESSING":
+            logger.info(
+                f"File {pending.name} is {video_file.state} after {pending.checks} status checks"
+            )
+            pending.future.set_result(video_file)
+            return
+
+        now = time.monotonic()
+        if now >= pending.deadline:
+            pending.future.set_exception(
+                FileProcessingTimeout(
+                    f"Video processing timed out after {self.timeout:.0f}s: {pending.name}"
+                )
+            )
+            return
+
+        pending.interval = min(pending.interval * self.backoff, self.max_interval)
+        jittered = pending.interval * random.uniform(0.8, 1.2)
+        pending.next_check = min(now + jittered, pending.deadline)
+
+
+# Global poller shared by all analyses in the process
+file_state_poller = FileStatePoller(
+    initial_delay=settings.gemini_poll_initial_delay,
+    seconds_per_mb=settings.gemini_poll_seconds_per_mb,
+    seconds_per_minute=settings.gemini_poll_seconds_per_minute,
+    max_interval=settings.gemini_poll_max_interval,
+    backoff=settings.gemini_poll_backoff,
+    timeout=settings.gemini_poll_timeout,
+)
+gemini_files_processing.set_function(lambda: file_state_poller.in_flight)
@@ -0,0 +1,222 @@
+"""Gemini context caching for the static parts of our prompts.
+
+The video review prompt and the comment guidelines are several kilobytes of
+text that never change between requests. Each variant is registered once as
+a Gemini cached context (named by variant and prompt version), its TTL is
+refreshed before it expires, and per-call requests only send the video and
+the small dynamic section. Any caching failure (unsupported model, prompt
+below the minimum cacheable size, API error) falls back to sending the full
+prompt inline.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from google.genai import errors, types
+
+from app.config import settings
+from app.core.gemini import client, gemini_limiter, generate_content
+from app.core.metrics import cache_lookups
+from app.core.rate_limiter import Priority
+
+logger = logging.getLogger(__name__)
+
+DISPLAY_NAME_PREFIX = "ugc-prompt"
+
+
+@dataclass
+class _CachedContext:
+    name: str
+    expires_at: float
+
+
+class PromptContextCache:
+    """Registers and refreshes Gemini cached contexts for static prompt prefixes."""
+
+    def __init__(self, ttl_seconds: int, refresh_margin_seconds: int, retry_after_seconds: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self._contexts: dict[str, _CachedContext] = {}
+        self._failed_until: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def get(self, model: str, variant: str, version: str, text: str) -> str | None:
+        """
+        Get the cached context name for a static prompt, creating it if needed.
+
+        Args:
+            model: Gemini model the context is used with
+            variant: Prompt variant (e.g. "video-review-caption")
+            version: Prompt version; a new version gets a new context
+            text: The static prompt text
+
+        Returns:
+            The cached content name, or None to send the prompt inline
+        """
+        if not settings.gemini_context_cache_enabled:
+            return None
+
+        display_name = f"{DISPLAY_NAME_PREFIX}-{variant}-v{version}"
+        key = f"{model}:{display_name}"
+        now = time.monotonic()
+
+        if self._failed_until.get(key, 0) > now:
+            return None
+
+        context = self._contexts.get(key)
+        if context and context.expires_at - now > self.refresh_margin_seconds:
+            return context.name
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another request may have refreshed it while we waited
+            context = self._contexts.get(key)
+            now = time.monotonic()
+            if context and context.expires_at - now > self.refresh_margin_seconds:
+                return context.name
+
+            try:
+                if context and context.expires_at > now:
+                    name = await self._refresh(context.name)
+                else:
+                    name = await self._find_existing(model, display_name) or await self._create(
+                        model, display_name, text
+                    )
+            except Exception as e:
+                logger.warning(
+                    f"Context caching unavailable for {display_name}, sending prompt inline: {e}"
+                )
+                self._contexts.pop(key, None)
+                self._failed_until[key] = now + self.retry_after_seconds
+                return None
+
+            self._contexts[key] = _CachedContext(name=name, expires_at=now + self.ttl_seconds)
+            return name
+
+    def invalidate(self, cached_content: str) -> None:
+        """Forget a context that Gemini no longer recognizes (e.g. it expired early)."""
+        for key, context in list(self._contexts.items()):
+            if context.name == cached_content:
+                del self._contexts[key]
+
+    async def _find_existing(self, model: str, display_name: str) -> str | None:
+        """Reuse a live context created earlier (by this or another replica)."""
+        name = None
+        async with gemini_limiter.metadata():
+            pager = await client.aio.caches.list()
+            async for cached in pager:
+                if (
+                    cached.display_name == display_name
+                    and cached.model
+                    and cached.model.endswith(model)
+                ):
+                    name = cached.name
+                    break
+
+        if name is None:
+            return None
+
+        # Make sure it lives long enough for us to rely on it
+        await self._refresh(name)
+        logger.info(f"Reusing cached context {name} ({display_name})")
+        return name
+
+    async def _create(self, model: str, display_name: str, text: str) -> str:
+        async with gemini_limiter.metadata():
+            cached = await client.aio.caches.create(
+                model=model,
+                config=types.CreateCachedContentConfig(
+                    display_name=display_name,
+                    contents=[types.Content(role="user", parts=[types.Part.from_text(text=text)])],
+                    ttl=f"{self.ttl_seconds}s",
+                ),
+            )
+        logger.info(f"Created cached context {cached.name} ({display_name})")
+        return cached.name
+
+    async def _refresh(self, name: str) -> str:
+        async with gemini_limiter.metadata():
+            await client.aio.caches.update(
+                name=name,
+                config=types.UpdateCachedContentConfig(ttl=f"{self.ttl_seconds}s"),
+            )
+        return name
+
+
+# Global prompt context cache
+prompt_context_cache = PromptContextCache(
+    ttl_seconds=settings.gemini_context_cache_ttl_seconds,
+    refresh_margin_seconds=settings.gemini_context_cache_refresh_margin_seconds,
+    retry_after_seconds=settings.gemini_context_cache_retry_seconds,
+)
+
+
+async def generate_with_cached_prompt(
+    *,
+    variant: str,
+    version: str,
+    static_text: str,
+    dynamic_text: str,
+    media_parts: list[types.Part],
+    priority: Priority,
+    estimated_tokens: int,
+    model: str,
+    config: types.GenerateContentConfig,
+) -> types.GenerateContentResponse:
+    """
+    Call generate_content with the static prompt served from a cached context.
+
+    Without a usable cached context the request is identical to sending
+    media_parts followed by static_text + dynamic_text inline.
+
+    Args:
+        variant: Prompt variant name for the cached context
+        version: Prompt version for the cached context
+        static_text: The static prompt prefix
+        dynamic_text: The per-request prompt section (may be empty)
+        media_parts: Parts sent before the prompt text (e.g. the video)
+        priority: Scheduling class for the request
+        estimated_tokens: Expected token cost of the full request
+        model: Gemini model name
+        config: Generation config (cached_content is filled in here)
+
+    Returns:
+        The Gemini response
+    """
+    cached_content = await prompt_context_cache.get(model, variant, version, static_text)
+    cache_lookups.inc(cache="prompt_context", result="hit" if cached_content else "miss")
+
+    if cached_content:
+        parts = list(media_parts)
+        if dynamic_text:
+            parts.append(types.Part.from_text(text=dynamic_text))
+        try:
+            return await generate_content(
+                priority=priority,
+                estimated_tokens=estimated_tokens,
+                model=model,
+                contents=[types.Content(role="user", parts=parts)],
+                config=config.model_copy(update={"cached_content": cached_content}),
+            )
+        except errors.ClientError as e:
+            # The context may have expired or been deleted behind our back
+            if e.code not in (400, 403, 404):
+                raise
+            logger.warning(f"Cached context {cached_content} rejected ({e.code}); retrying inline")
+            prompt_context_cache.invalidate(cached_content)
+
+    return await generate_content(
+        priority=priority,
+        estimated_tokens=estimated_tokens,
+        model=model,
+        contents=[
+            types.Content(
+                role="user",
+                parts=[*media_parts, types.Part.from_text(text=static_text + dynamic_text)],
+            )
+        ],
+        config=config,
+    )
@@ -1,12 +1,20 @@
-"""Slack file operations service."""
+"""Video file download, storage and cleanup (Slack files, URLs and uploads)."""
 
+import asyncio
+import ipaddress
 import logging
 import os
+import socket
+import time
+from collections.abc import AsyncIterable, Iterable
 from pathlib import Path
 
+import httpcore
 import httpx
 
 from app.config import settings
+from app.core.http_client import get_http_client
+from app.core.tracing import set_span_attributes, traced
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +22,128 @@ logger = logging.getLogger(__name__)
 TEMP_DIR = Path("/tmp/ugc_videos")
 TEMP_DIR.mkdir(parents=True, exist_ok=True)
 
+# Bytes read from the response and written to disk per iteration
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 
+# Redirects followed when downloading a submitted URL (each hop is re-checked)
+MAX_URL_REDIRECTS = 5
+
+
+class FileTooLargeError(ValueError):
+    """Raised when a download exceeds the configured maximum video size."""
+
+
+class DisallowedURLError(ValueError):
+    """Raised when a submitted URL points somewhere the server must not fetch."""
+
+
+async def check_public_url(url: str) -> None:
+    """
+    Make sure a submitted URL only reaches public hosts.
+
+    The URL must be http(s), its host must be in API_URL_ALLOWED_HOSTS when
+    that is set, and every address the host resolves to must be globally
+    routable (no loopback, private, link-local, reserved or metadata
+    addresses).
+
+    Args:
+        url: URL to check
+
+    Raises:
+        DisallowedURLError: If the URL may not be fetched
+    """
+    parsed = _check_url(url)
+    await _resolve_public(parsed.host, parsed.port or (443 if parsed.scheme == "https" else 80))
+
+
+def _check_url(url: str) -> httpx.URL:
+    """Check a URL's scheme and host against the allowlist, without resolving it."""
+    try:
+        parsed = httpx.URL(url)
+    except httpx.InvalidURL as e:
+        raise DisallowedURLError(f"Invalid URL: {e}") from e
+    if parsed.scheme not in ("http", "https") or not parsed.host:
+        raise DisallowedURLError("Only http and https URLs can be downloaded")
+
+    host = parsed.host.lower()
+    allowed = [h.strip().lower() for h in settings.api_url_allowed_hosts.split(",") if h.strip()]
+    if allowed and host not in allowed:
+        raise DisallowedURLError(f"Downloads from {host} are not allowed")
+    return parsed
+
+
+async def _resolve_public(host: str, port: int) -> list[str]:
+    """
+    Resolve a host, requiring every address to be public.
+
+    Returns:
+        The addresses, in resolver order
+
+    Raises:
+        DisallowedURLError: If the host doesn't resolve or any address isn't public
+    """
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        raise DisallowedURLError(f"Cannot resolve {host}") from e
+
+    addresses = []
+    for *_, sockaddr in infos:
+        address = ipaddress.ip_address(sockaddr[0].split("%", 1)[0])
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not address.is_global or address.is_multicast:
+            raise DisallowedURLError(f"Downloads from {host} are not allowed (non-public address)")
+        addresses.append(sockaddr[0])
+    return addresses
+
+
+class _PublicOnlyBackend(httpcore.AnyIOBackend):
+    """
+    Network backend that connects only to addresses it has just checked.
+
+    The host is resolved once, every address is validated, and the socket is
+    opened to a validated address, so a DNS-rebinding host can't pass the
+    check and then resolve to a private address for the connection. TLS SNI
+    and the Host header still carry the original host name.
+    """
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Iterable | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        addresses = await _resolve_public(host, port)
+        error: Exception = DisallowedURLError(f"Cannot resolve {host}")
+        for address in addresses:
+            try:
+                return await super().connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        raise error
+
+
+class _PublicOnlyTransport(httpx.AsyncHTTPTransport):
+    """HTTP transport whose connections go through _PublicOnlyBackend."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            network_backend=_PublicOnlyBackend(),
+        )
+
+
+@traced("slack.download_file", attributes=("file_id", "filename"))
 async def download_file(url_private_download: str, file_id: str, filename: str) -> Path:
     """
     Download a file from Slack.
@@ -27,19 +156,123 @@ async def download_file(url_private_download: str, file_id: str, filename: str)
     Returns:
         Path to the downloaded file
     """
-    # Create a unique filename to avoid collisions
-    local_path = TEMP_DIR / f"{file_id}_{filename}"
+    return await _download(
+        url_private_download,
+        TEMP_DIR / f"{file_id}_{filename}",
+        headers={"Authorization": f"Bearer {settings.slack_bot_token}"},
+    )
+
+
+@traced("download_url", attributes=("file_id", "filename"))
+async def download_url(url: str, file_id: str, filename: str) -> Path:
+    """
+    Download a video from a public URL (API submissions).
+
+    The Slack token is never sent, since the URL comes from outside, and the
+    URL and every redirect are checked with check_public_url first.
+
+    Args:
+        url: http(s) URL of the video
+        file_id: Unique id used in the local file name
+        filename: File name to keep
+
+    Returns:
+        Path to the downloaded file
+    """
+    return await _download(url, TEMP_DIR / f"{file_id}_{filename}", headers={}, public_only=True)
+
+
+async def _download(
+    url: str,
+    local_path: Path,
+    headers: dict[str, str],
+    public_only: bool = False,
+) -> Path:
+    """Stream a URL to local_path, enforcing the size limit."""
+    max_bytes = settings.max_video_size_mb * 1024 * 1024
+
+    if not public_only:
+        async with get_http_client().stream(
+            "GET", url, headers=headers, follow_redirects=True
+        ) as response:
+            return await _save_response(response, local_path, max_bytes)
 
-    async with httpx.AsyncClient() as http_client:
-        response = await http_client.get(
-            url_private_download,
-            headers={"Authorization": f"Bearer {settings.slack_bot_token}"},
-            follow_redirects=True,
+    # Outside URLs get their own client: no proxies from the environment, and
+    # every connection (each redirect hop included) goes to a checked address
+    async with httpx.AsyncClient(
+        transport=_PublicOnlyTransport(),
+        timeout=get_http_client().timeout,
+        trust_env=False,
+    ) as client:
+        for _ in range(MAX_URL_REDIRECTS + 1):
+            _check_url(url)
+            async with client.stream("GET", url, headers=headers) as response:
+                if response.is_redirect:
+                    url = str(response.url.join(response.headers["location"]))
+                    continue
+                return await _save_response(response, local_path, max_bytes)
+
+    raise DisallowedURLError(f"Too many redirects (more than {MAX_URL_REDIRECTS})")
+
+
+async def _save_response(response: httpx.Response, local_path: Path, max_bytes: int) -> Path:
+    """Save a streamed download response, rejecting oversized files early."""
+    response.raise_for_status()
+
+    # Reject oversized files before reading the body when we can
+    content_length = response.headers.get("content-length")
+    if content_length and int(content_length) > max_bytes:
+        raise FileTooLargeError(
+            f"Video is {int(content_length) / 1024 / 1024:.0f} MB, "
+            f"larger than the {settings.max_video_size_mb} MB limit"
         )
-        response.raise_for_status()
 
-        # Write the file content
-        local_path.write_bytes(response.content)
+    return await save_stream(response.aiter_bytes(DOWNLOAD_CHUNK_SIZE), local_path)
+
+
+async def save_stream(chunks: AsyncIterable[bytes], local_path: Path) -> Path:
+    """
+    Write a stream of bytes to disk, enforcing the maximum video size.
+
+    Memory stays constant however large the video is, and a partial file is
+    removed if the stream fails or is too large.
+
+    Args:
+        chunks: The video bytes
+        local_path: Where to write them
+
+    Returns:
+        local_path
+    """
+    max_bytes = settings.max_video_size_mb * 1024 * 1024
+    bytes_written = 0
+    started = time.monotonic()
+
+    try:
+        # Stream to disk in fixed-size chunks so memory stays constant
+        f = await asyncio.to_thread(open, local_path, "wb")
+        try:
+            async for chunk in chunks:
+                bytes_written += len(chunk)
+                if bytes_written > max_bytes:
+                    raise FileTooLargeError(
+                        f"Video is larger than the {settings.max_video_size_mb} MB limit"
+                    )
+                await asyncio.to_thread(f.write, chunk)
+        finally:
+            await asyncio.to_thread(f.close)
+    except BaseException:
+        # Don't leave partial downloads behind
+        cleanup_file(local_path)
+        raise
+
+    elapsed = time.monotonic() - started
+    size_mb = bytes_written / 1024 / 1024
+    set_span_attributes(size_bytes=bytes_written)
+    logger.info(
+        f"Saved {local_path.name}: {size_mb:.1f} MB in {elapsed:.2f}s "
+        f"({size_mb / elapsed if elapsed > 0 else 0:.1f} MB/s)"
+    )
 
     return local_path
 
@@ -1,54 +1,55 @@
 """Video analysis service using Gemini AI."""
 
-import asyncio
+import logging
+from dataclasses import dataclass
 from pathlib import Path
 
-from google import genai
 from google.genai import types
 
 from app.config import settings
-from app.models.video_review import VideoReview
-from app.prompts.video_review import get_video_review_prompt
+from app.core.gemini import client, estimate_text_tokens, gemini_limiter, generate_content
+from app.core.metrics import track_stage
+from app.core.rate_limiter import Priority
+from app.core.tracing import set_span_attributes, traced
+from app.models.video_review import VideoReview, VideoScreening
+from app.prompts.video_review import (
+    VIDEO_REVIEW_PROMPT_VERSION,
+    get_caption_block,
+    get_video_review_prefix,
+)
+from app.prompts.video_screening import get_video_screening_prompt
+from app.services.analysis_cache import analysis_cache, analysis_cache_key, hash_file
+from app.services.file_poller import file_state_poller
+from app.services.prompt_cache import generate_with_cached_prompt
+from app.services.slack_files import cleanup_file
+from app.services.video_preprocessing import preprocess_video
 
-# Initialize Gemini client
-client = genai.Client(api_key=settings.gemini_api_key)
+logger = logging.getLogger(__name__)
 
 
-async def analyze_video(video_path: Path, caption: str | None = None) -> VideoReview:
-    """
-    Analyze a video using Gemini's vision capabilities with structured output.
-
-    Args:
-        video_path: Path to the video file
-        caption: Optional planned caption for the post
-
-    Returns:
-        VideoReview object with structured analysis results
-    """
-    # Upload the video file to Gemini
-    video_file = await asyncio.to_thread(
-        client.files.upload,
-        file=video_path,
+def estimate_review_tokens(prompt: str, duration_seconds: float | None = None) -> int:
+    """Estimate the total token cost of a video review request."""
+    seconds = duration_seconds or settings.gemini_default_video_seconds
+    return (
+        int(seconds * settings.gemini_video_tokens_per_second)
+        + estimate_text_tokens(prompt)
+        + settings.gemini_review_output_tokens
     )
 
-    # Wait for video processing to complete
-    while video_file.state == "PROCESSING":
-        await asyncio.sleep(2)
-        video_file = await asyncio.to_thread(
-            client.files.get,
-            name=video_file.name,
-        )
-
-    if video_file.state == "FAILED":
-        raise RuntimeError(f"Video processing failed: {video_file.name}")
-
-    # Get the appropriate prompt based on whether caption is provided
-    prompt = get_video_review_prompt(caption)
 
-    # Generate content with structured output
-    response = await asyncio.to_thread(
-        client.models.generate_content,
-        model=settings.gemini_model,
+async def _screen_video(
+    video_file: types.File,
+    caption: str | None,
+    priority: Priority,
+    duration_seconds: float | None,
+) -> VideoScreening:
+    """Run the cheap first-pass screening on an already-uploaded video."""
+    prompt = get_video_screening_prompt(caption)
+    response = await generate_content(
+        priority=priority,
+        # Low media resolution uses a fraction of the per-second video tokens
+        estimated_tokens=estimate_review_tokens(prompt, duration_seconds) // 4,
+        model=settings.screening_model,
         contents=[
             types.Content(
                 parts=[
@@ -62,15 +63,238 @@ async def analyze_video(video_path: Path, caption: str | None = None) -> VideoRe
         ],
         config=types.GenerateContentConfig(
             response_mime_type="application/json",
-            response_schema=VideoReview,
+            response_schema=VideoScreening,
+            media_resolution=types.MediaResolution.MEDIA_RESOLUTION_LOW,
         ),
     )
+    return VideoScreening.model_validate_json(response.text)
+
 
-    # Clean up the uploaded file
-    await asyncio.to_thread(
-        client.files.delete,
-        name=video_file.name,
+def _is_clear_reject(screening: VideoScreening) -> bool:
+    """Whether a screening result is confidently far enough below the threshold."""
+    return (
+        screening.confidence >= settings.screening_min_confidence
+        and screening.overall_score < settings.score_threshold - settings.screening_margin
     )
 
+
+@dataclass
+class UploadedVideo:
+    """A video uploaded to Gemini, plus what we know about it."""
+
+    file: types.File
+    duration_seconds: float | None = None
+
+
+async def get_cached_review(
+    video_path: Path,
+    caption: str | None = None,
+    video_sha256: str | None = None,
+) -> tuple[str | None, VideoReview | None]:
+    """
+    Hash a video and look up a previous review of the same bytes and caption.
+
+    Args:
+        video_path: Path to the video file
+        caption: Optional planned caption for the post
+        video_sha256: The video's sha256, if the caller already computed it
+
+    Returns:
+        The video's sha256 (None when caching is disabled) and the cached review
+    """
+    if not settings.analysis_cache_enabled:
+        return None, None
+
+    video_sha256 = video_sha256 or await hash_file(video_path)
+    cached = await analysis_cache.get(
+        analysis_cache_key(video_sha256, settings.gemini_model, VIDEO_REVIEW_PROMPT_VERSION, caption)
+    )
+    if cached:
+        logger.info(f"Analysis cache hit for video {video_sha256[:12]}")
+    return video_sha256, cached
+
+
+async def upload_video(video_path: Path, keep_original: bool = True) -> UploadedVideo:
+    """
+    Pre-process (when enabled) and upload a video to Gemini.
+
+    Args:
+        video_path: Path to the video file
+        keep_original: Keep video_path on disk if it is replaced by a smaller
+            transcoded copy
+
+    Returns:
+        The uploaded Gemini file and the video duration, if known
+    """
+    # Optionally shrink the video locally before it is uploaded
+    with track_stage("video", "preprocess"):
+        prepared = await preprocess_video(video_path, keep_original=keep_original)
+
+    try:
+        with track_stage(
+            "video",
+            "upload",
+            size_bytes=prepared.path.stat().st_size,
+            transcoded=prepared.transcoded,
+        ):
+            async with gemini_limiter.upload():
+                video_file = await client.aio.files.upload(file=prepared.path)
+    finally:
+        if prepared.transcoded:
+            cleanup_file(prepared.path)
+
+    return UploadedVideo(file=video_file, duration_seconds=prepared.duration_seconds)
+
+
+async def get_uploaded_video(name: str, duration_seconds: float | None = None) -> UploadedVideo:
+    """Look up a video uploaded earlier (e.g. before a restart) by its Gemini file name."""
+    async with gemini_limiter.metadata():
+        video_file = await client.aio.files.get(name=name)
+    return UploadedVideo(file=video_file, duration_seconds=duration_seconds)
+
+
+async def delete_uploaded_video(name: str) -> None:
+    """Delete an uploaded video from Gemini, logging rather than raising on failure."""
+    try:
+        async with gemini_limiter.metadata():
+            await client.aio.files.delete(name=name)
+    except Exception as e:
+        logger.warning(f"Failed to delete Gemini file {name}: {e}")
+
+
+async def review_uploaded_video(
+    uploaded: UploadedVideo,
+    caption: str | None = None,
+    priority: Priority = Priority.REVIEW,
+    video_sha256: str | None = None,
+) -> VideoReview | VideoScreening:
+    """
+    Review a video that is already uploaded to Gemini.
+
+    The Gemini file is not deleted here; callers own its lifetime.
+
+    Args:
+        uploaded: The uploaded video
+        caption: Optional planned caption for the post
+        priority: Scheduling class for the Gemini request
+        video_sha256: Content hash; when given, the review is cached under it
+
+    Returns:
+        VideoReview with the full analysis, or VideoScreening for clear rejects
+    """
+    # Wait for video processing to complete
+    with track_stage("video", "gemini_processing", file=uploaded.file.name):
+        video_file = await file_state_poller.wait_until_processed(
+            uploaded.file, duration_seconds=uploaded.duration_seconds
+        )
+
+    if video_file.state == "FAILED":
+        raise RuntimeError(f"Video processing failed: {video_file.name}")
+
+    # Cheap first pass: clear rejects don't need the full review
+    if settings.screening_enabled:
+        try:
+            with track_stage("video", "screening", model=settings.screening_model):
+                screening = await _screen_video(
+                    video_file, caption, priority, uploaded.duration_seconds
+                )
+        except Exception as e:
+            # Screening is an optimization; fall through to the full review
+            logger.warning(f"Screening failed, running full review: {e}")
+            screening = None
+
+        if screening:
+            logger.info(
+                f"Screening score {screening.overall_score} "
+                f"(confidence {screening.confidence:.2f})"
+            )
+            if _is_clear_reject(screening):
+                return screening
+
+    # The static prompt prefix is served from a Gemini cached context when
+    # enabled; only the video and the caption block are sent per call
+    has_caption = bool(caption and caption.strip())
+    static_prompt = get_video_review_prefix(has_caption)
+    caption_block = get_caption_block(caption)
+
+    # Generate content with structured output
+    with track_stage("video", "generate", model=settings.gemini_model):
+        response = await generate_with_cached_prompt(
+            variant="video-review-caption" if has_caption else "video-review",
+            version=VIDEO_REVIEW_PROMPT_VERSION,
+            static_text=static_prompt,
+            dynamic_text=caption_block,
+            media_parts=[
+                types.Part.from_uri(
+                    file_uri=video_file.uri,
+                    mime_type=video_file.mime_type,
+                ),
+            ],
+            priority=priority,
+            estimated_tokens=estimate_review_tokens(
+                static_prompt + caption_block, uploaded.duration_seconds
+            ),
+            model=settings.gemini_model,
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=VideoReview,
+            ),
+        )
+
     # Parse and validate the structured response
-    return VideoReview.model_validate_json(response.text)
+    review = VideoReview.model_validate_json(response.text)
+
+    if video_sha256:
+        await analysis_cache.put(
+            analysis_cache_key(
+                video_sha256, settings.gemini_model, VIDEO_REVIEW_PROMPT_VERSION, caption
+            ),
+            review,
+            video_sha256=video_sha256,
+            model=settings.gemini_model,
+            prompt_version=VIDEO_REVIEW_PROMPT_VERSION,
+        )
+
+    return review
+
+
+@traced("analyze_video")
+async def analyze_video(
+    video_path: Path,
+    caption: str | None = None,
+    priority: Priority = Priority.REVIEW,
+    keep_original: bool = True,
+    video_sha256: str | None = None,
+) -> VideoReview | VideoScreening:
+    """
+    Analyze a video using Gemini's vision capabilities with structured output.
+
+    When screening is enabled, a cheaper model first produces a rough score.
+    Videos it confidently places more than `screening_margin` points below
+    the approval threshold get that short review; everything else gets the
+    full VideoReview.
+
+    Args:
+        video_path: Path to the video file
+        caption: Optional planned caption for the post
+        priority: Scheduling class for the Gemini request
+        keep_original: Keep video_path on disk if it is replaced by a smaller
+            transcoded copy (set False when the caller would delete it anyway)
+        video_sha256: The video's sha256, if the caller already computed it
+
+    Returns:
+        VideoReview with the full analysis, or VideoScreening for clear rejects
+    """
+    set_span_attributes(size_bytes=video_path.stat().st_size, model=settings.gemini_model)
+
+    # Re-posts of the same file with the same caption are answered from cache
+    video_sha256, cached = await get_cached_review(video_path, caption, video_sha256)
+    if cached:
+        return cached
+
+    uploaded = await upload_video(video_path, keep_original=keep_original)
+    try:
+        return await review_uploaded_video(uploaded, caption, priority, video_sha256)
+    finally:
+        # Clean up the uploaded file, even if processing or generation failed
+        await delete_uploaded_video(uploaded.file.name)
@@ -0,0 +1,244 @@
+"""Local video pre-processing before upload to Gemini.
+
+Phone uploads are often 4K/60fps HEVC files of hundreds of MB, far more than
+the review needs. When enabled, videos are transcoded with ffmpeg to a
+smaller target profile (e.g. 720p, reduced fps, mono AAC) in a process pool,
+which cuts upload time, Gemini processing time and video token cost.
+"""
+
+import asyncio
+import json
+import logging
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.config import settings
+from app.services.slack_files import cleanup_file
+
+logger = logging.getLogger(__name__)
+
+# Process pool for ffmpeg jobs, created on first use
+_executor: ProcessPoolExecutor | None = None
+
+# Whether ffmpeg was found, checked once by check_preprocessing()
+_ffmpeg_available: bool | None = None
+
+
+@dataclass
+class PreprocessedVideo:
+    """Result of pre-processing: the file to upload and what we learned about it."""
+
+    path: Path
+    duration_seconds: float | None = None
+    transcoded: bool = False
+
+
+def _parse_frame_rate(rate: str | None) -> float | None:
+    """Parse an ffprobe frame rate such as "30000/1001" ("0/0" when unknown)."""
+    try:
+        num, _, den = (rate or "").partition("/")
+        value = float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return value or None
+
+
+def _probe_video(ffprobe_path: str, video_path: str) -> tuple[float | None, float | None]:
+    """
+    Read the container duration and video frame rate with ffprobe (runs in a
+    worker process).
+
+    Returns:
+        Duration in seconds and frames per second, each None if unknown
+    """
+    try:
+        result = subprocess.run(
+            [
+                ffprobe_path,
+                "-v", "error",
+                "-select_streams", "v:0",
+                "-show_entries", "format=duration:stream=avg_frame_rate,r_frame_rate",
+                "-of", "json",
+                video_path,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None, None
+    if result.returncode != 0:
+        return None, None
+    try:
+        info = json.loads(result.stdout)
+    except json.JSONDecodeError:
+        return None, None
+
+    try:
+        duration = float(info["format"]["duration"])
+    except (KeyError, ValueError):
+        duration = None
+
+    stream = (info.get("streams") or [{}])[0]
+    # The average rate is right for variable frame rate phone footage
+    fps = _parse_frame_rate(stream.get("avg_frame_rate")) or _parse_frame_rate(
+        stream.get("r_frame_rate")
+    )
+    return duration, fps
+
+
+def _transcode(
+    ffmpeg_path: str,
+    ffprobe_path: str,
+    source: str,
+    target: str,
+    max_height: int,
+    fps: int,
+    crf: int,
+    audio_bitrate: str,
+    timeout: float,
+) -> float | None:
+    """
+    Transcode a video to the target profile (runs in a worker process).
+
+    Returns:
+        Duration of the source video in seconds, if it could be probed
+
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg fails
+        subprocess.TimeoutExpired: If ffmpeg exceeds the timeout
+    """
+    duration, source_fps = _probe_video(ffprobe_path, source)
+    # Cap the frame rate; never upsample a low-fps video with duplicate frames
+    frame_rate = [] if source_fps is not None and source_fps <= fps else ["-r", str(fps)]
+    subprocess.run(
+        [
+            ffmpeg_path,
+            "-y",
+            "-loglevel", "error",
+            "-i", source,
+            # Downscale only; never upscale smaller videos
+            "-vf", f"scale=-2:'min({max_height},ih)'",
+            *frame_rate,
+            "-c:v", "libx264",
+            "-preset", "veryfast",
+            "-crf", str(crf),
+            "-c:a", "aac",
+            "-ac", "1",
+            "-b:a", audio_bitrate,
+            "-movflags", "+faststart",
+            target,
+        ],
+        check=True,
+        capture_output=True,
+        timeout=timeout,
+    )
+    return duration
+
+
+def check_preprocessing() -> bool:
+    """
+    Check once whether videos can be pre-processed, warning if not.
+
+    Called at startup so a missing ffmpeg is reported once rather than
+    silently skipped for every video.
+
+    Returns:
+        Whether videos will be transcoded before upload
+    """
+    global _ffmpeg_available
+    if not settings.video_preprocess_enabled:
+        return False
+    if _ffmpeg_available is None:
+        _ffmpeg_available = shutil.which(settings.ffmpeg_path) is not None
+        if not _ffmpeg_available:
+            logger.warning(
+                f"VIDEO_PREPROCESS_ENABLED is set but ffmpeg was not found at "
+                f"'{settings.ffmpeg_path}'; videos will be uploaded as they are"
+            )
+        elif shutil.which(settings.ffprobe_path) is None:
+            logger.warning(
+                f"ffprobe was not found at '{settings.ffprobe_path}'; video durations "
+                "and frame rates will be unknown"
+            )
+    return _ffmpeg_available
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.video_preprocess_workers)
+    return _executor
+
+
+def shutdown_preprocessing() -> None:
+    """Shut down the ffmpeg process pool."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def preprocess_video(video_path: Path, keep_original: bool = True) -> PreprocessedVideo:
+    """
+    Shrink a video to the configured target profile before upload.
+
+    Falls back to the original file if pre-processing is disabled, ffmpeg is
+    unavailable, transcoding fails, or the result would not be smaller.
+
+    Args:
+        video_path: Path to the downloaded video
+        keep_original: Keep the source file even when transcoding succeeds
+
+    Returns:
+        The file to upload, and its duration when known
+    """
+    if not check_preprocessing():
+        return PreprocessedVideo(path=video_path)
+
+    target = video_path.with_name(
+        f"{video_path.stem}_{settings.video_preprocess_max_height}p.mp4"
+    )
+    loop = asyncio.get_running_loop()
+
+    try:
+        duration = await loop.run_in_executor(
+            _get_executor(),
+            _transcode,
+            settings.ffmpeg_path,
+            settings.ffprobe_path,
+            str(video_path),
+            str(target),
+            settings.video_preprocess_max_height,
+            settings.video_preprocess_fps,
+            settings.video_preprocess_crf,
+            settings.video_preprocess_audio_bitrate,
+            settings.video_preprocess_timeout,
+        )
+    except Exception as e:
+        stderr = getattr(e, "stderr", b"") or b""
+        logger.warning(
+            f"Transcoding {video_path.name} failed, uploading original: {e} "
+            f"{stderr.decode(errors='replace')[-500:]}"
+        )
+        cleanup_file(target)
+        return PreprocessedVideo(path=video_path)
+
+    original_size = video_path.stat().st_size
+    new_size = target.stat().st_size
+    if new_size >= original_size:
+        logger.info(f"Transcoded {video_path.name} is not smaller; uploading original")
+        cleanup_file(target)
+        return PreprocessedVideo(path=video_path, duration_seconds=duration)
+
+    logger.info(
+        f"Transcoded {video_path.name}: {original_size / 1024 / 1024:.1f} MB -> "
+        f"{new_size / 1024 / 1024:.1f} MB"
+    )
+    if not keep_original:
+        cleanup_file(video_path)
+
+    return PreprocessedVideo(path=target, duration_seconds=duration, transcoded=True)
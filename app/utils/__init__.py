@@ -1,6 +1,5 @@
 """Utility functions."""
 
 from app.utils.score_parser import extract_score, extract_virality_tier, is_approved
-from app.utils.slack_formatter import markdown_to_slack
 
-__all__ = ["extract_score", "extract_virality_tier", "is_approved", "markdown_to_slack"]
+__all__ = ["extract_score", "extract_virality_tier", "is_approved"]
@@ -0,0 +1,71 @@
+"""Bounded in-memory cache with per-entry time-to-live."""
+
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    LRU cache that also expires entries after a fixed number of seconds.
+
+    Entries are evicted least-recently-used first once `max_entries` is
+    reached. Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Insert or replace a value, evicting the oldest entries if full."""
+        self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def add(self, key: K, value: V) -> bool:
+        """
+        Insert a value only if the key is not already present.
+
+        Returns:
+            True if the value was inserted, False if a live entry already existed
+        """
+        if key in self:
+            return False
+        self.set(key, value)
+        return True
+
+    def pop(self, key: K) -> V | None:
+        """Remove and return a value, or None if missing or expired."""
+        value = self.get(key)
+        self._data.pop(key, None)
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
@@ -0,0 +1 @@
+"""Offline load testing against local stand-ins for Slack and Gemini."""
@@ -0,0 +1,302 @@
+"""Stand-in for the Gemini API surface the app uses.
+
+Implements resumable file uploads, file status/delete, cached contents and
+generateContent closely enough for the google-genai client. Uploaded files
+stay PROCESSING for a configurable time, generation takes a configurable
+time and can fail at a configurable rate, and responses are canned
+VideoReview / VideoScreening / EngagementCommentSet JSON.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import time
+from dataclasses import dataclass, field
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+from app.models import (
+    EngagementComment,
+    EngagementCommentSet,
+    PlatformComments,
+    VideoReview,
+    VideoScreening,
+)
+
+
+@dataclass
+class GeminiBehavior:
+    """How the fake Gemini behaves."""
+
+    upload_delay: float = 0.5  # Seconds to accept an upload
+    processing_seconds: float = 5.0  # Seconds an uploaded file stays PROCESSING
+    generate_delay: float = 3.0  # Mean generateContent latency in seconds
+    generate_jitter: float = 0.3  # Latency varies by +/- this fraction
+    error_rate: float = 0.0  # Fraction of generateContent calls failing with 503
+    quota_error_rate: float = 0.0  # Fraction of generateContent calls failing with 429
+    approve_rate: float = 0.5  # Fraction of videos scored above the threshold
+    score_threshold: int = 80
+    review_json: str | None = None  # Canned VideoReview JSON used for every review
+
+
+@dataclass
+class _StoredFile:
+    name: str
+    mime_type: str
+    size_bytes: int
+    ready_at: float
+
+
+@dataclass
+class FakeGeminiStats:
+    """What the fake was asked to do, for the benchmark report."""
+
+    uploads: int = 0
+    status_checks: int = 0
+    deletes: int = 0
+    generate_calls: int = 0
+    generate_errors: int = 0
+    by_kind: dict[str, int] = field(default_factory=dict)
+
+
+def canned_review(approved: bool, threshold: int = 80) -> VideoReview:
+    """A plausible VideoReview that lands above or below the threshold."""
+    scores = (27, 14, 18, 13, 9, 9, 5) if approved else (12, 7, 9, 6, 6, 4, 2)
+    total = sum(scores)
+    return VideoReview(
+        target_persona="The Overwhelmed Student: juggling deadlines and looking for shortcuts",
+        hook_score=scores[0],
+        pacing_score=scores[1],
+        narrative_score=scores[2],
+        feature_demo_score=scores[3],
+        technical_score=scores[4],
+        trend_score=scores[5],
+        shareability_score=scores[6],
+        features_shown=["Flashcards", "Study planner"],
+        focus_rating="FOCUSED" if approved else "SCATTERED",
+        overall_score=max(total, threshold) if approved else min(total, threshold - 20),
+        virality_tier="HIGH" if approved else "LOW",
+        key_strengths=["Strong opening line", "Clear before/after"],
+        areas_for_improvement=["Tighter ending", "Show the result sooner"],
+        recommendations="Cut the intro by a second and end on the result.",
+        caption_suggestions=["POV: finals week but you're prepared"],
+        alternative_hooks=[
+            "I stopped cramming and this happened",
+            "The study trick nobody told me about",
+        ],
+        hook_analysis="Opens on a relatable problem within the first second.",
+        pacing_analysis="Quick cuts keep the energy up.",
+        narrative_analysis="Problem, discovery and payoff are all present.",
+        feature_analysis="Features are shown in context rather than listed.",
+        technical_analysis="Well lit, clear audio, vertical framing.",
+        trend_analysis="Uses a current audio trend.",
+        shareability_analysis="Students are likely to tag friends.",
+    )
+
+
+def canned_screening(approved: bool, threshold: int = 80) -> VideoScreening:
+    """A screening result; rejected videos are confident clear rejects."""
+    return VideoScreening(
+        overall_score=threshold + 5 if approved else max(threshold - 45, 0),
+        confidence=0.6 if approved else 0.9,
+        virality_tier="HIGH" if approved else "LOW",
+        summary="A study-tips video with a clear hook." if approved else "Unfocused screen recording.",
+        top_issues=["Slow start"],
+        quick_tips=["Open on the result"],
+    )
+
+
+def canned_comments() -> EngagementCommentSet:
+    """Comments for both platforms; the app keeps the ones it asked for."""
+    comments = [
+        EngagementComment(
+            persona=persona,
+            tone_tags=["relatable"],
+            comment=f"This is exactly what I needed this week ({persona.lower()})",
+            reply_options=["Glad it helped!", "Let me know how it goes"],
+        )
+        for persona in ("The Overwhelmed Student", "The Curious Skeptic", "The Planner")
+    ]
+    return EngagementCommentSet(
+        platforms=[
+            PlatformComments(platform=platform, comments=comments, best_posting_times="Evenings")
+            for platform in ("instagram", "tiktok")
+        ]
+    )
+
+
+def _error(code: int, status: str, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=code,
+        content={"error": {"code": code, "message": message, "status": status}},
+    )
+
+
+def create_fake_gemini(behavior: GeminiBehavior, base_url: str) -> tuple[FastAPI, FakeGeminiStats]:
+    """
+    Build the fake Gemini app.
+
+    Args:
+        behavior: Delays, error rates and canned responses
+        base_url: URL the app is served at (used in upload and file URIs)
+
+    Returns:
+        The ASGI app and the stats it records
+    """
+    app = FastAPI()
+    stats = FakeGeminiStats()
+    files: dict[str, _StoredFile] = {}
+    sessions: dict[str, dict] = {}
+    caches: dict[str, dict] = {}
+    # The screening and the full review of one file must agree
+    approvals: dict[str, bool] = {}
+    ids = itertools.count(1)
+
+    def file_json(stored: _StoredFile) -> dict:
+        return {
+            "name": stored.name,
+            "mimeType": stored.mime_type,
+            "sizeBytes": str(stored.size_bytes),
+            "uri": f"{base_url}/v1beta/{stored.name}",
+            "state": "ACTIVE" if time.monotonic() >= stored.ready_at else "PROCESSING",
+        }
+
+    @app.post("/upload/v1beta/files")
+    async def start_upload(request: Request) -> Response:
+        body = await request.json() if await request.body() else {}
+        session_id = str(next(ids))
+        sessions[session_id] = {
+            "mime_type": body.get("file", {}).get("mimeType")
+            or request.headers.get("x-goog-upload-header-content-type", "video/mp4"),
+            "size": 0,
+        }
+        return JSONResponse(
+            content={},
+            headers={"X-Goog-Upload-URL": f"{base_url}/upload/session/{session_id}"},
+        )
+
+    @app.post("/upload/session/{session_id}")
+    async def upload_chunk(session_id: str, request: Request) -> Response:
+        session = sessions[session_id]
+        session["size"] += len(await request.body())
+        if "finalize" not in request.headers.get("x-goog-upload-command", ""):
+            return Response(headers={"X-Goog-Upload-Status": "active"})
+
+        del sessions[session_id]
+        await asyncio.sleep(behavior.upload_delay)
+        stored = _StoredFile(
+            name=f"files/bench-{session_id}",
+            mime_type=session["mime_type"],
+            size_bytes=session["size"],
+            ready_at=time.monotonic() + behavior.processing_seconds,
+        )
+        files[stored.name] = stored
+        stats.uploads += 1
+        return JSONResponse(
+            content={"file": file_json(stored)}, headers={"X-Goog-Upload-Status": "final"}
+        )
+
+    @app.get("/v1beta/files/{file_id}")
+    async def get_file(file_id: str) -> Response:
+        stats.status_checks += 1
+        stored = files.get(f"files/{file_id}")
+        if stored is None:
+            return _error(404, "NOT_FOUND", f"File files/{file_id} not found")
+        return JSONResponse(content=file_json(stored))
+
+    @app.delete("/v1beta/files/{file_id}")
+    async def delete_file(file_id: str) -> Response:
+        stats.deletes += 1
+        files.pop(f"files/{file_id}", None)
+        return JSONResponse(content={})
+
+    @app.post("/v1beta/cachedContents")
+    async def create_cache(request: Request) -> Response:
+        body = await request.json()
+        cached = {
+            "name": f"cachedContents/bench-{next(ids)}",
+            "displayName": body.get("displayName"),
+            "model": body.get("model"),
+        }
+        caches[cached["name"]] = cached
+        return JSONResponse(content=cached)
+
+    @app.get("/v1beta/cachedContents")
+    async def list_caches() -> Response:
+        return JSONResponse(content={"cachedContents": list(caches.values())})
+
+    @app.patch("/v1beta/cachedContents/{cache_id}")
+    async def update_cache(cache_id: str) -> Response:
+        cached = caches.get(f"cachedContents/{cache_id}")
+        if cached is None:
+            return _error(404, "NOT_FOUND", f"cachedContents/{cache_id} not found")
+        return JSONResponse(content=cached)
+
+    @app.post("/v1beta/models/{model_action}")
+    async def generate_content(model_action: str, request: Request) -> Response:
+        model, _, action = model_action.partition(":")
+        if action != "generateContent":
+            return _error(404, "NOT_FOUND", f"Unsupported action {action}")
+
+        raw = await request.body()
+        stats.generate_calls += 1
+        jitter = random.uniform(1 - behavior.generate_jitter, 1 + behavior.generate_jitter)
+        await asyncio.sleep(behavior.generate_delay * jitter)
+
+        roll = random.random()
+        if roll < behavior.quota_error_rate:
+            stats.generate_errors += 1
+            return _error(429, "RESOURCE_EXHAUSTED", "Quota exceeded (fake)")
+        if roll < behavior.quota_error_rate + behavior.error_rate:
+            stats.generate_errors += 1
+            return _error(503, "UNAVAILABLE", "The model is overloaded (fake)")
+
+        # Tell the request kinds apart by the response schema they ask for
+        text = raw.decode("utf-8", errors="replace")
+        file_uri = next(
+            (
+                part["fileData"]["fileUri"]
+                for content in json.loads(raw).get("contents", [])
+                for part in content.get("parts", [])
+                if "fileData" in part
+            ),
+            None,
+        )
+        if file_uri is not None and file_uri not in approvals:
+            approvals[file_uri] = random.random() < behavior.approve_rate
+        approved = approvals.get(file_uri, False)
+
+        if "best_posting_times" in text:
+            kind, payload = "comments", canned_comments().model_dump_json()
+        elif "quick_tips" in text:
+            kind = "screening"
+            payload = canned_screening(approved, behavior.score_threshold).model_dump_json()
+        elif behavior.review_json is not None:
+            kind, payload = "review", behavior.review_json
+        else:
+            kind = "review"
+            payload = canned_review(approved, behavior.score_threshold).model_dump_json()
+        stats.by_kind[kind] = stats.by_kind.get(kind, 0) + 1
+
+        prompt_tokens = len(raw) // 4 + (15000 if file_uri else 0)
+        output_tokens = len(payload) // 4
+        return JSONResponse(
+            content={
+                "candidates": [
+                    {
+                        "content": {"role": "model", "parts": [{"text": payload}]},
+                        "finishReason": "STOP",
+                    }
+                ],
+                "usageMetadata": {
+                    "promptTokenCount": prompt_tokens,
+                    "candidatesTokenCount": output_tokens,
+                    "totalTokenCount": prompt_tokens + output_tokens,
+                },
+                "modelVersion": model,
+            }
+        )
+
+    return app, stats
@@ -0,0 +1,118 @@
+"""Stand-in for the Slack Web API and file host.
+
+Answers the Web API methods the app calls (auth.test, chat.postMessage),
+records every posted message with its arrival time, and serves video
+downloads of a fixed size at `/files/<file_id>/<name>`.
+"""
+
+import asyncio
+import itertools
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from urllib.parse import parse_qs
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+BOT_USER_ID = "UBENCHBOT"
+TEAM_ID = "TBENCH"
+
+# Bytes per chunk of a served download
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class PostedMessage:
+    """A message the app posted."""
+
+    channel: str
+    thread_ts: str | None
+    text: str
+    posted_at: float  # time.monotonic()
+
+
+@dataclass
+class SlackBehavior:
+    """How the fake Slack behaves."""
+
+    post_delay: float = 0.05  # Seconds per chat.postMessage
+    download_delay: float = 0.0  # Seconds before a download starts streaming
+    video_bytes: int = 5 * 1024 * 1024  # Size of every served video
+
+
+def create_fake_slack(
+    behavior: SlackBehavior,
+    on_message: Callable[[PostedMessage], None],
+) -> FastAPI:
+    """
+    Build the fake Slack app.
+
+    Args:
+        behavior: Delays and download size
+        on_message: Called for every chat.postMessage
+
+    Returns:
+        The ASGI app
+    """
+    app = FastAPI()
+    chunk = os.urandom(CHUNK_SIZE)
+    timestamps = itertools.count(1)
+
+    async def _params(request: Request) -> dict:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            return await request.json()
+        # Form-encoded calls; parsed here to avoid needing python-multipart
+        return {k: v[0] for k, v in parse_qs((await request.body()).decode()).items()}
+
+    @app.post("/api/auth.test")
+    async def auth_test() -> Response:
+        return JSONResponse(
+            content={
+                "ok": True,
+                "url": "https://bench.slack.com/",
+                "team": "Bench",
+                "user": "bench-bot",
+                "team_id": TEAM_ID,
+                "user_id": BOT_USER_ID,
+                "bot_id": "BBENCH",
+            }
+        )
+
+    @app.post("/api/chat.postMessage")
+    async def post_message(request: Request) -> Response:
+        params = await _params(request)
+        await asyncio.sleep(behavior.post_delay)
+        ts = f"{time.time():.0f}.{next(timestamps):06d}"
+        on_message(
+            PostedMessage(
+                channel=params.get("channel", ""),
+                thread_ts=params.get("thread_ts"),
+                text=params.get("text", ""),
+                posted_at=time.monotonic(),
+            )
+        )
+        return JSONResponse(content={"ok": True, "channel": params.get("channel"), "ts": ts})
+
+    @app.post("/api/{method}")
+    async def other_method(method: str) -> Response:
+        return JSONResponse(content={"ok": True})
+
+    @app.get("/files/{file_id}/{name}")
+    async def download(file_id: str, name: str) -> Response:
+        await asyncio.sleep(behavior.download_delay)
+
+        async def body():
+            remaining = behavior.video_bytes
+            while remaining > 0:
+                yield chunk[: min(remaining, CHUNK_SIZE)]
+                remaining -= CHUNK_SIZE
+
+        return StreamingResponse(
+            body(),
+            media_type="video/mp4",
+            headers={"Content-Length": str(behavior.video_bytes)},
+        )
+
+    return app
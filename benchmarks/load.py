@@ -0,0 +1,507 @@
+"""Load test the real app against fake Slack and Gemini servers.
+
+Starts the fakes in this process, runs `app.main:api` under uvicorn in a
+subprocess pointed at them (with a throwaway SQLite database and span file),
+replays signed Slack `message` events at a fixed or Poisson rate, answers
+approvals with a thread reply carrying post links, and reports end-to-end
+latency, per-stage span latency, throughput, memory and event loop lag.
+
+Usage:
+    python -m benchmarks.load --messages 50 --rate 2 --video-mb 20
+    python -m benchmarks.load --generate-delay 8 --error-rate 0.05 \\
+        --app-env ANALYSIS_CONCURRENCY=16 --baseline benchmarks/results/before.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import random
+import re
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import uvicorn
+
+from benchmarks.fake_gemini import GeminiBehavior, create_fake_gemini
+from benchmarks.fake_slack import BOT_USER_ID, TEAM_ID, PostedMessage, SlackBehavior, create_fake_slack
+from benchmarks.report import (
+    compare,
+    format_report,
+    histogram_quantile,
+    metric_value,
+    parse_metrics,
+    summarize,
+    summarize_spans,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+REVIEW_CHANNEL = "CBENCHREVIEW"
+APPROVED_CHANNEL = "CBENCHAPPROVED"
+SIGNING_SECRET = "bench-signing-secret"
+SCORE_THRESHOLD = 80
+
+_OVERALL_SCORE = re.compile(r"OVERALL SCORE: (\d+)/100")
+
+
+@dataclass
+class MessageRun:
+    """Progress of one uploaded message through the app."""
+
+    message_ts: str
+    user_id: str
+    videos: int
+    sent_at: float
+    ack_seconds: float | None = None
+    review_seconds: list[float] = field(default_factory=list)
+    errors: int = 0
+    expects_approval: bool = False
+    approved_seconds: float | None = None
+    reply_sent_at: float | None = None
+    reply_seconds: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def reviews_done(self) -> bool:
+        return len(self.review_seconds) + self.errors >= self.videos
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _signed_headers(body: bytes) -> dict[str, str]:
+    timestamp = str(int(time.time()))
+    basestring = f"v0:{timestamp}:".encode() + body
+    signature = hmac.new(SIGNING_SECRET.encode(), basestring, hashlib.sha256).hexdigest()
+    return {
+        "Content-Type": "application/json",
+        "X-Slack-Request-Timestamp": timestamp,
+        "X-Slack-Signature": f"v0={signature}",
+    }
+
+
+def _event_callback(event: dict, event_id: str) -> bytes:
+    return json.dumps(
+        {
+            "token": "bench",
+            "team_id": TEAM_ID,
+            "api_app_id": "ABENCH",
+            "type": "event_callback",
+            "event_id": event_id,
+            "event_time": int(time.time()),
+            "authorizations": [{"team_id": TEAM_ID, "user_id": BOT_USER_ID, "is_bot": True}],
+            "event": event,
+        }
+    ).encode()
+
+
+class LoadRun:
+    """Sends events to the app and tracks what it posts back."""
+
+    def __init__(self, args: argparse.Namespace, app_url: str, slack_url: str) -> None:
+        self.args = args
+        self.app_url = app_url
+        self.slack_url = slack_url
+        self.runs: dict[str, MessageRun] = {}
+        self.ack_failures = 0
+        self.peak_rss = 0.0
+        self._events = 0
+        self._finished = asyncio.Event()
+        self._tasks: set[asyncio.Task] = set()
+        self._client = httpx.AsyncClient(timeout=30.0)
+
+    def on_message(self, message: PostedMessage) -> None:
+        """Fake Slack callback for every chat.postMessage."""
+        run = self.runs.get(message.thread_ts or "")
+        if run is None:
+            return
+        elapsed = message.posted_at - run.sent_at
+        text = message.text
+
+        if text.startswith("*Video Analysis Complete"):
+            run.review_seconds.append(elapsed)
+            score = _OVERALL_SCORE.search(text)
+            if score and int(score.group(1)) >= SCORE_THRESHOLD:
+                run.expects_approval = True
+        elif text.startswith("Sorry, there was an error"):
+            run.errors += 1
+        elif text.startswith("Congratulations!"):
+            run.approved_seconds = elapsed
+            if self.args.reply:
+                self._spawn(self._send_reply(run))
+        elif text.startswith("Your content has been posted") and run.reply_sent_at:
+            run.reply_seconds = message.posted_at - run.reply_sent_at
+        elif text.startswith("Error posting"):
+            run.errors += 1
+            run.reply_seconds = None
+            run.finished_at = message.posted_at
+        self._check_finished(run, message.posted_at)
+
+    def _check_finished(self, run: MessageRun, now: float) -> None:
+        if run.finished_at is None and run.reviews_done:
+            if not run.expects_approval:
+                run.finished_at = now
+            elif run.approved_seconds is not None and (
+                not self.args.reply or run.reply_seconds is not None
+            ):
+                run.finished_at = now
+        if len(self.runs) == self.args.messages and all(
+            r.finished_at is not None for r in self.runs.values()
+        ):
+            self._finished.set()
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _post_event(self, event: dict) -> tuple[bool, float]:
+        self._events += 1
+        body = _event_callback(event, f"EvBench{self._events:08d}")
+        started = time.monotonic()
+        try:
+            response = await self._client.post(
+                f"{self.app_url}/slack/events", content=body, headers=_signed_headers(body)
+            )
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        if not ok:
+            self.ack_failures += 1
+        return ok, time.monotonic() - started
+
+    async def _send_upload(self, index: int) -> None:
+        message_ts = f"{time.time():.0f}.{index:06d}"
+        user_id = f"UCREATOR{index % 20:02d}"
+        files = [
+            {
+                "id": f"FBENCH{index:05d}{n}",
+                "name": f"clip{n}.mp4",
+                "mimetype": "video/mp4",
+                "url_private_download": f"{self.slack_url}/files/FBENCH{index:05d}{n}/clip{n}.mp4",
+            }
+            for n in range(self.args.videos_per_message)
+        ]
+        run = MessageRun(
+            message_ts=message_ts,
+            user_id=user_id,
+            videos=len(files),
+            sent_at=time.monotonic(),
+        )
+        self.runs[message_ts] = run
+        ok, run.ack_seconds = await self._post_event(
+            {
+                "type": "message",
+                "channel": REVIEW_CHANNEL,
+                "user": user_id,
+                "ts": message_ts,
+                "text": "POV: finals week but you're prepared #studytok",
+                "files": files,
+            }
+        )
+        if not ok:
+            run.errors = run.videos
+            self._check_finished(run, time.monotonic())
+
+    async def _send_reply(self, run: MessageRun) -> None:
+        run.reply_sent_at = time.monotonic()
+        ok, _ = await self._post_event(
+            {
+                "type": "message",
+                "channel": REVIEW_CHANNEL,
+                "user": run.user_id,
+                "ts": f"{time.time():.6f}",
+                "thread_ts": run.message_ts,
+                "text": (
+                    "Posted! https://www.instagram.com/reel/Bench123/ "
+                    "https://www.tiktok.com/@bench/video/1234567890"
+                ),
+            }
+        )
+        if not ok:
+            run.errors += 1
+            run.finished_at = time.monotonic()
+
+    async def _scrape(self) -> list[tuple[str, dict[str, str], float]]:
+        response = await self._client.get(f"{self.app_url}/metrics")
+        samples = parse_metrics(response.text)
+        self.peak_rss = max(self.peak_rss, metric_value(samples, "ugc_process_resident_memory_bytes"))
+        return samples
+
+    async def _scrape_periodically(self) -> None:
+        while True:
+            try:
+                await self._scrape()
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(self.args.scrape_interval)
+
+    async def run(self) -> tuple[float, list[tuple[str, dict[str, str], float]]]:
+        """Send every message and wait for the app to finish them. Returns wall time."""
+        scraper = asyncio.create_task(self._scrape_periodically())
+        started = time.monotonic()
+        try:
+            for index in range(self.args.messages):
+                self._spawn(self._send_upload(index))
+                interval = 1 / self.args.rate
+                if self.args.arrival == "poisson":
+                    interval = random.expovariate(self.args.rate)
+                await asyncio.sleep(interval)
+            try:
+                await asyncio.wait_for(self._finished.wait(), timeout=self.args.timeout)
+            except asyncio.TimeoutError:
+                print(f"Timed out after {self.args.timeout}s waiting for the app", file=sys.stderr)
+        finally:
+            scraper.cancel()
+        finished = [r.finished_at for r in self.runs.values() if r.finished_at is not None]
+        wall = (max(finished) if finished else time.monotonic()) - started
+        samples = await self._scrape()
+        await self._client.aclose()
+        return wall, samples
+
+
+async def _serve(app, port: int) -> tuple[uvicorn.Server, asyncio.Task]:
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off")
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+async def _wait_for_health(url: str, process: asyncio.subprocess.Process, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.returncode is not None:
+                raise RuntimeError(f"App exited with status {process.returncode}")
+            try:
+                if (await client.get(f"{url}/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"App did not become healthy within {timeout}s")
+
+
+def _app_env(args: argparse.Namespace, workdir: Path, slack_url: str, gemini_url: str) -> dict:
+    env = {
+        **os.environ,
+        "SLACK_BOT_TOKEN": "xoxb-bench",
+        "SLACK_SIGNING_SECRET": SIGNING_SECRET,
+        "SLACK_API_BASE_URL": f"{slack_url}/api/",
+        "VIDEO_REVIEW_CHANNEL": REVIEW_CHANNEL,
+        "APPROVED_CONTENT_CHANNEL": APPROVED_CHANNEL,
+        "GEMINI_API_KEY": "bench",
+        "GEMINI_BASE_URL": gemini_url,
+        "SCORE_THRESHOLD": str(SCORE_THRESHOLD),
+        "DATABASE_URL": f"sqlite+aiosqlite:///{workdir / 'bench.db'}",
+        "TRACING_ENABLED": "true",
+        "TRACING_JSONL_PATH": str(workdir / "spans.jsonl"),
+        "TRACING_CONSOLE_SAMPLE_RATE": "0",
+        "TRACING_SLOW_SPAN_SECONDS": "0",
+        # Every run must review every video, not answer re-posts from cache
+        "ANALYSIS_CACHE_ENABLED": "false",
+    }
+    for item in args.app_env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    return env
+
+
+async def main(args: argparse.Namespace) -> dict:
+    random.seed(args.seed)
+    workdir = Path(tempfile.mkdtemp(prefix="ugc-bench-"))
+    slack_port, gemini_port, app_port = _free_port(), _free_port(), _free_port()
+    slack_url = f"http://127.0.0.1:{slack_port}"
+    gemini_url = f"http://127.0.0.1:{gemini_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+
+    gemini_app, gemini_stats = create_fake_gemini(
+        GeminiBehavior(
+            upload_delay=args.upload_delay,
+            processing_seconds=args.processing_seconds,
+            generate_delay=args.generate_delay,
+            generate_jitter=args.generate_jitter,
+            error_rate=args.error_rate,
+            quota_error_rate=args.quota_error_rate,
+            approve_rate=args.approve_rate,
+            score_threshold=SCORE_THRESHOLD,
+            review_json=Path(args.review_json).read_text() if args.review_json else None,
+        ),
+        gemini_url,
+    )
+    load = LoadRun(args, app_url, slack_url)
+    slack_app = create_fake_slack(
+        SlackBehavior(
+            post_delay=args.slack_post_delay,
+            video_bytes=int(args.video_mb * 1024 * 1024),
+        ),
+        load.on_message,
+    )
+
+    servers = [await _serve(slack_app, slack_port), await _serve(gemini_app, gemini_port)]
+    env = _app_env(args, workdir, slack_url, gemini_url)
+    # Run without blocking the loop that serves the fake Slack and Gemini
+    migrate = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "alembic", "upgrade", "head",
+        cwd=REPO_ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    stdout, stderr = await migrate.communicate()
+    if migrate.returncode:
+        raise subprocess.CalledProcessError(
+            migrate.returncode, "alembic upgrade head", stdout, stderr
+        )
+
+    log_path = workdir / "app.log"
+    with log_path.open("wb") as log:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "uvicorn", "app.main:api",
+            "--host", "127.0.0.1", "--port", str(app_port), "--log-level", "warning",
+            cwd=REPO_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+        try:
+            await _wait_for_health(app_url, process, timeout=60)
+            print(
+                f"Sending {args.messages} messages at {args.rate}/s "
+                f"({args.videos_per_message} x {args.video_mb} MB videos each)..."
+            )
+            started_at = datetime.now(timezone.utc)
+            wall, samples = await load.run()
+        finally:
+            # A clean shutdown flushes the app's buffered spans
+            if process.returncode is None:
+                process.send_signal(signal.SIGINT)
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=60)
+                except asyncio.TimeoutError:
+                    process.kill()
+            for server, task in servers:
+                server.should_exit = True
+                await task
+
+    runs = list(load.runs.values())
+    completed = [r for r in runs if r.finished_at is not None]
+    reviews = [s for r in runs for s in r.review_seconds]
+    return {
+        "started_at": started_at.isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "wall_seconds": wall,
+        "counts": {
+            "messages_sent": len(runs),
+            "messages_completed": len(completed),
+            "videos_sent": sum(r.videos for r in runs),
+            "reviews_posted": len(reviews),
+            "errors_posted": sum(r.errors for r in runs),
+            "approvals": sum(1 for r in runs if r.approved_seconds is not None),
+            "replies_completed": sum(1 for r in runs if r.reply_seconds is not None),
+            "ack_failures": load.ack_failures,
+        },
+        "throughput": {
+            "videos_per_second": len(reviews) / wall if wall > 0 else 0.0,
+            "messages_per_second": len(completed) / wall if wall > 0 else 0.0,
+        },
+        "latency": {
+            "ack": summarize([r.ack_seconds for r in runs if r.ack_seconds is not None]),
+            "review": summarize(reviews),
+            "message": summarize(
+                [max(r.review_seconds) for r in runs if r.reviews_done and r.review_seconds]
+            ),
+            "approval": summarize([r.approved_seconds for r in runs if r.approved_seconds is not None]),
+            "reply": summarize([r.reply_seconds for r in runs if r.reply_seconds is not None]),
+        },
+        "stages": summarize_spans(workdir / "spans.jsonl"),
+        "process": {
+            "peak_rss_bytes": load.peak_rss or None,
+            "loop_lag_p50": histogram_quantile(samples, "ugc_event_loop_lag_seconds", 0.5),
+            "loop_lag_p99": histogram_quantile(samples, "ugc_event_loop_lag_seconds", 0.99),
+        },
+        "gemini": asdict(gemini_stats),
+        "app_log": str(log_path),
+    }
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    load = parser.add_argument_group("load")
+    load.add_argument("--messages", type=int, default=50, help="Messages with videos to send")
+    load.add_argument("--rate", type=float, default=1.0, help="Messages sent per second")
+    load.add_argument("--arrival", choices=("uniform", "poisson"), default="uniform")
+    load.add_argument("--videos-per-message", type=int, default=1)
+    load.add_argument("--video-mb", type=float, default=5.0, help="Size of each served video")
+    load.add_argument(
+        "--reply",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Answer approvals with a thread reply carrying post links",
+    )
+    load.add_argument("--timeout", type=float, default=600.0, help="Seconds to wait for completion")
+    load.add_argument("--seed", type=int, default=1)
+
+    gemini = parser.add_argument_group("fake Gemini")
+    gemini.add_argument("--upload-delay", type=float, default=0.5)
+    gemini.add_argument("--processing-seconds", type=float, default=5.0)
+    gemini.add_argument("--generate-delay", type=float, default=3.0)
+    gemini.add_argument("--generate-jitter", type=float, default=0.3)
+    gemini.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    gemini.add_argument("--quota-error-rate", type=float, default=0.0, help="Fraction of 429 responses")
+    gemini.add_argument("--approve-rate", type=float, default=0.5)
+    gemini.add_argument("--review-json", help="File with canned VideoReview JSON for every review")
+
+    slack = parser.add_argument_group("fake Slack")
+    slack.add_argument("--slack-post-delay", type=float, default=0.05)
+
+    app = parser.add_argument_group("app")
+    app.add_argument(
+        "--app-env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Extra environment for the app (repeatable)",
+    )
+    app.add_argument("--scrape-interval", type=float, default=1.0, help="Seconds between /metrics scrapes")
+
+    output = parser.add_argument_group("output")
+    output.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>.json)")
+    output.add_argument("--baseline", help="Earlier result file to compare against")
+    return parser.parse_args(argv)
+
+
+def run(argv: list[str] | None = None) -> None:
+    """Command-line entry point."""
+    args = _parse_args(argv)
+    results = asyncio.run(main(args))
+
+    output = Path(
+        args.output
+        or RESULTS_DIR / f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+
+    print(format_report(results))
+    if args.baseline:
+        print("\nCompared with " + args.baseline)
+        for line in compare(results, json.loads(Path(args.baseline).read_text())):
+            print(f"  {line}")
+    print(f"\nResults written to {output} (app log: {results['app_log']})")
+
+
+if __name__ == "__main__":
+    run()
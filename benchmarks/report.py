@@ -0,0 +1,173 @@
+"""Summaries for benchmark runs: percentiles, span stages and scraped metrics."""
+
+import json
+import math
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+# name{labels} value
+_SAMPLE = re.compile(r"^(?P<name>[a-zA-Z_:][\w:]*)(?:\{(?P<labels>[^}]*)\})?\s+(?P<value>\S+)$")
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Linearly interpolated percentile (q in 0-100) of unsorted values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: list[float]) -> dict[str, float | int | None]:
+    """Count, mean, p50/p95/p99 and max of latencies in seconds."""
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else None,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else None,
+    }
+
+
+def summarize_spans(path: Path) -> dict[str, dict[str, Any]]:
+    """
+    Per-span-name latency summary from a tracing JSONL file.
+
+    Args:
+        path: File written by the app's JSONL span exporter
+
+    Returns:
+        Summary (plus error count) for each span name, slowest p95 first
+    """
+    durations: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            span = json.loads(line)
+            name = span["name"]
+            durations[name].append(
+                (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e9
+            )
+            if span.get("status", {}).get("code") == 2:
+                errors[name] += 1
+
+    stages = {name: {**summarize(values), "errors": errors[name]} for name, values in durations.items()}
+    return dict(sorted(stages.items(), key=lambda item: -(item[1]["p95"] or 0)))
+
+
+def parse_metrics(text: str) -> list[tuple[str, dict[str, str], float]]:
+    """Parse Prometheus text exposition into (name, labels, value) samples."""
+    samples = []
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = _SAMPLE.match(line)
+        if not match:
+            continue
+        labels = dict(_LABEL.findall(match["labels"] or ""))
+        samples.append((match["name"], labels, float(match["value"])))
+    return samples
+
+
+def metric_value(samples: list[tuple[str, dict[str, str], float]], name: str) -> float:
+    """Sum of every sample of a metric (across labels)."""
+    return sum(value for sample, _, value in samples if sample == name)
+
+
+def histogram_quantile(
+    samples: list[tuple[str, dict[str, str], float]], name: str, q: float
+) -> float | None:
+    """Estimate a quantile (0-1) from a histogram's buckets, like PromQL does."""
+    buckets: dict[float, float] = defaultdict(float)
+    for sample, labels, value in samples:
+        if sample == f"{name}_bucket":
+            buckets[float(labels["le"].replace("+Inf", "inf"))] += value
+    if not buckets:
+        return None
+    bounds = sorted(buckets)
+    total = buckets[bounds[-1]]
+    if total == 0:
+        return None
+
+    target = q * total
+    previous_bound, previous_count = 0.0, 0.0
+    for bound in bounds:
+        count = buckets[bound]
+        if count >= target:
+            if math.isinf(bound):
+                return previous_bound
+            if count == previous_count:
+                return bound
+            return previous_bound + (bound - previous_bound) * (target - previous_count) / (
+                count - previous_count
+            )
+        previous_bound, previous_count = bound, count
+    return bounds[-2] if len(bounds) > 1 else None
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """Lines comparing the headline numbers of two result files."""
+    lines = []
+    for section, key in (
+        ("throughput", "videos_per_second"),
+        ("throughput", "messages_per_second"),
+        ("latency", "ack"),
+        ("latency", "review"),
+        ("latency", "message"),
+        ("latency", "reply"),
+        ("process", "peak_rss_bytes"),
+        ("process", "loop_lag_p99"),
+    ):
+        now = current.get(section, {}).get(key)
+        before = baseline.get(section, {}).get(key)
+        if isinstance(now, dict):
+            now, before = now.get("p95"), (before or {}).get("p95")
+            key = f"{key} p95"
+        if now is None or before is None:
+            continue
+        change = f"{(now - before) / before * 100:+.1f}%" if before else "n/a"
+        lines.append(f"{section}.{key}: {before:.4g} -> {now:.4g} ({change})")
+    return lines
+
+
+def format_report(results: dict[str, Any]) -> str:
+    """Human-readable summary of a result file."""
+
+    def ms(value: float | None) -> str:
+        return "-" if value is None else f"{value * 1000:.0f}ms"
+
+    lines = [
+        f"Messages: {results['counts']['messages_completed']}/{results['counts']['messages_sent']} "
+        f"completed, {results['counts']['errors_posted']} error replies, "
+        f"{results['counts']['ack_failures']} failed acks",
+        f"Throughput: {results['throughput']['videos_per_second']:.2f} videos/s, "
+        f"{results['throughput']['messages_per_second']:.2f} messages/s",
+        "",
+        f"{'latency':<28}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}",
+    ]
+    rows = [(f"e2e.{name}", stats) for name, stats in results["latency"].items()]
+    rows += list(results["stages"].items())
+    for name, stats in rows:
+        lines.append(
+            f"{name[:27]:<28}{stats['count']:>7}{ms(stats['p50']):>10}"
+            f"{ms(stats['p95']):>10}{ms(stats['p99']):>10}{ms(stats['max']):>10}"
+        )
+
+    process = results["process"]
+    peak = process.get("peak_rss_bytes")
+    lines += [
+        "",
+        f"Peak RSS: {peak / 1024 / 1024:.0f} MB" if peak else "Peak RSS: -",
+        f"Event loop lag: p50 {ms(process.get('loop_lag_p50'))}, "
+        f"p99 {ms(process.get('loop_lag_p99'))}",
+    ]
+    return "\n".join(lines)
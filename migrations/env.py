@@ -11,7 +11,13 @@ from sqlmodel import SQLModel
 from alembic import context
 
 # Import all models so SQLModel.metadata is fully populated
-from app.models import pending_approval  # noqa: F401
+from app.models import (  # noqa: F401
+    analysis_cache_entry,
+    analysis_job,
+    pending_approval,
+    processed_event,
+    review_history,
+)
 from app.core.database import get_database_url
 
 # Alembic Config object
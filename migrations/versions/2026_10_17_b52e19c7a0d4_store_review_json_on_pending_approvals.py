@@ -0,0 +1,47 @@
+"""store review json on pending_approvals
+
+Revision ID: b52e19c7a0d4
+Revises: 47f83e8fe981
+Create Date: 2026-10-17 13:41:09.264381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b52e19c7a0d4'
+down_revision: Union[str, Sequence[str], None] = '47f83e8fe981'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('pending_approvals', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('review_json', sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), 'postgresql'), nullable=True))
+        batch_op.add_column(sa.Column('review_summary', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+    # Existing approvals only have rendered text; keep its opening as the summary
+    op.execute("UPDATE pending_approvals SET review_summary = substr(review_text, 1, 1500)")
+
+    with op.batch_alter_table('pending_approvals', schema=None) as batch_op:
+        batch_op.alter_column('review_summary', existing_type=sqlmodel.sql.sqltypes.AutoString(), nullable=False)
+        batch_op.drop_column('review_text')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('pending_approvals', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('review_text', sa.VARCHAR(), nullable=True))
+
+    op.execute("UPDATE pending_approvals SET review_text = review_summary")
+
+    with op.batch_alter_table('pending_approvals', schema=None) as batch_op:
+        batch_op.alter_column('review_text', existing_type=sa.VARCHAR(), nullable=False)
+        batch_op.drop_column('review_summary')
+        batch_op.drop_column('review_json')